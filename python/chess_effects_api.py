@@ -27,10 +27,16 @@ from typing import Dict, List, Any, Optional
 import logging
 import asyncio
 import queue
+import os
+import sys
 
 # Importar nosso motor de efeitos
 from chess_visual_effects_engine import ChessEffectsEngine, ChessPattern
 
+# Raiz do repositório no path para usar o cache compartilhado de src
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.ai.cache.sharded import ShardedCache
+
 # Configurar logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -38,12 +44,16 @@ logger = logging.getLogger(__name__)
 app = Flask(__name__)
 CORS(app)  # Permitir CORS para integração com frontend
 
+EFFECTS_CACHE_SIZE = 4096
+
 class ChessEffectsAPI:
     """API para integração do motor de efeitos visuais"""
     
     def __init__(self):
         self.effects_engine = ChessEffectsEngine()
-        self.effects_cache = {}  # Cache de efeitos gerados
+        # Cache de efeitos gerados: particionado, com uma trava por shard, pois as
+        # requisições do Flask e o worker de animações o acessam ao mesmo tempo
+        self.effects_cache = ShardedCache(max_entries=EFFECTS_CACHE_SIZE)
         self.animation_queue = queue.Queue()  # Fila de animações
         self.is_processing = False
         
@@ -90,12 +100,12 @@ class ChessEffectsAPI:
                 
                 # Armazenar no cache
                 cache_key = f"{fen}_{effect_type}"
-                self.effects_cache[cache_key] = {
+                self.effects_cache.put(cache_key, {
                     'frames_path': output_path,
                     'frame_count': len(frames),
                     'patterns': [p.__dict__ for p in patterns],
                     'timestamp': time.time()
-                }
+                })
                 
                 logger.info(f"Animação gerada: {len(frames)} frames salvos em {output_path}")
                 
@@ -181,8 +191,8 @@ def generate_effects():
         
         # Verificar cache primeiro
         cache_key = f"{fen}_{effect_type}"
-        if cache_key in api.effects_cache:
-            cached = api.effects_cache[cache_key]
+        cached = api.effects_cache.get(cache_key)
+        if cached is not None:
             if time.time() - cached['timestamp'] < 3600:  # Cache válido por 1 hora
                 return jsonify({
                     'status': 'cached',
@@ -235,10 +245,10 @@ def get_effects_status(task_id: str):
 def get_effects_frames(cache_key: str):
     """Obter frames de efeitos visuais"""
     try:
-        if cache_key not in api.effects_cache:
+        cached = api.effects_cache.get(cache_key)
+        if cached is None:
             return jsonify({'error': 'Cache key não encontrada'}), 404
         
-        cached = api.effects_cache[cache_key]
         frames_path = cached['frames_path']
         
         # Listar frames disponíveis
@@ -265,10 +275,10 @@ def get_effects_frames(cache_key: str):
 def get_single_frame(cache_key: str, frame_name: str):
     """Obter frame individual"""
     try:
-        if cache_key not in api.effects_cache:
+        cached = api.effects_cache.get(cache_key)
+        if cached is None:
             return jsonify({'error': 'Cache key não encontrada'}), 404
         
-        cached = api.effects_cache[cache_key]
         frames_path = cached['frames_path']
         
         frame_path = Path(frames_path) / frame_name
@@ -285,10 +295,10 @@ def get_single_frame(cache_key: str, frame_name: str):
 def stream_effects(cache_key: str):
     """Stream de efeitos visuais em tempo real"""
     try:
-        if cache_key not in api.effects_cache:
+        cached = api.effects_cache.get(cache_key)
+        if cached is None:
             return jsonify({'error': 'Cache key não encontrada'}), 404
         
-        cached = api.effects_cache[cache_key]
         frames_path = cached['frames_path']
         
         def generate_frames():
@@ -349,14 +359,19 @@ def clear_cache():
 def get_cache_status():
     """Obter status do cache"""
     try:
-        cache_size = len(api.effects_cache)
-        cache_keys = list(api.effects_cache.keys())
+        entries = list(api.effects_cache.items())
+        timestamps = [v['timestamp'] for _, v in entries]
+        statistics = api.effects_cache.get_statistics()
         
         return jsonify({
-            'cache_size': cache_size,
-            'cache_keys': cache_keys,
-            'oldest_entry': min([v['timestamp'] for v in api.effects_cache.values()]) if cache_size > 0 else None,
-            'newest_entry': max([v['timestamp'] for v in api.effects_cache.values()]) if cache_size > 0 else None
+            'cache_size': len(entries),
+            'cache_keys': [k for k, _ in entries],
+            'oldest_entry': min(timestamps) if timestamps else None,
+            'newest_entry': max(timestamps) if timestamps else None,
+            'hits': statistics['hits'],
+            'misses': statistics['misses'],
+            'evictions': statistics['evictions'],
+            'shards': [shard['total_entries'] for shard in statistics['shards']]
         })
         
     except Exception as e:
@@ -26,6 +26,8 @@ from dataclasses import dataclass
 from enum import Enum
 import logging
 import asyncio
+import os
+import sys
 from pathlib import Path
 import chess
 import chess.engine
@@ -38,10 +40,21 @@ import torch.nn as nn
 from sklearn.cluster import DBSCAN
 import networkx as nx
 
+# Raiz do repositório no path para usar a busca de src
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.ai.search import AlphaBetaSearch, MATE_BOUND, MATE_SCORE, PVLine
+from src.core.board import Board
+
 # Configurar logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Linhas candidatas mostradas no painel de análise, todas de uma única busca multi-PV
+ANALYSIS_LINES = 3
+ANALYSIS_DEPTH = 4
+ANALYSIS_MOVETIME = 1.0
+ANALYSIS_HASH_MB = 16
+
 class EffectType(Enum):
     """Tipos de efeitos visuais disponíveis"""
     PATTERN_RECOGNITION = "pattern_recognition"
@@ -84,6 +97,9 @@ class AdvancedChessAnalyzer:
     def __init__(self):
         self.board = chess.Board()
         self.engine = None
+        # Busca própria; a tabela de transposição é reaproveitada entre análises
+        self.search = AlphaBetaSearch(hash_mb=ANALYSIS_HASH_MB)
+        self.candidate_lines: List[PVLine] = []
         self.pattern_database = self.load_pattern_database()
         self.ml_models = self.initialize_ml_models()
         
@@ -435,8 +451,8 @@ class ChessEffectsEngine:
         self.animation_thread = None
         self.is_running = False
         
-    def analyze_position(self, fen: str) -> List[ChessPattern]:
-        """Analisar posição e identificar padrões"""
+    def analyze_position(self, fen: str, lines: int = ANALYSIS_LINES) -> List[ChessPattern]:
+        """Analisar posição e identificar padrões, incluindo as melhores linhas candidatas"""
         try:
             self.analyzer.board = chess.Board(fen)
             patterns = []
@@ -445,6 +461,7 @@ class ChessEffectsEngine:
             patterns.extend(self.find_tactical_patterns())
             patterns.extend(self.analyze_piece_mobility())
             patterns.extend(self.detect_threats())
+            patterns.extend(self.find_candidate_moves(lines))
             
             return patterns
             
@@ -452,6 +469,39 @@ class ChessEffectsEngine:
             logger.error(f"Erro ao analisar posição: {e}")
             return []
     
+    def find_candidate_moves(self, lines: int = ANALYSIS_LINES) -> List[ChessPattern]:
+        """Melhores lances da posição, com score e variante, de uma única busca multi-PV"""
+        board = self.analyzer.board
+        result = self.analyzer.search.search(Board.from_fen(board.fen()), depth=ANALYSIS_DEPTH,
+                                             movetime=ANALYSIS_MOVETIME, multipv=lines)
+        self.analyzer.candidate_lines = result.lines
+        if not result.lines:
+            return []
+        best = result.lines[0].score
+        patterns = []
+        for rank, line in enumerate(result.lines, 1):
+            move = line.move
+            if abs(line.score) >= MATE_BOUND:
+                moves_to_mate = (MATE_SCORE - abs(line.score) + 1) // 2
+                evaluation = f"mate em {moves_to_mate}" if line.score > 0 else f"mate contra em {moves_to_mate}"
+                threats = ["Mate"] if line.score > 0 else ["Mate adversário"]
+            else:
+                evaluation = f"{line.score / 100:+.2f}"
+                threats = []
+            patterns.append(ChessPattern(
+                pattern_type="candidate_move",
+                # Confiança relativa à melhor linha: 300 centipeões abaixo já é descartável
+                confidence=max(0.0, 1.0 - min(best - line.score, 300) / 300),
+                squares=[(move.from_square % 8, move.from_square // 8),
+                         (move.to_square % 8, move.to_square // 8)],
+                description=f"Candidato {rank}: {board.san(move)} ({evaluation})",
+                # Expectativa de pontos do lado a jogar (escala logística do Elo)
+                strategic_value=1.0 / (1.0 + 10 ** (-max(-1000, min(1000, line.score)) / 400)),
+                threats=threats,
+                recommendations=[board.variation_san(line.pv)]
+            ))
+        return patterns
+    
     def find_tactical_patterns(self) -> List[ChessPattern]:
         """Encontrar padrões táticos na posição"""
         patterns = []
@@ -9,11 +9,18 @@ from .evaluation import (
     evaluate_pawn_structure,
     evaluate_king_safety
 )
+from .batch_evaluation import BatchEvaluation, evaluate_batch
 from .cache import (
     PositionCache,
     OpeningBookCache,
-    EndgameTablebaseCache
+    EndgameTablebaseCache,
+    TranspositionTable,
+    PawnHashTable
 )
+from .search import AlphaBetaSearch, PVLine, SearchInfo, SearchResult
+from .parallel_search import LazySMPSearch
+from .time_manager import SearchController, SearchLimits, allocate_time
+from .ponder import PonderingSearch
 
 __all__ = [
     'evaluate_position',
@@ -21,7 +28,20 @@ __all__ = [
     'evaluate_mobility',
     'evaluate_pawn_structure',
     'evaluate_king_safety',
+    'evaluate_batch',
+    'BatchEvaluation',
     'PositionCache',
     'OpeningBookCache',
-    'EndgameTablebaseCache'
+    'EndgameTablebaseCache',
+    'TranspositionTable',
+    'PawnHashTable',
+    'AlphaBetaSearch',
+    'SearchResult',
+    'SearchInfo',
+    'PVLine',
+    'LazySMPSearch',
+    'SearchController',
+    'SearchLimits',
+    'allocate_time',
+    'PonderingSearch'
 ]
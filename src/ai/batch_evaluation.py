@@ -0,0 +1,342 @@
+"""
+Avaliação em lote de posições com NumPy.
+
+Para reavaliar milhares de posições (relatórios, análise de partidas) a
+avaliação por tabuleiro custa uma chamada Python por posição. Aqui as N
+posições viram um tensor de 12 planos (peão, cavalo, bispo, torre, dama e
+rei das brancas, depois os das pretas) e cada termo é calculado de uma vez
+para o lote inteiro:
+
+* material e posição: produto do tensor pelas tabelas de cada fase, com a
+  mesma interpolação de ``evaluate_material``;
+* estrutura de peões: máscaras de peões dobrados, isolados e passados,
+  obtidas com ``FILE_MASKS``, ``ADJACENT_FILE_MASKS`` e ``PASSED_PAWN_MASKS``;
+* mobilidade: casas alcançáveis por cavalos e peças deslizantes, com os
+  raios das deslizantes propagados sobre a ocupação de cada posição;
+* segurança do rei: escudo de peões e ataques à zona do rei, com as
+  mesmas máscaras e pesos de ``evaluate_king_safety``.
+
+Os termos são os mesmos de ``evaluate_position``, que dá o mesmo score.
+
+As posições podem ser ``Board``, ``chess.Board``, FEN, ou já empacotadas
+como tensor (N, 12, 64) de planos ou (N, 64) de códigos por casa.
+"""
+
+from dataclasses import dataclass
+from typing import Iterable, Tuple, Union
+
+import chess
+import numpy as np
+
+from ..core.board import Board, PieceType
+from ..traditional.bitboards import KNIGHT_ATTACKS
+from .evaluation import (
+    ADJACENT_FILE_MASKS,
+    DOUBLED_PAWN_PENALTY,
+    ENDGAME,
+    FILE_MASKS,
+    ISOLATED_PAWN_PENALTY,
+    KING_ATTACK_WEIGHTS,
+    KING_SHIELD_BONUS,
+    KING_SHIELD_MASKS,
+    KING_ZONE_MASKS,
+    MAX_PHASE,
+    MIDGAME,
+    MOBILITY_WEIGHTS,
+    PASSED_PAWN_BONUS,
+    PASSED_PAWN_MASKS,
+    PHASE_WEIGHTS,
+    VALUE_TABLES,
+)
+
+Position = Union[Board, chess.Board, str]
+
+PLANES = 12
+DEFAULT_CHUNK_SIZE = 4096
+
+# Plano de cada (cor, tipo): brancas de 0 a 5, pretas de 6 a 11, na ordem de chess.PIECE_TYPES.
+PLANE_COLORS = (chess.WHITE,) * 6 + (chess.BLACK,) * 6
+PLANE_TYPES = tuple(chess.PIECE_TYPES) * 2
+# Código de cada plano no tensor (N, 64): positivo para as brancas, negativo para as pretas.
+PLANE_CODES = np.array([piece_type if color else -piece_type
+                        for color, piece_type in zip(PLANE_COLORS, PLANE_TYPES)], dtype=np.int8)
+
+_U64 = np.uint64
+_FILES = np.array(FILE_MASKS, dtype=_U64)
+_ADJACENT_FILES = np.array(ADJACENT_FILE_MASKS, dtype=_U64)
+_PASSED = np.array(PASSED_PAWN_MASKS, dtype=_U64)
+_KNIGHT_ATTACKS = np.array(KNIGHT_ATTACKS, dtype=_U64)
+# Máscaras do rei por cor e casa; a casa 64 (sem rei) tem máscara vazia.
+NO_KING = 64
+_KING_ZONES = np.array([masks + [0] for masks in KING_ZONE_MASKS], dtype=_U64)
+_KING_SHIELDS = np.array([masks + [0] for masks in KING_SHIELD_MASKS], dtype=_U64)
+_NOT_FILE_A = _U64(~FILE_MASKS[0] & (1 << 64) - 1)
+_NOT_FILE_H = _U64(~FILE_MASKS[7] & (1 << 64) - 1)
+_ALL = _U64((1 << 64) - 1)
+
+# Direções das peças deslizantes: deslocamento e máscara contra a volta pela borda.
+_ROOK_DIRECTIONS = ((8, _ALL), (-8, _ALL), (1, _NOT_FILE_A), (-1, _NOT_FILE_H))
+_BISHOP_DIRECTIONS = ((9, _NOT_FILE_A), (7, _NOT_FILE_H), (-7, _NOT_FILE_A), (-9, _NOT_FILE_H))
+
+
+def _plane_tables() -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Tabelas por plano: valores (fase, plano, casa), peso de fase e bônus de peão passado."""
+    values = np.zeros((2, PLANES, 64), dtype=np.int32)
+    phase = np.zeros(PLANES, dtype=np.int32)
+    for plane, (color, piece_type) in enumerate(zip(PLANE_COLORS, PLANE_TYPES)):
+        values[:, plane] = VALUE_TABLES[:, int(color), piece_type]
+        phase[plane] = PHASE_WEIGHTS.get(PieceType(piece_type), 0)
+    ranks = np.arange(64) >> 3
+    passed = np.array([np.take(PASSED_PAWN_BONUS, 7 - ranks),  # pretas
+                       np.take(PASSED_PAWN_BONUS, ranks)], dtype=np.int32)
+    return values, phase, passed
+
+
+PLANE_VALUES, PLANE_PHASE, PASSED_BONUS = _plane_tables()
+_PLANE_COLOR_INDEX = np.array(PLANE_COLORS, dtype=np.intp)
+_PLANE_TYPE = np.array(PLANE_TYPES, dtype=np.intp)
+MOBILITY_PLANE_WEIGHTS = np.array(
+    [MOBILITY_WEIGHTS.get(PieceType(piece_type), 0) for piece_type in PLANE_TYPES], dtype=np.int32)
+KING_ATTACK_PLANE_WEIGHTS = np.array(
+    [KING_ATTACK_WEIGHTS.get(PieceType(piece_type), 0) for piece_type in PLANE_TYPES],
+    dtype=np.int32)
+
+if hasattr(np, "bitwise_count"):  # NumPy 2.0+
+    def _popcount(bbs: np.ndarray) -> np.ndarray:
+        return np.bitwise_count(bbs).astype(np.int32)
+else:
+    def _popcount(bbs: np.ndarray) -> np.ndarray:
+        octets = np.ascontiguousarray(bbs, dtype="<u8").view(np.uint8)
+        return np.unpackbits(octets.reshape(bbs.shape + (8,)), axis=-1).sum(axis=-1, dtype=np.int32)
+
+
+@dataclass
+class BatchEvaluation:
+    """
+    Resultado de ``evaluate_batch``. Os termos são diferenças brancas menos
+    pretas; as máscaras têm forma (N, 2), indexadas pela cor do python-chess
+    (pretas = 0, brancas = 1).
+    """
+    scores: np.ndarray
+    material: np.ndarray
+    mobility: np.ndarray
+    pawn_structure: np.ndarray
+    king_safety: np.ndarray
+    phase: np.ndarray
+    passed: np.ndarray
+    isolated: np.ndarray
+    doubled: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.scores)
+
+
+def _position_bitboards(position: Position) -> Tuple[int, ...]:
+    if isinstance(position, str):
+        position = chess.Board(position)
+    if isinstance(position, Board):
+        bbs = position.bitboards()
+        sides = (bbs.white, bbs.black)
+        kinds = (bbs.pawns, bbs.knights, bbs.bishops, bbs.rooks, bbs.queens, bbs.kings)
+    else:
+        sides = (position.occupied_co[chess.WHITE], position.occupied_co[chess.BLACK])
+        kinds = (position.pawns, position.knights, position.bishops,
+                 position.rooks, position.queens, position.kings)
+    return tuple(side & kind for side in sides for kind in kinds)
+
+
+def pack_bitboards(positions: Iterable[Position]) -> np.ndarray:
+    """Bitboards (N, 12) uint64 das posições, um por plano."""
+    rows = [_position_bitboards(position) for position in positions]
+    return np.array(rows, dtype=_U64).reshape(len(rows), PLANES)
+
+
+def to_planes(bitboards: np.ndarray) -> np.ndarray:
+    """Tensor (N, 12, 64) int8 de bitboards (N, 12)."""
+    octets = np.ascontiguousarray(bitboards, dtype="<u8").view(np.uint8)
+    bits = np.unpackbits(octets.reshape(len(bitboards), PLANES, 8), axis=-1, bitorder="little")
+    return bits.view(np.int8)
+
+
+def _pack_squares(squares: np.ndarray) -> np.ndarray:
+    """Bitboards de casas marcadas na última dimensão (..., 64)."""
+    octets = np.packbits(np.asarray(squares, dtype=bool), axis=-1, bitorder="little")
+    return np.ascontiguousarray(octets).view("<u8")[..., 0].astype(_U64)
+
+
+def from_planes(planes: np.ndarray) -> np.ndarray:
+    """Bitboards (N, 12) de um tensor de planos (N, 12, 64)."""
+    return _pack_squares(planes).reshape(len(planes), PLANES)
+
+
+def to_squares(planes: np.ndarray) -> np.ndarray:
+    """Tensor (N, 64) int8 com o código da peça em cada casa (0 = vazia)."""
+    return np.einsum("npk,p->nk", planes, PLANE_CODES).astype(np.int8)
+
+
+def from_squares(squares: np.ndarray) -> np.ndarray:
+    """Tensor de planos (N, 12, 64) de um tensor de códigos (N, 64)."""
+    squares = np.asarray(squares, dtype=np.int8)
+    return (squares[:, None, :] == PLANE_CODES[None, :, None]).view(np.int8)
+
+
+def pack_positions(positions: Iterable[Position], squares: bool = False) -> np.ndarray:
+    """Empacota as posições em (N, 12, 64), ou em (N, 64) com ``squares``."""
+    planes = to_planes(pack_bitboards(positions))
+    return to_squares(planes) if squares else planes
+
+
+def _shift(bbs: np.ndarray, shift: int) -> np.ndarray:
+    return bbs << _U64(shift) if shift > 0 else bbs >> _U64(-shift)
+
+
+def _slider_attacks(pieces: np.ndarray, occupied: np.ndarray, directions) -> np.ndarray:
+    """Ataques de cada peça deslizante isolada em ``pieces``, dada a ocupação da sua posição."""
+    empty = ~occupied
+    attacks = np.zeros_like(pieces)
+    for shift, wrap in directions:
+        flood = ray = pieces
+        for _ in range(6):
+            ray = _shift(ray, shift) & wrap & empty
+            flood = flood | ray
+        attacks |= _shift(flood, shift) & wrap
+    return attacks
+
+
+def _piece_list(bitboards: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(posição, plano, casa) de cada peça do lote, tirando um bit por vez de todos os bitboards."""
+    index = np.flatnonzero(bitboards)
+    bbs = bitboards.reshape(-1)[index]
+    indices, squares = [], []
+    while len(bbs):
+        low = bbs & (~bbs + _U64(1))
+        indices.append(index)
+        squares.append(_popcount(low - _U64(1)))
+        bbs = bbs ^ low
+        remaining = bbs != 0
+        index, bbs = index[remaining], bbs[remaining]
+    index = np.concatenate(indices) if indices else np.zeros(0, dtype=np.intp)
+    squares = np.concatenate(squares) if squares else np.zeros(0, dtype=np.int32)
+    return index // PLANES, index % PLANES, squares.astype(np.intp)
+
+
+def _per_color(positions: np.ndarray, colors: np.ndarray, values: np.ndarray,
+               count: int) -> np.ndarray:
+    """Soma ``values`` por (posição, cor) em um array (N, 2) com pretas na coluna 0."""
+    sums = np.bincount(positions * 2 + colors, weights=values, minlength=2 * count)
+    return sums.astype(np.int64).reshape(count, 2)
+
+
+def _attack_terms(positions: np.ndarray, planes: np.ndarray, squares: np.ndarray,
+                  sides: np.ndarray, kings: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Mobilidade de cada peça da lista (casas vazias ou com peça adversária) e
+    pressão sobre a zona do rei adversário, já ponderadas.
+    """
+    colors = _PLANE_COLOR_INDEX[planes]
+    types = _PLANE_TYPE[planes]
+    attacks = np.where(types == chess.KNIGHT, _KNIGHT_ATTACKS[squares], _U64(0))
+    occupied = sides[positions, 0] | sides[positions, 1]
+    pieces = _U64(1) << squares.astype(_U64)
+    for sliders, directions in (((chess.ROOK, chess.QUEEN), _ROOK_DIRECTIONS),
+                                ((chess.BISHOP, chess.QUEEN), _BISHOP_DIRECTIONS)):
+        selected = np.isin(types, sliders)
+        attacks[selected] |= _slider_attacks(pieces[selected], occupied[selected], directions)
+    own = sides[positions, colors]
+    zone = _KING_ZONES[1 - colors, kings[positions, 1 - colors]]
+    return (MOBILITY_PLANE_WEIGHTS[planes] * _popcount(attacks & ~own),
+            KING_ATTACK_PLANE_WEIGHTS[planes] * _popcount(attacks & zone))
+
+
+def _pawn_structure(bitboards: np.ndarray, positions: np.ndarray, planes: np.ndarray,
+                    squares: np.ndarray):
+    """Pontuação (N, 2) e máscaras de peões passados, isolados e dobrados."""
+    count = len(bitboards)
+    masks = {name: np.zeros((count, 2), dtype=_U64) for name in ("passed", "isolated", "doubled")}
+    penalties = np.zeros((count, 2), dtype=np.int64)
+    for color, plane in ((chess.WHITE, 0), (chess.BLACK, 6)):
+        pawns = bitboards[:, plane]
+        on_file = pawns[:, None] & _FILES[None, :]
+        file_counts = _popcount(on_file)
+        lonely = (pawns[:, None] & _ADJACENT_FILES[None, :]) == 0
+        masks["doubled"][:, int(color)] = np.bitwise_or.reduce(
+            np.where(file_counts > 1, on_file, _U64(0)), axis=1)
+        masks["isolated"][:, int(color)] = np.bitwise_or.reduce(
+            np.where(lonely, on_file, _U64(0)), axis=1)
+        penalties[:, int(color)] = (
+            DOUBLED_PAWN_PENALTY * np.maximum(file_counts - 1, 0).sum(axis=1)
+            + ISOLATED_PAWN_PENALTY * _popcount(masks["isolated"][:, int(color)])
+        )
+
+    # Peões passados pela lista de peças: nenhum peão adversário à frente nem ao lado.
+    is_pawn = (planes == 0) | (planes == 6)
+    positions, planes, squares = positions[is_pawn], planes[is_pawn], squares[is_pawn]
+    colors = _PLANE_COLOR_INDEX[planes]
+    enemy_pawns = bitboards[positions, 6 - planes]
+    passed = (enemy_pawns & _PASSED[colors, squares]) == 0
+    positions, colors, squares = positions[passed], colors[passed], squares[passed]
+    np.bitwise_or.at(masks["passed"], (positions, colors), _U64(1) << squares.astype(_U64))
+    bonus = _per_color(positions, colors, PASSED_BONUS[colors, squares], count)
+    return bonus - penalties, masks
+
+
+def _evaluate_chunk(bitboards: np.ndarray) -> BatchEvaluation:
+    count = len(bitboards)
+    # Lista de peças do lote inteiro: (posição, plano, casa) de cada peça.
+    positions, planes, squares = _piece_list(bitboards)
+    colors = _PLANE_COLOR_INDEX[planes]
+
+    phase = np.minimum(np.bincount(positions, weights=PLANE_PHASE[planes], minlength=count),
+                       MAX_PHASE).astype(np.int64)
+    midgame = _per_color(positions, colors, PLANE_VALUES[MIDGAME, planes, squares], count)
+    endgame = _per_color(positions, colors, PLANE_VALUES[ENDGAME, planes, squares], count)
+    # Interpola cada cor separadamente, como evaluate_material.
+    material = (midgame * phase[:, None] + endgame * (MAX_PHASE - phase[:, None])) // MAX_PHASE
+
+    sides = np.stack([np.bitwise_or.reduce(bitboards[:, 6:], axis=1),
+                      np.bitwise_or.reduce(bitboards[:, :6], axis=1)], axis=1)
+    kings = np.full((count, 2), NO_KING, dtype=np.intp)
+    is_king = _PLANE_TYPE[planes] == chess.KING
+    kings[positions[is_king], colors[is_king]] = squares[is_king]
+
+    mobile = MOBILITY_PLANE_WEIGHTS[planes] > 0
+    mobile_positions, mobile_colors = positions[mobile], colors[mobile]
+    mobility, pressure = (
+        _per_color(mobile_positions, mobile_colors, values, count)
+        for values in _attack_terms(mobile_positions, planes[mobile], squares[mobile], sides, kings)
+    )
+    pawn_scores, masks = _pawn_structure(bitboards, positions, planes, squares)
+
+    shield = _popcount(_KING_SHIELDS[[0, 1], kings] & bitboards[:, [6, 0]] & sides)
+    raw = KING_SHIELD_BONUS * shield - pressure[:, ::-1]
+    king_safety = np.where(kings == NO_KING, 0, raw * phase[:, None] // MAX_PHASE)
+
+    terms = [per_color[:, 1] - per_color[:, 0]
+             for per_color in (material, mobility, pawn_scores, king_safety)]
+    return BatchEvaluation(scores=sum(terms), material=terms[0], mobility=terms[1],
+                           pawn_structure=terms[2], king_safety=terms[3], phase=phase, **masks)
+
+
+def evaluate_batch(positions: Union[Iterable[Position], np.ndarray],
+                   chunk_size: int = DEFAULT_CHUNK_SIZE) -> BatchEvaluation:
+    """
+    Avalia N posições de uma vez.
+
+    ``positions`` é uma sequência de posições ou um tensor já empacotado
+    (N, 12, 64) ou (N, 64). O lote é processado em blocos de ``chunk_size``
+    posições para limitar a memória dos tensores intermediários.
+    """
+    if isinstance(positions, np.ndarray):
+        planes = positions if positions.ndim == 3 else from_squares(positions)
+        bitboards = from_planes(planes)
+    else:
+        bitboards = pack_bitboards(positions)
+
+    chunks = [_evaluate_chunk(bitboards[start:start + chunk_size])
+              for start in range(0, len(bitboards), max(1, chunk_size))]
+    if not chunks:
+        chunks = [_evaluate_chunk(bitboards)]
+    return BatchEvaluation(**{
+        name: np.concatenate([getattr(chunk, name) for chunk in chunks])
+        for name in BatchEvaluation.__dataclass_fields__
+    })
@@ -0,0 +1,350 @@
+"""
+Sistema de cache para a IA de xadrez.
+"""
+
+from typing import Dict, Optional, Tuple
+import json
+from pathlib import Path
+
+import chess
+import numpy as np
+
+from ...core.board import Board
+
+from .transposition_table import TranspositionTable, TranspositionEntry
+from .pawn_table import PawnHashTable, PawnEntry
+from .opening_book import (
+    BookEntry, PolyglotBook, PolyglotBookWriter, book_from_json, book_from_pgn,
+    parse_history_move, replay_history
+)
+from .eviction import (
+    BoundedCache, DepthPreferredPolicy, EvictionPolicy, LFUPolicy, LRUPolicy, make_policy
+)
+from .sharded import ShardedCache
+from .snapshot import (
+    PositionSnapshot, SUFFIX as SNAPSHOT_SUFFIX, pack_records, position_hash, write_snapshot
+)
+from .tablebase import TablebaseResult, TablebaseStore, generate_tablebases
+
+class PositionCache:
+    """
+    Cache de posições avaliadas.
+
+    As entradas são indexadas pelo hash estável de 64 bits da posição e pela
+    profundidade, o que permite gravá-las em um snapshot binário de registros
+    fixos (ver ``snapshot.py``). Um snapshot carregado fica mapeado em memória
+    e atende as consultas que não estão no dicionário.
+
+    O armazenamento é um ``ShardedCache``, seguro para várias threads:
+    ``cache_size`` limita o número de entradas, ``max_bytes`` (opcional) o
+    tamanho estimado, ``policy`` escolhe o despejo ('depth' por padrão: o que
+    sai primeiro é o resultado raso ou de buscas anteriores) e ``shards``
+    reparte o cache entre travas independentes para servidores concorrentes.
+    """
+    
+    def __init__(self, cache_size: int = 1000000, max_bytes: Optional[int] = None,
+                 policy: str = 'depth', shards: int = 1):
+        self.cache_size = cache_size
+        self.cache = ShardedCache(shards, max_bytes=max_bytes, max_entries=cache_size, policy=policy)
+        self.snapshot: Optional[PositionSnapshot] = None
+        
+    def _get_position_key(self, board_state: str, depth: int) -> Tuple[int, int]:
+        """Gera uma chave única para uma posição e profundidade."""
+        return position_hash(board_state), depth
+        
+    def get(self, board_state: str, depth: int) -> Optional[float]:
+        """
+        Recupera uma avaliação do cache.
+        Retorna None se a posição não estiver no cache.
+        """
+        key = self._get_position_key(board_state, depth)
+        evaluation = self.cache.get(key)
+        if evaluation is None and self.snapshot is not None:
+            evaluation = self.snapshot.get(*key)
+            if evaluation is not None:
+                self.cache.put(key, evaluation, depth)
+        return evaluation
+        
+    def put(self, board_state: str, depth: int, evaluation: float):
+        """Armazena uma avaliação no cache."""
+        self.cache.put(self._get_position_key(board_state, depth), evaluation, depth)
+
+    def new_search(self):
+        """Marca o início de uma busca: entradas antigas passam a sair primeiro."""
+        self.cache.new_generation()
+        
+    def clear(self):
+        """Limpa o cache (e solta o snapshot carregado)."""
+        self.cache.clear()
+        self.close()
+        
+    def size(self) -> int:
+        """Retorna o número de posições no cache."""
+        return len(self.cache)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes estimados das entradas em memória (o snapshot mapeado não conta)."""
+        return self.cache.nbytes
+
+    @property
+    def hits(self) -> int:
+        return self.cache.hits
+
+    @property
+    def misses(self) -> int:
+        return self.cache.misses
+
+    def get_statistics(self) -> Dict[str, float]:
+        """Acertos, faltas, despejos e bytes estimados do cache."""
+        return self.cache.get_statistics()
+
+    def close(self):
+        if self.snapshot is not None:
+            self.snapshot.close()
+            self.snapshot = None
+        
+    def save_to_disk(self, filepath: str):
+        """
+        Salva o cache em disco: snapshot binário se ``filepath`` terminar em
+        ``.bin``, JSON caso contrário. Entradas do snapshot carregado que não
+        foram trazidas para o dicionário também são gravadas.
+        """
+        if Path(filepath).suffix == SNAPSHOT_SUFFIX:
+            write_snapshot(filepath, self._snapshot_records(), self.cache_size)
+            return
+        cache_data = {
+            'cache_size': self.cache_size,
+            'positions': [[key, depth, evaluation] for (key, depth), evaluation in self.cache.items()]
+        }
+        
+        with open(filepath, 'w') as f:
+            json.dump(cache_data, f)
+
+    def _snapshot_records(self):
+        records = pack_records(self.cache.items())
+        if self.snapshot is None or not len(self.snapshot):
+            return records
+        # Ordenação estável: entre chaves iguais fica a do dicionário, que vem primeiro.
+        merged = np.concatenate([records, self.snapshot.records])
+        merged.sort(order=('key', 'depth'), kind='stable')
+        keys, depths = merged['key'], merged['depth']
+        first = np.ones(len(merged), dtype=bool)
+        first[1:] = (keys[1:] != keys[:-1]) | (depths[1:] != depths[:-1])
+        return merged[first]
+            
+    def load_from_disk(self, filepath: str, warm_start: Optional[int] = None,
+                       verify: bool = False) -> bool:
+        """
+        Carrega o cache do disco.
+        Retorna True se o carregamento foi bem-sucedido.
+
+        Um snapshot ``.bin`` é mapeado em memória, sem ler os registros;
+        ``verify`` confere antes o seu checksum, lendo o arquivo inteiro.
+        ``warm_start`` copia para o dicionário só as N entradas mais valiosas
+        (as de maior profundidade). O dicionário nunca passa de ``cache_size``.
+        """
+        if Path(filepath).suffix == SNAPSHOT_SUFFIX:
+            try:
+                snapshot = PositionSnapshot(filepath, verify=verify)
+            except (OSError, ValueError):
+                return False
+            self.clear()
+            self.snapshot = snapshot
+            if warm_start:
+                for key, depth, evaluation in snapshot.top(min(warm_start, self.cache_size)).tolist():
+                    self.cache.put((key, depth), evaluation, depth)
+            return True
+        try:
+            with open(filepath, 'r') as f:
+                cache_data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return False
+
+        positions = cache_data['positions']
+        if isinstance(positions, dict):
+            # Formato antigo: chaves "<posição>_<profundidade>".
+            positions = [(*self._get_position_key(*_split_position_key(key)), evaluation)
+                         for key, evaluation in positions.items()]
+        self.clear()
+        limit = self.cache_size if warm_start is None else min(warm_start, self.cache_size)
+        for key, depth, evaluation in positions[-limit:] if limit else ():
+            self.cache.put((key, depth), evaluation, depth)
+        return True
+
+
+def _split_position_key(key: str) -> Tuple[str, int]:
+    board_state, _, depth = key.rpartition('_')
+    return board_state, int(depth)
+
+class OpeningBookCache:
+    """
+    Cache para o livro de aberturas.
+
+    Arquivos ``.bin`` são livros Polyglot, mapeados em memória e consultados
+    pela chave Zobrist da posição (ver ``PolyglotBook``); os demais são o
+    formato JSON indexado pelo histórico de lances.
+    """
+    
+    def __init__(self, book_file: Optional[str] = None):
+        self.openings: Dict[str, Dict] = {}
+        self.book: Optional[PolyglotBook] = None
+        if book_file:
+            self.load_book(book_file)
+            
+    def load_book(self, filepath: str) -> bool:
+        """
+        Carrega um livro de aberturas do disco.
+        Retorna True se o carregamento foi bem-sucedido.
+        """
+        if Path(filepath).suffix == '.bin':
+            try:
+                book = PolyglotBook(filepath)
+            except (OSError, ValueError):
+                return False
+            if self.book is not None:
+                self.book.close()
+            self.book = book
+            return True
+        try:
+            with open(filepath, 'r') as f:
+                self.openings = json.load(f)
+            return True
+        except (FileNotFoundError, json.JSONDecodeError):
+            return False
+            
+    def get_next_move(self, move_history: list) -> Optional[Tuple[int, int]]:
+        """
+        Recupera o próximo movimento do livro de aberturas.
+        Retorna None se a sequência não estiver no livro.
+
+        Com um livro Polyglot, o histórico é reproduzido a partir da posição
+        inicial e o lance sorteado pelos pesos vem como par de casas, no
+        formato de ``Board.move_history``.
+        """
+        if self.book is not None:
+            board = replay_history(move_history)
+            if board is None:
+                return None
+            move = self.book.get_move(board)
+            if move is None:
+                return None
+            return chess.SQUARE_NAMES[move.from_square], chess.SQUARE_NAMES[move.to_square]
+
+        current_position = '_'.join(str(move) for move in move_history)
+        opening_data = self.openings.get(current_position)
+        
+        if opening_data:
+            return opening_data.get('next_move')
+        return None
+        
+    def get_book_move(self, board: Board, best: bool = False) -> Optional[chess.Move]:
+        """
+        Lance do livro para o tabuleiro: pela chave Zobrist no livro Polyglot
+        (o de maior peso com ``best``, senão sorteado pelos pesos) ou pelo
+        histórico de lances no livro JSON.
+        """
+        if self.book is not None:
+            return self.book.get_move(board, best=best)
+        next_move = self.get_next_move(list(board.move_history))
+        if next_move is None:
+            return None
+        try:
+            move = parse_history_move(next_move)
+        except (ValueError, SyntaxError, TypeError, IndexError):
+            return None
+        return move if move in board.legal_moves() else None
+
+    def add_opening(self, move_sequence: list, next_move: Tuple[int, int], name: str = ""):
+        """Adiciona uma nova abertura ao livro."""
+        position_key = '_'.join(str(move) for move in move_sequence)
+        self.openings[position_key] = {
+            'next_move': next_move,
+            'name': name
+        }
+        
+    def save_book(self, filepath: str):
+        """Salva o livro de aberturas em disco."""
+        with open(filepath, 'w') as f:
+            json.dump(self.openings, f)
+
+class EndgameTablebaseCache:
+    """
+    Cache para tabelas de finais.
+
+    As tabelas binárias (``<assinatura>.tb``) ficam em um ``TablebaseStore`` e
+    só são mapeadas na primeira consulta à assinatura; as tabelas JSON antigas
+    também só são lidas quando a combinação de peças é pedida.
+    """
+    
+    def __init__(self, cache_dir: Optional[str] = None):
+        self.tablebase: Dict[str, Dict] = {}
+        self.directory: Optional[Path] = None
+        self.store: Optional[TablebaseStore] = None
+        if cache_dir:
+            self.load_tablebase(cache_dir)
+            
+    def load_tablebase(self, directory: str) -> bool:
+        """
+        Registra o diretório das tabelas de finais; nada é lido até a
+        primeira consulta. Retorna True se o diretório existe.
+        """
+        directory_path = Path(directory)
+        if not directory_path.is_dir():
+            return False
+        if self.store is not None:
+            self.store.close()
+        self.directory = directory_path
+        self.store = TablebaseStore(directory_path)
+        return True
+
+    def _json_table(self, piece_combination: str) -> Optional[Dict]:
+        if piece_combination not in self.tablebase and self.directory is not None:
+            filepath = self.directory / f"{piece_combination}.json"
+            if filepath.exists():
+                try:
+                    with open(filepath, 'r') as f:
+                        self.tablebase[piece_combination] = json.load(f)
+                except (OSError, ValueError):
+                    return None
+        return self.tablebase.get(piece_combination)
+
+    def probe(self, board: Board) -> Optional[TablebaseResult]:
+        """
+        Resultado exato (vitória/empate/derrota e distância até o mate) da
+        posição nas tabelas binárias, ou None se não houver tabela para ela.
+        """
+        if self.store is None:
+            return None
+        return self.store.probe(board)
+            
+    def get_evaluation(self, position: str, piece_combination: str) -> Optional[int]:
+        """
+        Recupera a avaliação de uma posição de final.
+        Retorna None se a posição não estiver nas tabelas.
+        """
+        table = self._json_table(piece_combination)
+        if table is not None:
+            return table.get(position)
+        return None
+        
+    def add_position(self, position: str, piece_combination: str, evaluation: int):
+        """Adiciona uma nova posição às tabelas de finais."""
+        table = self._json_table(piece_combination)
+        if table is None:
+            table = self.tablebase[piece_combination] = {}
+        table[position] = evaluation
+        
+    def save_tablebase(self, directory: str):
+        """Salva as tabelas de finais em disco."""
+        directory_path = Path(directory)
+        directory_path.mkdir(parents=True, exist_ok=True)
+        
+        for piece_combination, positions in self.tablebase.items():
+            filepath = directory_path / f"{piece_combination}.json"
+            with open(filepath, 'w') as f:
+                json.dump(positions, f)
+
+    def close(self):
+        if self.store is not None:
+            self.store.close()
@@ -0,0 +1,311 @@
+"""
+Núcleo comum dos caches da IA: armazenamento limitado com política de
+despejo plugável.
+
+``BoundedCache`` guarda pares chave/valor dentro de um orçamento em bytes
+(estimado por entrada) e, opcionalmente, de um número máximo de entradas.
+Quando uma inserção estoura o orçamento, a política escolhe as vítimas uma a
+uma, sempre em O(1), em vez de varrer ou fatiar o dicionário:
+
+- ``LRUPolicy``: a entrada usada há mais tempo (``OrderedDict``);
+- ``LFUPolicy``: a menos usada, e entre empatadas a mais antiga (baldes por
+  frequência);
+- ``DepthPreferredPolicy``: para resultados de busca; primeiro as entradas
+  de gerações (buscas) anteriores, depois as de menor profundidade.
+
+O cache conta acertos, faltas e despejos. Não é thread-safe: quem o
+compartilha entre threads deve protegê-lo com uma trava.
+"""
+
+import bisect
+import sys
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Optional, Tuple, Union
+
+# Estimativa do custo fixo de uma entrada: slot do dicionário, tupla interna e
+# nó da política.
+ENTRY_OVERHEAD = 160
+MAX_DEPTH = 127
+
+
+def estimate_size(key: Any, value: Any) -> int:
+    """Bytes estimados de uma entrada (tamanho raso da chave e do valor)."""
+    return ENTRY_OVERHEAD + sys.getsizeof(key) + sys.getsizeof(value)
+
+
+class EvictionPolicy(ABC):
+    """Interface das políticas: acompanha as chaves e indica a próxima vítima."""
+
+    name = ''
+
+    @abstractmethod
+    def insert(self, key: Hashable, depth: int = 0):
+        """Passa a acompanhar ``key``, gravada com a profundidade ``depth``."""
+
+    @abstractmethod
+    def touch(self, key: Hashable):
+        """Registra um acesso a ``key``."""
+
+    @abstractmethod
+    def remove(self, key: Hashable):
+        """Deixa de acompanhar ``key``."""
+
+    @abstractmethod
+    def victim(self) -> Hashable:
+        """Próxima chave a despejar; só é chamada com alguma chave acompanhada."""
+
+    @abstractmethod
+    def clear(self):
+        """Esquece todas as chaves."""
+
+    def new_generation(self):
+        """Marca o início de uma nova busca; só importa para políticas por idade."""
+
+
+class LRUPolicy(EvictionPolicy):
+    """Despeja a entrada usada há mais tempo."""
+
+    name = 'lru'
+
+    def __init__(self):
+        self._order: 'OrderedDict[Hashable, None]' = OrderedDict()
+
+    def insert(self, key: Hashable, depth: int = 0):
+        self._order[key] = None
+
+    def touch(self, key: Hashable):
+        self._order.move_to_end(key)
+
+    def remove(self, key: Hashable):
+        del self._order[key]
+
+    def victim(self) -> Hashable:
+        return next(iter(self._order))
+
+    def clear(self):
+        self._order.clear()
+
+
+class LFUPolicy(EvictionPolicy):
+    """Despeja a entrada menos usada; entre as empatadas, a mais antiga."""
+
+    name = 'lfu'
+
+    def __init__(self):
+        self._frequency: Dict[Hashable, int] = {}
+        self._buckets: Dict[int, 'OrderedDict[Hashable, None]'] = {}
+        self._min_frequency = 0
+
+    def _bucket(self, frequency: int) -> 'OrderedDict[Hashable, None]':
+        bucket = self._buckets.get(frequency)
+        if bucket is None:
+            bucket = self._buckets[frequency] = OrderedDict()
+        return bucket
+
+    def insert(self, key: Hashable, depth: int = 0):
+        self._frequency[key] = 1
+        self._bucket(1)[key] = None
+        self._min_frequency = 1
+
+    def touch(self, key: Hashable):
+        frequency = self._frequency[key]
+        bucket = self._buckets[frequency]
+        del bucket[key]
+        if not bucket:
+            del self._buckets[frequency]
+            if self._min_frequency == frequency:
+                self._min_frequency = frequency + 1
+        self._frequency[key] = frequency + 1
+        self._bucket(frequency + 1)[key] = None
+
+    def remove(self, key: Hashable):
+        frequency = self._frequency.pop(key)
+        bucket = self._buckets[frequency]
+        del bucket[key]
+        if not bucket:
+            del self._buckets[frequency]
+
+    def victim(self) -> Hashable:
+        if self._min_frequency not in self._buckets:
+            # Só acontece depois de remoções fora de ordem; o número de
+            # frequências distintas é pequeno.
+            self._min_frequency = min(self._buckets)
+        return next(iter(self._buckets[self._min_frequency]))
+
+    def clear(self):
+        self._frequency.clear()
+        self._buckets.clear()
+        self._min_frequency = 0
+
+
+class DepthPreferredPolicy(EvictionPolicy):
+    """
+    Para resultados de busca: despeja primeiro entradas de gerações
+    anteriores e, entre as da geração atual, as de menor profundidade.
+
+    Há um balde por profundidade, em ordem de inserção; a vítima é procurada
+    só na frente de cada balde, então o custo depende do número de
+    profundidades distintas (no máximo ``MAX_DEPTH + 1``), não do tamanho
+    do cache.
+    """
+
+    name = 'depth'
+
+    def __init__(self):
+        self.generation = 0
+        self._entries: Dict[Hashable, Tuple[int, int]] = {}
+        self._buckets: Dict[int, 'OrderedDict[Hashable, None]'] = {}
+        # Profundidades com balde, em ordem crescente, mantidas a cada balde criado ou esvaziado.
+        self._depths: List[int] = []
+
+    def new_generation(self):
+        self.generation += 1
+
+    def insert(self, key: Hashable, depth: int = 0):
+        depth = max(0, min(MAX_DEPTH, depth))
+        self._entries[key] = (depth, self.generation)
+        bucket = self._buckets.get(depth)
+        if bucket is None:
+            bucket = self._buckets[depth] = OrderedDict()
+            bisect.insort(self._depths, depth)
+        bucket[key] = None
+
+    def touch(self, key: Hashable):
+        # Uma entrada consultada na busca atual passa a pertencer a ela.
+        depth, generation = self._entries[key]
+        if generation != self.generation:
+            self._entries[key] = (depth, self.generation)
+            self._buckets[depth].move_to_end(key)
+
+    def remove(self, key: Hashable):
+        depth, _ = self._entries.pop(key)
+        bucket = self._buckets[depth]
+        del bucket[key]
+        if not bucket:
+            del self._buckets[depth]
+            del self._depths[bisect.bisect_left(self._depths, depth)]
+
+    def victim(self) -> Hashable:
+        shallowest = None
+        for depth in self._depths:
+            key = next(iter(self._buckets[depth]))
+            if self._entries[key][1] != self.generation:
+                return key
+            if shallowest is None:
+                shallowest = key
+        return shallowest
+
+    def clear(self):
+        self._entries.clear()
+        self._buckets.clear()
+        self._depths.clear()
+
+
+POLICIES = {policy.name: policy for policy in (LRUPolicy, LFUPolicy, DepthPreferredPolicy)}
+
+
+def make_policy(policy: Union[str, EvictionPolicy]) -> EvictionPolicy:
+    """Política a partir do nome ('lru', 'lfu', 'depth') ou da própria instância."""
+    if isinstance(policy, EvictionPolicy):
+        return policy
+    try:
+        return POLICIES[policy]()
+    except KeyError:
+        raise ValueError(f"política de despejo desconhecida: {policy!r}") from None
+
+
+class BoundedCache:
+    """Cache limitado por bytes (e opcionalmente por entradas) com despejo plugável."""
+
+    def __init__(self, max_bytes: Optional[int] = None, max_entries: Optional[int] = None,
+                 policy: Union[str, EvictionPolicy] = 'lru',
+                 sizeof: Callable[[Any, Any], int] = estimate_size):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.policy = make_policy(policy)
+        self.sizeof = sizeof
+        self._data: Dict[Hashable, Tuple[Any, int]] = {}
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter(self._data)
+
+    def items(self) -> Iterator[Tuple[Hashable, Any]]:
+        return ((key, value) for key, (value, _) in self._data.items())
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Valor de ``key`` (e conta um acerto), ou ``default`` (e conta uma falta)."""
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+        self.policy.touch(key)
+        return entry[0]
+
+    def put(self, key: Hashable, value: Any, depth: int = 0):
+        """Insere ou substitui ``key``, despejando antes o necessário para caber no orçamento."""
+        size = self.sizeof(key, value)
+        if key in self._data:
+            self.pop(key)
+        self._evict(size, 1)
+        self._data[key] = (value, size)
+        self.nbytes += size
+        self.policy.insert(key, depth)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._data.pop(key, None)
+        if entry is None:
+            return default
+        self.nbytes -= entry[1]
+        self.policy.remove(key)
+        return entry[0]
+
+    def _evict(self, extra_bytes: int = 0, extra_entries: int = 0):
+        max_bytes, max_entries = self.max_bytes, self.max_entries
+        while self._data and (
+                (max_bytes is not None and self.nbytes + extra_bytes > max_bytes)
+                or (max_entries is not None and len(self._data) + extra_entries > max_entries)):
+            self.pop(self.policy.victim())
+            self.evictions += 1
+
+    def shrink(self):
+        """Despeja até caber no orçamento (depois de reduzir os limites, por exemplo)."""
+        self._evict()
+
+    def new_generation(self):
+        self.policy.new_generation()
+
+    def clear(self):
+        """Limpa as entradas e os contadores."""
+        self._data.clear()
+        self.policy.clear()
+        self.nbytes = 0
+        self.hits = self.misses = self.evictions = 0
+
+    def hit_rate(self) -> float:
+        probes = self.hits + self.misses
+        return self.hits / probes if probes else 0.0
+
+    def get_statistics(self) -> Dict[str, Any]:
+        return {
+            'policy': self.policy.name,
+            'total_entries': len(self._data),
+            'size_bytes': self.nbytes,
+            'max_bytes': self.max_bytes,
+            'max_entries': self.max_entries,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hit_rate(),
+        }
@@ -0,0 +1,381 @@
+"""
+Livro de aberturas no formato Polyglot (.bin).
+
+O arquivo é uma sequência de entradas de 16 bytes (big-endian), ordenadas
+pela chave Zobrist: chave (64 bits), lance (16), peso (16) e aprendizado
+(32). As chaves são as mesmas de ``Board.zobrist_key``, de modo que
+transposições caem na mesma entrada, qualquer que seja a ordem dos lances.
+
+``PolyglotBook`` mapeia o arquivo em memória e faz busca binária pela chave:
+abrir um livro com milhões de posições não lê o arquivo, e os processos que
+abrem o mesmo livro compartilham as páginas do sistema operacional.
+
+Os conversores geram livros a partir de partidas PGN e do formato JSON de
+``OpeningBookCache``.
+"""
+
+import argparse
+import ast
+import json
+import mmap
+import os
+import random
+import struct
+import sys
+import tempfile
+from collections import defaultdict
+from typing import (
+    Dict, IO, Iterable, List, NamedTuple, Optional, Sequence, Tuple, Union
+)
+
+import chess
+import chess.pgn
+
+from ...core.board import Board
+from ...core.board.zobrist import zobrist_hash
+
+ENTRY = struct.Struct('>QHHI')
+_KEY = struct.Struct('>Q')
+MAX_WEIGHT = 0xFFFF
+DEFAULT_MAX_PLY = 24
+
+# Pontos de um lance nas partidas PGN, do ponto de vista de quem joga: vitória, empate, derrota.
+RESULT_POINTS = {'win': 2, 'draw': 1, 'loss': 0}
+
+# Roque no Polyglot: o rei "captura" a própria torre.
+_CASTLING_TARGETS = {chess.G1: chess.H1, chess.C1: chess.A1, chess.G8: chess.H8, chess.C8: chess.A8}
+_CASTLING_MOVES = {rook: king for king, rook in _CASTLING_TARGETS.items()}
+
+Position = Union[Board, chess.Board]
+
+
+class BookEntry(NamedTuple):
+    """Lance do livro para uma posição."""
+    key: int
+    move: chess.Move
+    weight: int
+    learn: int
+
+
+def position_key(position: Union[Position, int]) -> int:
+    """Chave Polyglot de um tabuleiro (``Board`` ou ``chess.Board``) ou a própria chave."""
+    if isinstance(position, int):
+        return position
+    if isinstance(position, Board):
+        return position.zobrist_key
+    return zobrist_hash(position)
+
+
+def _is_king_move(position: Position, move: chess.Move) -> bool:
+    return position.piece_type_at(move.from_square) == chess.KING
+
+
+def encode_move(position: Position, move: chess.Move) -> int:
+    """Codifica um lance no formato Polyglot (destino, origem e promoção)."""
+    to_square = move.to_square
+    if (_is_king_move(position, move) and move.from_square in (chess.E1, chess.E8)
+            and to_square in _CASTLING_TARGETS):
+        to_square = _CASTLING_TARGETS[to_square]
+    promotion = move.promotion - 1 if move.promotion else 0
+    return to_square | move.from_square << 6 | promotion << 12
+
+
+def decode_move(position: Position, raw: int) -> chess.Move:
+    """Decodifica um lance Polyglot na posição dada (o roque vira o lance do rei)."""
+    from_square, to_square = raw >> 6 & 63, raw & 63
+    promotion = raw >> 12 & 7
+    move = chess.Move(from_square, to_square, promotion + 1 if promotion else None)
+    if (from_square in (chess.E1, chess.E8) and to_square in _CASTLING_MOVES
+            and _is_king_move(position, move)):
+        move = chess.Move(from_square, _CASTLING_MOVES[to_square])
+    return move
+
+
+def _legal_moves(position: Position) -> Sequence[chess.Move]:
+    if isinstance(position, Board):
+        return position.legal_moves()
+    return list(position.legal_moves)
+
+
+class PolyglotBook:
+    """Livro Polyglot mapeado em memória, consultado por busca binária."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, 'rb')
+        size = os.fstat(self._file.fileno()).st_size
+        if size % ENTRY.size:
+            self._file.close()
+            raise ValueError(f"{path}: tamanho {size} não é múltiplo de {ENTRY.size} bytes")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+        self.entries = size // ENTRY.size
+
+    def __enter__(self) -> "PolyglotBook":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self) -> int:
+        return self.entries
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    def _entry(self, index: int) -> Tuple[int, int, int, int]:
+        return ENTRY.unpack_from(self._map, index * ENTRY.size)
+
+    def _lower_bound(self, key: int) -> int:
+        """Índice da primeira entrada com chave >= ``key``."""
+        low, high = 0, self.entries
+        while low < high:
+            middle = (low + high) // 2
+            if _KEY.unpack_from(self._map, middle * ENTRY.size)[0] < key:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def raw_entries(self, key: int) -> List[Tuple[int, int, int, int]]:
+        """Entradas gravadas para a chave: ``(chave, lance codificado, peso, aprendizado)``."""
+        found = []
+        index = self._lower_bound(key)
+        while index < self.entries:
+            entry = self._entry(index)
+            if entry[0] != key:
+                break
+            found.append(entry)
+            index += 1
+        return found
+
+    def find_all(self, position: Position) -> List[BookEntry]:
+        """Lances legais do livro para a posição, do maior para o menor peso."""
+        key = position_key(position)
+        legal = set(_legal_moves(position))
+        entries = []
+        for _, raw, weight, learn in self.raw_entries(key):
+            move = decode_move(position, raw)
+            # Uma colisão de chave traria lances de outra posição; esses são descartados.
+            if move in legal:
+                entries.append(BookEntry(key, move, weight, learn))
+        entries.sort(key=lambda entry: entry.weight, reverse=True)
+        return entries
+
+    def weighted_choice(self, position: Position,
+                        rng: Optional[random.Random] = None) -> Optional[BookEntry]:
+        """Sorteia um lance com probabilidade proporcional ao peso (peso 0 nunca sai)."""
+        entries = [entry for entry in self.find_all(position) if entry.weight]
+        if not entries:
+            return None
+        rng = rng or random
+        return rng.choices(entries, weights=[entry.weight for entry in entries])[0]
+
+    def get_move(self, position: Position, best: bool = False,
+                 rng: Optional[random.Random] = None) -> Optional[chess.Move]:
+        """Lance do livro: o de maior peso com ``best``, senão um sorteio ponderado."""
+        if best:
+            entries = self.find_all(position)
+            return entries[0].move if entries and entries[0].weight else None
+        entry = self.weighted_choice(position, rng)
+        return entry.move if entry else None
+
+
+class PolyglotBookWriter:
+    """Acumula pesos por (posição, lance) e grava um livro Polyglot ordenado."""
+
+    def __init__(self):
+        self.weights: Dict[Tuple[int, int], int] = defaultdict(int)
+
+    def __len__(self) -> int:
+        return len(self.weights)
+
+    def add(self, position: Position, move: chess.Move, weight: int = 1):
+        """Soma ``weight`` ao lance ``move`` na posição (antes de jogá-lo)."""
+        self.weights[position_key(position), encode_move(position, move)] += weight
+
+    def entries(self, min_weight: int = 1) -> List[Tuple[int, int, int, int]]:
+        """Entradas ordenadas por chave e peso decrescente, com pesos reescalados para 16 bits."""
+        by_key: Dict[int, List[Tuple[int, int]]] = defaultdict(list)
+        for (key, raw), weight in self.weights.items():
+            if weight >= min_weight:
+                by_key[key].append((raw, weight))
+        entries = []
+        for key in sorted(by_key):
+            moves = by_key[key]
+            top = max(weight for _, weight in moves)
+            scale = MAX_WEIGHT / top if top > MAX_WEIGHT else 1
+            for raw, weight in sorted(moves, key=lambda item: (-item[1], item[0])):
+                entries.append((key, raw, max(1, int(weight * scale)), 0))
+        return entries
+
+    def write(self, path: str, min_weight: int = 1) -> int:
+        """Grava o livro em ``path`` (arquivo temporário e rename atômico); devolve o número de entradas."""
+        entries = self.entries(min_weight)
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, temporary = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                for entry in entries:
+                    f.write(ENTRY.pack(*entry))
+            os.replace(temporary, path)
+        except BaseException:
+            os.unlink(temporary)
+            raise
+        return len(entries)
+
+
+def _mover_points(result: str, turn: chess.Color) -> int:
+    """Pontos do lance para quem o jogou; partidas sem resultado contam como empate."""
+    if result in ('1-0', '0-1'):
+        return RESULT_POINTS['win' if (result == '1-0') == turn else 'loss']
+    return RESULT_POINTS['draw']
+
+
+def add_pgn_games(writer: PolyglotBookWriter, handle: IO[str],
+                  max_ply: int = DEFAULT_MAX_PLY) -> int:
+    """
+    Acrescenta ao livro os primeiros ``max_ply`` lances de cada partida do
+    PGN, pesados pelo resultado para quem jogou o lance. Devolve o número de
+    partidas lidas.
+    """
+    games = 0
+    while True:
+        game = chess.pgn.read_game(handle)
+        if game is None:
+            return games
+        games += 1
+        result = game.headers.get('Result', '*')
+        board = Board.from_fen(game.board().fen())
+        for ply, move in enumerate(game.mainline_moves()):
+            if ply >= max_ply:
+                break
+            writer.add(board, move, _mover_points(result, board.current_turn.value))
+            board.push(move)
+
+
+def _parse_square(value) -> chess.Square:
+    if isinstance(value, str):
+        return chess.parse_square(value)
+    row, col = value
+    return (7 - row) * 8 + col
+
+
+def parse_history_move(value) -> chess.Move:
+    """
+    Lance em qualquer das formas usadas no livro JSON: UCI (``'e2e4'``), par de
+    casas (``('e2', 'e4')``), par de (linha, coluna) ou a representação em
+    texto de um desses pares.
+    """
+    if isinstance(value, str):
+        text = value.strip()
+        if text[:1] in '([':
+            return parse_history_move(ast.literal_eval(text))
+        return chess.Move.from_uci(text)
+    from_value, to_value = value[0], value[1]
+    return chess.Move(_parse_square(from_value), _parse_square(to_value))
+
+
+def replay_history(moves: Iterable) -> Optional[Board]:
+    """
+    Tabuleiro depois dos lances do histórico (em qualquer forma aceita por
+    ``parse_history_move``), a partir da posição inicial; None se algum lance
+    não puder ser lido ou for ilegal.
+    """
+    board = Board()
+    for value in moves:
+        try:
+            move = _with_promotion(board, parse_history_move(value))
+        except (ValueError, SyntaxError, TypeError, IndexError):
+            return None
+        if move not in board.legal_moves():
+            return None
+        board.push(move)
+    return board
+
+
+def add_json_book(writer: PolyglotBookWriter, openings: Dict[str, Dict]) -> int:
+    """
+    Acrescenta as aberturas no formato JSON de ``OpeningBookCache`` (histórico
+    de lances unido por ``'_'`` -> ``{'next_move': ...}``). Linhas inválidas
+    são ignoradas; devolve o número de linhas convertidas.
+    """
+    converted = 0
+    for history, data in openings.items():
+        next_move = data.get('next_move') if isinstance(data, dict) else None
+        if next_move is None:
+            continue
+        board = replay_history(filter(None, history.split('_')))
+        if board is None:
+            continue
+        try:
+            move = _with_promotion(board, parse_history_move(next_move))
+        except (ValueError, SyntaxError, TypeError, IndexError):
+            continue
+        if move not in board.legal_moves():
+            continue
+        writer.add(board, move, 1)
+        converted += 1
+    return converted
+
+
+def _with_promotion(board: Board, move: chess.Move) -> chess.Move:
+    """Pares de casas não trazem a promoção; um peão na última fileira vira dama."""
+    if (move.promotion is None and board.piece_type_at(move.from_square) == chess.PAWN
+            and chess.square_rank(move.to_square) in (0, 7)):
+        return chess.Move(move.from_square, move.to_square, chess.QUEEN)
+    return move
+
+
+def book_from_pgn(pgn_paths: Iterable[str], output: str, max_ply: int = DEFAULT_MAX_PLY,
+                  min_weight: int = 1) -> int:
+    """Gera um livro Polyglot a partir de arquivos PGN; devolve o número de entradas."""
+    writer = PolyglotBookWriter()
+    for path in pgn_paths:
+        with open(path, encoding='utf-8', errors='replace') as handle:
+            add_pgn_games(writer, handle, max_ply)
+    return writer.write(output, min_weight)
+
+
+def book_from_json(json_path: str, output: str) -> int:
+    """Converte um livro JSON de ``OpeningBookCache`` para Polyglot; devolve o número de entradas."""
+    with open(json_path, 'r') as f:
+        openings = json.load(f)
+    writer = PolyglotBookWriter()
+    add_json_book(writer, openings)
+    return writer.write(output)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m src.ai.cache.opening_book",
+                                     description="Gera um livro de aberturas Polyglot (.bin).")
+    parser.add_argument("output", help="arquivo .bin de saída")
+    parser.add_argument("--pgn", nargs="*", default=[], help="arquivos PGN de partidas")
+    parser.add_argument("--json", dest="json_paths", nargs="*", default=[],
+                        help="livros no formato JSON de OpeningBookCache")
+    parser.add_argument("--max-ply", type=int, default=DEFAULT_MAX_PLY,
+                        help="lances por partida incluídos no livro")
+    parser.add_argument("--min-weight", type=int, default=1,
+                        help="peso mínimo para um lance entrar no livro")
+    args = parser.parse_args(argv)
+    if not args.pgn and not args.json_paths:
+        parser.error("informe ao menos um --pgn ou --json")
+
+    writer = PolyglotBookWriter()
+    for path in args.pgn:
+        with open(path, encoding='utf-8', errors='replace') as handle:
+            games = add_pgn_games(writer, handle, args.max_ply)
+        print(f"{path}: {games} partidas", file=sys.stdout)
+    for path in args.json_paths:
+        with open(path, 'r') as f:
+            lines = add_json_book(writer, json.load(f))
+        print(f"{path}: {lines} linhas", file=sys.stdout)
+    entries = writer.write(args.output, args.min_weight)
+    print(f"{args.output}: {entries} entradas", file=sys.stdout)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,126 @@
+"""
+Tabela de hash de peões.
+
+A estrutura de peões muda pouco durante uma busca: a maioria dos lances não
+move nem captura peões. Esta tabela guarda o resultado da avaliação de peões
+por ``Board.pawn_key`` (a chave Zobrist só dos peões), de modo que a
+avaliação completa da estrutura só é feita para esqueletos novos.
+
+Cada entrada ocupa oito palavras de 64 bits em um array NumPy pré-alocado: a
+chave, as máscaras de peões passados, isolados e dobrados de cada cor e os
+dois scores. Uma entrada nova sempre substitui a anterior do mesmo índice.
+
+A tabela é compartilhada entre threads (UCI, ponderação, API). Como na tabela
+de transposição, a primeira palavra guarda a chave combinada por XOR com a
+palavra de scores, que por sua vez leva uma soma de verificação das máscaras:
+uma entrada lida no meio de uma escrita não confere com a chave e é tratada
+como ausente.
+"""
+
+from typing import Dict, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+DEFAULT_SIZE = 1 << 14
+ENTRY_WORDS = 8
+
+# Palavra de scores: 16 bits por cor (com sinal), 31 bits de verificação das
+# máscaras e um bit de ocupação.
+_OCCUPIED = 1 << 63
+_SCORE_MASK = 0xFFFF
+_CHECKSUM_MASK = 0x7FFFFFFF
+
+
+def _signed16(value: int) -> int:
+    return value - 0x10000 if value & 0x8000 else value
+
+
+def _checksum(masks: int) -> int:
+    return (masks ^ masks >> 32) & _CHECKSUM_MASK
+
+
+class PawnEntry(NamedTuple):
+    """Estrutura de peões de uma posição; pares indexados pela cor do python-chess (pretas = 0)."""
+    key: int
+    scores: Tuple[int, int]
+    passed: Tuple[int, int]
+    isolated: Tuple[int, int]
+    doubled: Tuple[int, int]
+
+
+class PawnHashTable:
+    """Tabela de tamanho fixo, indexada pela chave de peões, com substituição sempre."""
+
+    def __init__(self, size: int = DEFAULT_SIZE):
+        self.size = max(1, size)
+        self.words = np.zeros((self.size, ENTRY_WORDS), dtype=np.uint64)
+        # Mesmo acesso palavra a palavra da tabela de transposição, sem escalares NumPy.
+        self._cells = memoryview(self.words.reshape(-1))
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def size_bytes(self) -> int:
+        return self.words.nbytes
+
+    def probe(self, key: int) -> Optional[PawnEntry]:
+        """Entrada da chave de peões ``key``, ou None."""
+        cells = self._cells
+        base = key % self.size * ENTRY_WORDS
+        # Lê os dados antes de conferir a chave, para que a verificação cubra o que foi lido.
+        check, passed_b, passed_w, isolated_b, isolated_w, doubled_b, doubled_w, packed = \
+            cells[base:base + ENTRY_WORDS]
+        if (not packed or check ^ packed != key
+                or packed >> 32 & _CHECKSUM_MASK != _checksum(
+                    passed_b ^ passed_w ^ isolated_b ^ isolated_w ^ doubled_b ^ doubled_w)):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return PawnEntry(key,
+                         (_signed16(packed & _SCORE_MASK), _signed16(packed >> 16 & _SCORE_MASK)),
+                         (passed_b, passed_w),
+                         (isolated_b, isolated_w),
+                         (doubled_b, doubled_w))
+
+    def probe_scores(self, key: int) -> Optional[Tuple[int, int]]:
+        """Só os scores (pretas, brancas) de ``key``; o caminho usado a cada nó da busca."""
+        cells = self._cells
+        base = key % self.size * ENTRY_WORDS
+        packed = cells[base + 7]
+        if not packed or cells[base] ^ packed != key:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return _signed16(packed & _SCORE_MASK), _signed16(packed >> 16 & _SCORE_MASK)
+
+    def store(self, key: int, scores: Tuple[int, int], passed: Tuple[int, int],
+              isolated: Tuple[int, int], doubled: Tuple[int, int]) -> PawnEntry:
+        """Grava a estrutura de peões de ``key`` e devolve a entrada."""
+        masks = passed[0] ^ passed[1] ^ isolated[0] ^ isolated[1] ^ doubled[0] ^ doubled[1]
+        packed = (_OCCUPIED | _checksum(masks) << 32 | scores[0] & _SCORE_MASK
+                  | (scores[1] & _SCORE_MASK) << 16)
+        self.words[key % self.size] = (key ^ packed, *passed, *isolated, *doubled, packed)
+        return PawnEntry(key, tuple(scores), tuple(passed), tuple(isolated), tuple(doubled))
+
+    def clear(self):
+        """Limpa a tabela e os contadores sem realocar."""
+        self.words.fill(0)
+        self.hits = self.misses = 0
+
+    def get_size(self) -> int:
+        """Número de entradas ocupadas."""
+        return int(np.count_nonzero(self.words[:, 7]))
+
+    def hit_rate(self) -> float:
+        probes = self.hits + self.misses
+        return self.hits / probes if probes else 0.0
+
+    def get_statistics(self) -> Dict[str, float]:
+        return {
+            'total_entries': self.get_size(),
+            'capacity': self.size,
+            'size_bytes': self.size_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hit_rate(),
+        }
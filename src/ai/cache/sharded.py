@@ -0,0 +1,145 @@
+"""
+Cache particionado em shards com uma trava por shard.
+
+Servidores com várias threads (a API FastAPI e a API de efeitos em Flask)
+consultam os mesmos caches ao mesmo tempo. Com uma trava global, toda
+consulta espera por todas as outras; aqui a chave escolhe um de N shards
+pelos bits baixos do seu hash, e cada shard é um ``BoundedCache`` com sua
+própria trava, orçamento (a fração 1/N do total) e contadores. Consultas a
+shards diferentes não competem entre si.
+"""
+
+from threading import Lock
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Optional, Tuple
+
+from .eviction import BoundedCache, estimate_size
+
+DEFAULT_SHARDS = 16
+
+
+def _shard_count(shards: int, max_entries: Optional[int]) -> int:
+    """Potência de dois não maior que ``shards`` nem que o limite de entradas."""
+    count = max(1, shards)
+    if max_entries is not None:
+        count = min(count, max(1, max_entries))
+    return 1 << (count.bit_length() - 1)
+
+
+def _split(limit: Optional[int], count: int) -> Optional[int]:
+    return None if limit is None else max(1, limit // count)
+
+
+class ShardedCache:
+    """``BoundedCache`` particionado, seguro para várias threads."""
+
+    def __init__(self, shards: int = DEFAULT_SHARDS, max_bytes: Optional[int] = None,
+                 max_entries: Optional[int] = None, policy: str = 'lru',
+                 sizeof: Callable[[Any, Any], int] = estimate_size):
+        count = _shard_count(shards, max_entries)
+        self._mask = count - 1
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.shards: List[BoundedCache] = [
+            BoundedCache(_split(max_bytes, count), _split(max_entries, count), policy, sizeof)
+            for _ in range(count)
+        ]
+        self._locks = [Lock() for _ in range(count)]
+
+    def _shard(self, key: Hashable) -> Tuple[BoundedCache, Lock]:
+        index = hash(key) & self._mask
+        return self.shards[index], self._locks[index]
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        shard, lock = self._shard(key)
+        with lock:
+            return shard.get(key, default)
+
+    def put(self, key: Hashable, value: Any, depth: int = 0):
+        shard, lock = self._shard(key)
+        with lock:
+            shard.put(key, value, depth)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        shard, lock = self._shard(key)
+        with lock:
+            return shard.pop(key, default)
+
+    def __contains__(self, key: Hashable) -> bool:
+        shard, lock = self._shard(key)
+        with lock:
+            return key in shard
+
+    def __len__(self) -> int:
+        return sum(len(shard) for shard in self.shards)
+
+    def items(self) -> Iterator[Tuple[Hashable, Any]]:
+        """Pares chave/valor; cada shard é copiado sob a sua trava."""
+        for shard, lock in zip(self.shards, self._locks):
+            with lock:
+                items = list(shard.items())
+            yield from items
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return (key for key, _ in self.items())
+
+    def _each(self, method: str, *args):
+        for shard, lock in zip(self.shards, self._locks):
+            with lock:
+                getattr(shard, method)(*args)
+
+    def clear(self):
+        self._each('clear')
+
+    def new_generation(self):
+        self._each('new_generation')
+
+    def set_limits(self, max_bytes: Optional[int] = None, max_entries: Optional[int] = None):
+        """Muda o orçamento total, repartido entre os shards, e despeja o excedente."""
+        self.max_bytes, self.max_entries = max_bytes, max_entries
+        count = len(self.shards)
+        for shard, lock in zip(self.shards, self._locks):
+            with lock:
+                shard.max_bytes = _split(max_bytes, count)
+                shard.max_entries = _split(max_entries, count)
+                shard.shrink()
+
+    @property
+    def nbytes(self) -> int:
+        return sum(shard.nbytes for shard in self.shards)
+
+    @property
+    def hits(self) -> int:
+        return sum(shard.hits for shard in self.shards)
+
+    @property
+    def misses(self) -> int:
+        return sum(shard.misses for shard in self.shards)
+
+    @property
+    def evictions(self) -> int:
+        return sum(shard.evictions for shard in self.shards)
+
+    def hit_rate(self) -> float:
+        hits, misses = self.hits, self.misses
+        return hits / (hits + misses) if hits + misses else 0.0
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Totais e, em ``shards``, as estatísticas de cada shard."""
+        shards = []
+        for shard, lock in zip(self.shards, self._locks):
+            with lock:
+                shards.append(shard.get_statistics())
+        hits = sum(stats['hits'] for stats in shards)
+        misses = sum(stats['misses'] for stats in shards)
+        return {
+            'policy': shards[0]['policy'],
+            'total_entries': sum(stats['total_entries'] for stats in shards),
+            'size_bytes': sum(stats['size_bytes'] for stats in shards),
+            'max_bytes': self.max_bytes,
+            'max_entries': self.max_entries,
+            'hits': hits,
+            'misses': misses,
+            'evictions': sum(stats['evictions'] for stats in shards),
+            'hit_rate': hits / (hits + misses) if hits + misses else 0.0,
+            'shards': shards,
+        }
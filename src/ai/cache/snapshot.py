@@ -0,0 +1,154 @@
+"""
+Snapshot binário do ``PositionCache``.
+
+O arquivo tem um cabeçalho fixo (magic, número de registros, ``cache_size``
+de quem gravou e crc32 dos registros) seguido de registros de largura fixa,
+ordenados por chave e profundidade: chave da posição (64 bits), profundidade
+(32 bits) e avaliação (float64).
+
+A chave é um hash estável de 64 bits da string da posição, o mesmo em todos
+os processos (``hash()`` do Python muda a cada execução). ``PositionSnapshot``
+mapeia o arquivo em memória e vê os registros como um array NumPy, sem
+interpretar nada: consultas são buscas binárias sobre as páginas do arquivo,
+e um processo que reinicia tem o cache anterior disponível de imediato.
+
+Abrir o snapshot só confere o cabeçalho e o tamanho do arquivo; o crc32 lê
+todas as páginas e por isso fica em ``verify``, chamado por quem quiser.
+A gravação vai para um arquivo temporário, sincronizado em disco antes do
+rename, para que uma queda não deixe um snapshot renomeado mas incompleto.
+"""
+
+import bisect
+import hashlib
+import mmap
+import os
+import struct
+import tempfile
+import zlib
+from typing import Iterable, Optional, Tuple
+
+import numpy as np
+
+MAGIC = b'EONPC001'
+HEADER = struct.Struct('<8sQQI')  # magic, registros, cache_size, crc32 dos registros
+RECORD = np.dtype([('key', '<u8'), ('depth', '<i4'), ('score', '<f8')])
+SUFFIX = '.bin'
+
+
+def position_hash(board_state: str) -> int:
+    """Chave de 64 bits, estável entre processos, da string de uma posição."""
+    return int.from_bytes(hashlib.blake2b(board_state.encode(), digest_size=8).digest(), 'little')
+
+
+def pack_records(items: Iterable[Tuple[Tuple[int, int], float]]) -> np.ndarray:
+    """Registros ordenados por (chave, profundidade) a partir de pares ``((chave, profundidade), score)``."""
+    items = list(items)
+    records = np.empty(len(items), dtype=RECORD)
+    if items:
+        records['key'] = np.fromiter((key for (key, _), _ in items), np.uint64, len(items))
+        records['depth'] = np.fromiter((depth for (_, depth), _ in items), np.int32, len(items))
+        records['score'] = np.fromiter((score for _, score in items), np.float64, len(items))
+        records.sort(order=('key', 'depth'), kind='stable')
+    return records
+
+
+def write_snapshot(path: str, records: np.ndarray, cache_size: int = 0) -> int:
+    """Grava ``records`` em ``path`` (arquivo temporário e rename atômico); devolve o número de registros."""
+    data = np.ascontiguousarray(records, dtype=RECORD).tobytes()
+    header = HEADER.pack(MAGIC, len(records), cache_size, zlib.crc32(data))
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temporary = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(header)
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporary, path)
+    except BaseException:
+        os.unlink(temporary)
+        raise
+    fsync_directory(directory)
+    return len(records)
+
+
+def fsync_directory(directory: str):
+    """Sincroniza a entrada do rename no diretório (só onde diretórios podem ser abertos)."""
+    if os.name != 'posix':
+        return
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class PositionSnapshot:
+    """Snapshot mapeado em memória, consultado sem carregar os registros."""
+
+    def __init__(self, path: str, verify: bool = False):
+        """
+        Mapeia ``path`` conferindo cabeçalho e tamanho; com ``verify``, também
+        o crc32, o que lê o arquivo inteiro.
+        """
+        self.path = path
+        with open(path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if size < HEADER.size:
+                raise ValueError(f"{path}: snapshot truncado")
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, count, self.cache_size, crc = HEADER.unpack_from(self._mmap)
+        if magic != MAGIC or size != HEADER.size + count * RECORD.itemsize:
+            self._mmap.close()
+            raise ValueError(f"{path}: snapshot inválido")
+        self._crc = crc
+        if verify and not self.verify():
+            self._mmap.close()
+            raise ValueError(f"{path}: checksum não confere")
+        self.records = np.frombuffer(self._mmap, dtype=RECORD, count=count, offset=HEADER.size)
+        self._keys = self.records['key']
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def verify(self) -> bool:
+        """Confere o crc32 gravado no cabeçalho (lê o arquivo inteiro)."""
+        return zlib.crc32(memoryview(self._mmap)[HEADER.size:]) == self._crc
+
+    def __enter__(self) -> "PositionSnapshot":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def get(self, key: int, depth: int) -> Optional[float]:
+        """Avaliação gravada para (chave, profundidade), ou None."""
+        keys = self._keys
+        # bisect em vez de np.searchsorted, que copiaria a coluna (não contígua) a cada consulta.
+        index = bisect.bisect_left(keys, key)
+        records = self.records
+        while index < len(keys) and keys[index] == key:
+            record = records[index]
+            if record['depth'] == depth:
+                return float(record['score'])
+            index += 1
+        return None
+
+    def top(self, count: int) -> np.ndarray:
+        """
+        Os ``count`` registros mais valiosos: os de maior profundidade, que
+        são os mais caros de recalcular.
+        """
+        if count >= len(self.records):
+            return self.records.copy()
+        if count <= 0:
+            return self.records[:0].copy()
+        depths = self.records['depth']
+        return self.records[np.argpartition(-depths, count - 1)[:count]]
+
+    def close(self):
+        if self._mmap is not None:
+            # O array NumPy segura o buffer; solta-o antes de fechar o mmap.
+            self.records = self._keys = None
+            self._mmap.close()
+            self._mmap = None
@@ -0,0 +1,463 @@
+"""
+Tabelas de finais em formato binário compacto.
+
+Cada assinatura de material (``KQvK``, ``KRvK``, ``KPvK``...) tem um arquivo
+``<assinatura>.tb`` com um byte por posição: o resultado para o lado que
+joga (2 bits: derrota, empate ou vitória) e a distância até o mate em lances
+(6 bits). ``TablebaseStore`` só abre o arquivo de uma assinatura na primeira
+consulta a ela, mapeando-o em memória; nada é carregado antecipadamente.
+
+O índice é direto (sem colisões) sobre as posições canônicas: o lado forte
+passa a ser o das brancas e as simetrias do tabuleiro são removidas. Sem
+peões, o rei branco é levado ao triângulo a1-d1-d4 (10 casas); com peões,
+só o espelho entre as alas vale, e o peão é levado às colunas a-d.
+
+As tabelas são geradas por análise retrógrada (``generate_tablebases``) para
+os finais de rei e uma peça contra rei: KQvK, KRvK, KBvK, KNvK e KPvK.
+"""
+
+import argparse
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import zlib
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+import chess
+
+from ...core.board import Board
+from ...traditional.bitboards import (
+    KING_ATTACKS, KNIGHT_ATTACKS, PAWN_ATTACKS, bishop_attacks, queen_attacks, rook_attacks
+)
+from .snapshot import fsync_directory
+
+MAGIC = b'EONTB001'
+HEADER = struct.Struct('<8s8sII')  # magic, assinatura, número de entradas, crc32 dos dados
+SUFFIX = '.tb'
+
+# Resultado nos 2 bits baixos, do ponto de vista de quem joga; 0 marca posição inválida.
+INVALID = 0
+LOSS = 1
+DRAW = 2
+WIN = 3
+MAX_DTM_MOVES = 63
+
+DEFAULT_SIGNATURES = ('KQvK', 'KRvK', 'KPvK')
+# Tabelas de que cada assinatura precisa (promoções do peão).
+DEPENDENCIES = {'KPvK': ('KQvK', 'KRvK', 'KBvK', 'KNvK')}
+
+_PIECE_LETTERS = {'Q': chess.QUEEN, 'R': chess.ROOK, 'B': chess.BISHOP, 'N': chess.KNIGHT,
+                  'P': chess.PAWN}
+
+Position = Union[Board, chess.Board]
+
+
+class TablebaseResult(NamedTuple):
+    """
+    Resultado de uma consulta: ``wdl`` é 1 (vitória), 0 (empate) ou -1
+    (derrota) para o lado que joga; ``dtm`` é a distância até o mate em
+    meios-lances (ímpar na vitória, par na derrota; 0 = já levou mate), ou
+    None no empate.
+    """
+    wdl: int
+    dtm: Optional[int]
+
+
+def _transform(square: int, symmetry: int) -> int:
+    rank, file = square >> 3, square & 7
+    if symmetry & 4:
+        rank, file = file, rank
+    if symmetry & 1:
+        file = 7 - file
+    if symmetry & 2:
+        rank = 7 - rank
+    return rank * 8 + file
+
+
+TRIANGLE = [square for square in range(64) if (square & 7) <= 3 and (square >> 3) <= (square & 7)]
+_TRIANGLE_INDEX = {square: index for index, square in enumerate(TRIANGLE)}
+
+
+def _king_symmetries() -> List[List[int]]:
+    """Para cada casa do rei branco, o mapa de casas que o leva ao triângulo."""
+    maps = []
+    for king in range(64):
+        symmetry = next(s for s in range(8) if _transform(king, s) in _TRIANGLE_INDEX)
+        maps.append([_transform(square, symmetry) for square in range(64)])
+    return maps
+
+
+_KING_SYMMETRY = _king_symmetries()
+_IDENTITY = list(range(64))
+_FILE_MIRROR = [square ^ 7 for square in range(64)]
+
+PAWNLESS_SIZE = 2 * len(TRIANGLE) * 64 * 64
+PAWN_SIZE = 2 * 24 * 64 * 64
+
+
+def _pawnless_index(white_to_move: bool, white_king: int, black_king: int, piece: int) -> int:
+    squares = _KING_SYMMETRY[white_king]
+    return (((0 if white_to_move else 1) * len(TRIANGLE) + _TRIANGLE_INDEX[squares[white_king]])
+            * 64 + squares[black_king]) * 64 + squares[piece]
+
+
+def _pawn_index(white_to_move: bool, white_king: int, black_king: int, pawn: int) -> int:
+    squares = _FILE_MIRROR if pawn & 7 > 3 else _IDENTITY
+    pawn = squares[pawn]
+    pawn_slot = ((pawn >> 3) - 1) * 4 + (pawn & 7)
+    return (((0 if white_to_move else 1) * 24 + pawn_slot) * 64
+            + squares[white_king]) * 64 + squares[black_king]
+
+
+def parse_signature(signature: str) -> int:
+    """Tipo da peça extra das brancas em uma assinatura ``K?vK``."""
+    if len(signature) != 4 or signature[0] != 'K' or signature[2:] != 'vK' \
+            or signature[1] not in _PIECE_LETTERS:
+        raise ValueError(f"assinatura não suportada: {signature!r}")
+    return _PIECE_LETTERS[signature[1]]
+
+
+def table_size(signature: str) -> int:
+    return PAWN_SIZE if parse_signature(signature) == chess.PAWN else PAWNLESS_SIZE
+
+
+def table_index(signature: str, white_to_move: bool, white_king: int, black_king: int,
+                piece: int) -> int:
+    """Índice da posição (com o lado forte nas brancas) na tabela da assinatura."""
+    if parse_signature(signature) == chess.PAWN:
+        return _pawn_index(white_to_move, white_king, black_king, piece)
+    return _pawnless_index(white_to_move, white_king, black_king, piece)
+
+
+def decode_entry(value: int) -> Optional[TablebaseResult]:
+    wdl = value & 3
+    if wdl == INVALID:
+        return None
+    moves = value >> 2
+    if wdl == WIN:
+        return TablebaseResult(1, 2 * moves - 1)
+    if wdl == LOSS:
+        return TablebaseResult(-1, 2 * moves)
+    return TablebaseResult(0, None)
+
+
+def _encode_entry(wdl: int, plies: int) -> int:
+    moves = (plies + 1) // 2 if wdl == WIN else plies // 2
+    if moves > MAX_DTM_MOVES:
+        raise ValueError(f"distância até o mate de {moves} lances não cabe em 6 bits")
+    return wdl | moves << 2
+
+
+def material_signature(position: Position) -> Optional[Tuple[str, chess.Color]]:
+    """
+    Assinatura de uma posição de rei e peça contra rei e a cor do lado forte,
+    ou None para outros materiais.
+    """
+    board = position._chess_board() if isinstance(position, Board) else position
+    if chess.popcount(board.occupied) != 3 or chess.popcount(board.kings) != 2:
+        return None
+    square = chess.lsb(board.occupied & ~board.kings)
+    piece = board.piece_at(square)
+    return f"K{piece.symbol().upper()}vK", piece.color
+
+
+def _canonical(position: Position) -> Optional[Tuple[str, int]]:
+    """Assinatura e índice da posição, com o lado forte virado para as brancas."""
+    board = position._chess_board() if isinstance(position, Board) else position
+    found = material_signature(board)
+    if found is None or board.castling_rights:
+        return None
+    signature, strong = found
+    white_king = board.king(strong)
+    black_king = board.king(not strong)
+    piece = chess.lsb(board.occupied & ~board.kings)
+    if board.pawns & chess.BB_BACKRANKS:
+        return None
+    white_to_move = board.turn == strong
+    if strong == chess.BLACK:
+        # Espelha as fileiras para que o lado forte jogue "de baixo para cima".
+        white_king, black_king, piece = white_king ^ 56, black_king ^ 56, piece ^ 56
+    return signature, table_index(signature, white_to_move, white_king, black_king, piece)
+
+
+class TablebaseStore:
+    """Tabelas de um diretório, abertas e mapeadas em memória na primeira consulta."""
+
+    def __init__(self, directory: Union[str, Path]):
+        self.directory = Path(directory)
+        self._tables: Dict[str, Optional[mmap.mmap]] = {}
+        self.probes = 0
+        self.hits = 0
+
+    def __enter__(self) -> "TablebaseStore":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def path(self, signature: str) -> Path:
+        return self.directory / f"{signature}{SUFFIX}"
+
+    def available(self) -> List[str]:
+        """Assinaturas com arquivo no diretório (sem abri-los)."""
+        return sorted(path.stem for path in self.directory.glob(f"*{SUFFIX}"))
+
+    def _table(self, signature: str) -> Optional[mmap.mmap]:
+        if signature in self._tables:
+            return self._tables[signature]
+        table = None
+        path = self.path(signature)
+        if path.exists():
+            with open(path, 'rb') as f:
+                table = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, stored, entries, _ = HEADER.unpack_from(table)
+            if (magic != MAGIC or stored.rstrip(b'\0').decode() != signature
+                    or entries != table_size(signature) or len(table) != HEADER.size + entries):
+                table.close()
+                raise ValueError(f"{path}: arquivo de tabela inválido")
+        self._tables[signature] = table
+        return table
+
+    def loaded(self) -> List[str]:
+        """Assinaturas já abertas."""
+        return sorted(signature for signature, table in self._tables.items() if table is not None)
+
+    def probe(self, position: Position) -> Optional[TablebaseResult]:
+        """Resultado da posição, ou None se não houver tabela para ela."""
+        self.probes += 1
+        found = _canonical(position)
+        if found is None:
+            return None
+        signature, index = found
+        table = self._table(signature)
+        if table is None:
+            return None
+        result = decode_entry(table[HEADER.size + index])
+        if result is not None:
+            self.hits += 1
+        return result
+
+    def probe_wdl(self, position: Position) -> Optional[int]:
+        result = self.probe(position)
+        return result.wdl if result else None
+
+    def probe_dtm(self, position: Position) -> Optional[int]:
+        result = self.probe(position)
+        return result.dtm if result else None
+
+    def verify(self, signature: str) -> bool:
+        """Confere o crc32 gravado no cabeçalho (lê a tabela inteira)."""
+        table = self._table(signature)
+        if table is None:
+            return False
+        crc = HEADER.unpack_from(table)[3]
+        return zlib.crc32(table[HEADER.size:]) == crc
+
+    def close(self):
+        for table in self._tables.values():
+            if table is not None:
+                table.close()
+        self._tables.clear()
+
+
+# ----------------------------------------------------------------------
+# Geração por análise retrógrada
+
+def _piece_attacks(piece_type: int, square: int, occupied: int) -> int:
+    if piece_type == chess.QUEEN:
+        return queen_attacks(square, occupied)
+    if piece_type == chess.ROOK:
+        return rook_attacks(square, occupied)
+    if piece_type == chess.BISHOP:
+        return bishop_attacks(square, occupied)
+    if piece_type == chess.KNIGHT:
+        return KNIGHT_ATTACKS[square]
+    return PAWN_ATTACKS[chess.WHITE][square]
+
+
+def _squares(bb: int) -> Iterable[int]:
+    while bb:
+        low = bb & -bb
+        yield low.bit_length() - 1
+        bb ^= low
+
+
+def _configurations(piece_type: int) -> Iterable[Tuple[int, int, int]]:
+    """(rei branco, rei preto, peça) de cada posição da região canônica."""
+    if piece_type == chess.PAWN:
+        for pawn in range(8, 56):
+            if pawn & 7 > 3:
+                continue
+            for white_king in range(64):
+                for black_king in range(64):
+                    yield white_king, black_king, pawn
+    else:
+        for white_king in TRIANGLE:
+            for black_king in range(64):
+                for piece in range(64):
+                    yield white_king, black_king, piece
+
+
+def _entry_value(tables: Dict[str, bytes], signature: str, white_to_move: bool,
+                 white_king: int, black_king: int, piece: int) -> TablebaseResult:
+    value = tables[signature][table_index(signature, white_to_move, white_king, black_king, piece)]
+    return decode_entry(value)
+
+
+def generate_table(signature: str, tables: Optional[Dict[str, bytes]] = None) -> bytes:
+    """
+    Gera a tabela de uma assinatura ``K?vK`` por análise retrógrada.
+
+    ``tables`` traz as tabelas já geradas de que esta depende (as promoções
+    do peão); as que faltarem são geradas antes.
+    """
+    tables = {} if tables is None else tables
+    for dependency in DEPENDENCIES.get(signature, ()):
+        if dependency not in tables:
+            tables[dependency] = generate_table(dependency, tables)
+
+    piece_type = parse_signature(signature)
+    size = table_size(signature)
+    index_of = _pawn_index if piece_type == chess.PAWN else _pawnless_index
+    result = bytearray(size)
+    plies = [0] * size
+    pending = [0] * size
+    predecessors: List[List[int]] = [[] for _ in range(size)]
+    # Resultados conhecidos por distância: (índice, resultado para quem joga).
+    layers: Dict[int, List[Tuple[int, int]]] = defaultdict(list)
+
+    for white_king, black_king, piece in _configurations(piece_type):
+        if len({white_king, black_king, piece}) < 3 or KING_ATTACKS[white_king] >> black_king & 1:
+            continue
+        occupied = 1 << white_king | 1 << black_king | 1 << piece
+        attacked = _piece_attacks(piece_type, piece, occupied)
+        black_in_check = attacked >> black_king & 1
+
+        for white_to_move in (True, False):
+            if white_to_move and black_in_check:
+                continue  # o lado que não joga está em xeque
+            index = index_of(white_to_move, white_king, black_king, piece)
+            successors: List[int] = []
+            exits: List[TablebaseResult] = []
+            if white_to_move:
+                forbidden = KING_ATTACKS[black_king] | 1 << piece | 1 << black_king
+                for target in _squares(KING_ATTACKS[white_king] & ~forbidden):
+                    successors.append(index_of(False, target, black_king, piece))
+                if piece_type == chess.PAWN:
+                    targets = []
+                    if not occupied >> (piece + 8) & 1:
+                        targets.append(piece + 8)
+                        if piece < 16 and not occupied >> (piece + 16) & 1:
+                            targets.append(piece + 16)
+                    for target in targets:
+                        if target >= 56:
+                            for promotion in 'QRBN':
+                                exits.append(_entry_value(tables, f"K{promotion}vK", False,
+                                                          white_king, black_king, target))
+                        else:
+                            successors.append(index_of(False, white_king, black_king, target))
+                else:
+                    for target in _squares(attacked & ~(1 << white_king | 1 << black_king)):
+                        successors.append(index_of(False, white_king, black_king, target))
+            else:
+                for target in _squares(KING_ATTACKS[black_king] & ~KING_ATTACKS[white_king]
+                                       & ~(1 << white_king)):
+                    if target == piece:
+                        exits.append(TablebaseResult(0, None))  # captura: rei contra rei
+                        continue
+                    after = 1 << white_king | 1 << target | 1 << piece
+                    if not _piece_attacks(piece_type, piece, after) >> target & 1:
+                        successors.append(index_of(True, white_king, target, piece))
+
+            if not successors and not exits:
+                # Sem lances: mate se o rei preto estiver em xeque, senão afogamento.
+                mated = not white_to_move and black_in_check
+                result[index] = LOSS if mated else DRAW
+                if mated:
+                    layers[0].append((index, LOSS))
+                continue
+            result[index] = DRAW  # provisório: vira vitória ou derrota na propagação
+            pending[index] = len(successors) + len(exits)
+            for successor in successors:
+                predecessors[successor].append(index)
+            for exit_result in exits:
+                if exit_result.wdl:
+                    layers[exit_result.dtm].append((~index, LOSS if exit_result.wdl < 0 else WIN))
+
+    # Propagação por camadas de distância: a menor vitória e a maior derrota.
+    resolved = bytearray(size)
+    ply = 0
+    while ply <= max(layers, default=-1):
+        for node, outcome in layers.pop(ply, ()):
+            # Índices negados são saídas para outra tabela: afetam só a posição de origem.
+            parents = [~node] if node < 0 else predecessors[node]
+            for parent in parents:
+                if resolved[parent]:
+                    continue
+                if outcome == LOSS:
+                    resolved[parent] = 1
+                    result[parent], plies[parent] = WIN, ply + 1
+                    layers[ply + 1].append((parent, WIN))
+                else:
+                    pending[parent] -= 1
+                    if not pending[parent]:
+                        resolved[parent] = 1
+                        result[parent], plies[parent] = LOSS, ply + 1
+                        layers[ply + 1].append((parent, LOSS))
+        ply += 1
+
+    for index in range(size):
+        if result[index] in (WIN, LOSS):
+            result[index] = _encode_entry(result[index], plies[index])
+    return bytes(result)
+
+
+def write_table(directory: Union[str, Path], signature: str, data: bytes) -> Path:
+    """Grava a tabela (arquivo temporário e rename atômico)."""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"{signature}{SUFFIX}"
+    header = HEADER.pack(MAGIC, signature.encode(), len(data), zlib.crc32(data))
+    fd, temporary = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(header)
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporary, path)
+    except BaseException:
+        os.unlink(temporary)
+        raise
+    fsync_directory(str(directory))
+    return path
+
+
+def generate_tablebases(directory: Union[str, Path],
+                        signatures: Sequence[str] = DEFAULT_SIGNATURES) -> List[Path]:
+    """Gera e grava as tabelas pedidas e as de que elas dependem."""
+    tables: Dict[str, bytes] = {}
+    for signature in signatures:
+        if signature not in tables:
+            tables[signature] = generate_table(signature, tables)
+    return [write_table(directory, signature, data) for signature, data in tables.items()]
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m src.ai.cache.tablebase",
+                                     description="Gera tabelas de finais por análise retrógrada.")
+    parser.add_argument("directory", help="diretório de saída")
+    parser.add_argument("--tables", nargs="*", default=list(DEFAULT_SIGNATURES),
+                        help="assinaturas a gerar (KQvK, KRvK, KBvK, KNvK, KPvK)")
+    args = parser.parse_args(argv)
+    for path in generate_tablebases(args.directory, args.tables):
+        print(f"{path}: {path.stat().st_size} bytes", file=sys.stdout)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
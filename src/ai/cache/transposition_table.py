@@ -0,0 +1,277 @@
+"""
+Tabela de transposição de tamanho fixo para a busca.
+
+As entradas ficam em um array NumPy pré-alocado, agrupado em buckets de
+duas posições: a primeira prefere a maior profundidade e a segunda é sempre
+substituída. Cada entrada ocupa 16 bytes em duas palavras de 64 bits: os
+dados (score, melhor lance, profundidade, geração e tipo de limite) e a
+chave Zobrist combinada com eles por XOR.
+
+A verificação por XOR permite compartilhar a tabela entre processos sem
+travas (``create_shared``/``attach``): uma entrada escrita pela metade por
+outro processo não confere com a chave e é tratada como ausente.
+"""
+
+import struct
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Dict, Optional, Tuple, Union
+
+import chess
+import numpy as np
+
+from ...core.board import Board, Position
+
+EMPTY = 0
+EXACT = 1
+LOWERBOUND = 2
+UPPERBOUND = 3
+
+FLAG_NAMES = {EXACT: 'exact', LOWERBOUND: 'lowerbound', UPPERBOUND: 'upperbound'}
+FLAG_CODES = {name: code for code, name in FLAG_NAMES.items()}
+
+# Lance em ``store``: chess.Move, UCI ou par (origem, destino); ver ``as_move``.
+MoveLike = Union[chess.Move, str, Tuple[Union[str, Position], Union[str, Position]]]
+
+# 'genbound' guarda o tipo de limite nos 2 bits baixos e a geração nos 6 altos.
+ENTRY_DTYPE = np.dtype([
+    ('check', np.uint64),
+    ('score', np.float32),
+    ('move', np.uint16),
+    ('depth', np.int8),
+    ('genbound', np.uint8),
+])
+# Os mesmos campos de dados, como palavra de 64 bits.
+_DATA = struct.Struct('<fHbB')
+
+BUCKET_SIZE = 2
+DEFAULT_SIZE_MB = 16.0
+
+
+def encode_move(move: Optional[chess.Move]) -> int:
+    """Codifica um lance em 16 bits (origem, destino e promoção); 0 é nenhum lance."""
+    if move is None:
+        return 0
+    return move.from_square | move.to_square << 6 | (move.promotion or 0) << 12
+
+
+def decode_move(code: int) -> Optional[chess.Move]:
+    if not code:
+        return None
+    return chess.Move(code & 63, code >> 6 & 63, (code >> 12) or None)
+
+
+def as_move(move: Optional[MoveLike]) -> Optional[chess.Move]:
+    """
+    ``chess.Move`` a partir das formas de lance aceitas por ``store``: o
+    próprio ``chess.Move``, uma string UCI ou um par (origem, destino) de
+    nomes de casas (``("e2", "e4")``, como em ``Board.move_history``) ou de
+    ``Position``. Em ``Position`` numérica, ``rank`` e ``file`` contam de 0
+    (``Position(rank=3, file=4)`` é e4).
+    """
+    if move is None or isinstance(move, chess.Move):
+        return move
+    if isinstance(move, str):
+        return chess.Move.from_uci(move)
+    from_square, to_square = (_square_of(square) for square in move)
+    return chess.Move(from_square, to_square)
+
+
+def _square_of(square: Union[str, Position]) -> chess.Square:
+    if isinstance(square, str):
+        return chess.parse_square(square)
+    if isinstance(square.file, int):
+        return chess.square(square.file, square.rank)
+    return chess.parse_square(f"{square.file}{square.rank}")
+
+
+def _pack(score: float, move: int, depth: int, genbound: int) -> int:
+    return int.from_bytes(_DATA.pack(score, move, max(-128, min(127, depth)), genbound), 'little')
+
+
+def _unpack(data: int) -> Tuple[float, int, int, int]:
+    return _DATA.unpack(data.to_bytes(8, 'little'))
+
+
+@dataclass
+class TranspositionEntry:
+    """Entrada da tabela de transposição."""
+    key: int
+    depth: int
+    score: float
+    flag: str
+    best_move: Optional[chess.Move]
+    age: int
+
+
+class TranspositionTable:
+    """Tabela de transposição com buckets e orçamento de memória fixo."""
+
+    def __init__(self, max_size: Optional[int] = None, size_mb: float = DEFAULT_SIZE_MB,
+                 buffer=None):
+        """
+        ``max_size`` fixa o número de entradas; sem ele, o tamanho vem de
+        ``size_mb`` megabytes. ``buffer`` usa uma memória já alocada (por
+        exemplo, compartilhada) em vez de alocar uma nova.
+        """
+        if max_size is None:
+            max_size = int(size_mb * 1024 * 1024) // ENTRY_DTYPE.itemsize
+        self.num_buckets = max(1, max_size // BUCKET_SIZE)
+        self.max_size = max_size
+        shape = (self.num_buckets, BUCKET_SIZE, 2)
+        if buffer is None:
+            self.words = np.zeros(shape, dtype=np.uint64)
+        else:
+            self.words = np.ndarray(shape, dtype=np.uint64, buffer=buffer)
+        self.slots = self.words.view(ENTRY_DTYPE).reshape(self.num_buckets, BUCKET_SIZE)
+        # Acesso palavra a palavra sem criar escalares NumPy: cell[4 * bucket + 2 * slot (+ 1)].
+        self._cells = memoryview(self.words.reshape(-1))
+        self.age = 0
+        self._shm: Optional[shared_memory.SharedMemory] = None
+
+    @classmethod
+    def create_shared(cls, size_mb: float = DEFAULT_SIZE_MB) -> "TranspositionTable":
+        """Cria uma tabela em memória compartilhada; outros processos usam ``attach``."""
+        max_size = int(size_mb * 1024 * 1024) // ENTRY_DTYPE.itemsize
+        nbytes = max(1, max_size // BUCKET_SIZE) * BUCKET_SIZE * ENTRY_DTYPE.itemsize
+        shm = shared_memory.SharedMemory(create=True, size=nbytes)
+        table = cls(max_size=max_size, buffer=shm.buf)
+        table.words.fill(0)
+        table._shm = shm
+        return table
+
+    @classmethod
+    def attach(cls, name: str, max_size: int) -> "TranspositionTable":
+        """Abre uma tabela criada por ``create_shared`` em outro processo."""
+        shm = shared_memory.SharedMemory(name=name)
+        table = cls(max_size=max_size, buffer=shm.buf)
+        table._shm = shm
+        return table
+
+    @property
+    def shared_name(self) -> Optional[str]:
+        return self._shm.name if self._shm is not None else None
+
+    def close(self, unlink: bool = False):
+        """Libera a memória compartilhada; ``unlink`` a remove (só no processo que a criou)."""
+        if self._shm is None:
+            return
+        shm, self._shm = self._shm, None
+        self._cells.release()
+        self.words = self.slots = self._cells = None
+        shm.close()
+        if unlink:
+            shm.unlink()
+
+    @property
+    def size_bytes(self) -> int:
+        return self.words.nbytes
+
+    @property
+    def table(self) -> np.ndarray:
+        """Entradas ocupadas (cópia; para inspeção, não para a busca)."""
+        flat = self.slots.reshape(-1)
+        return flat[flat['genbound'] & 3 != EMPTY]
+
+    @staticmethod
+    def _key_of(position: Union[Board, int]) -> int:
+        return position if isinstance(position, int) else position.zobrist_key
+
+    def new_search(self):
+        """Avança a geração; entradas de buscas anteriores passam a ser substituídas primeiro."""
+        self.age = (self.age + 1) & 63
+
+    def _find(self, key: int) -> Tuple[int, int]:
+        """Índice da primeira palavra da entrada de ``key`` e seus dados, ou (-1, 0)."""
+        cells = self._cells
+        base = key % self.num_buckets * 4
+        for index in range(base, base + 2 * BUCKET_SIZE, 2):
+            data = cells[index + 1]
+            if data and cells[index] ^ data == key:
+                return index, data
+        return -1, 0
+
+    def probe(self, key: int) -> Optional[Tuple[int, float, int, int]]:
+        """
+        Busca rápida usada pela busca: ``(profundidade, score, limite, lance)``,
+        com limite e lance nas formas codificadas.
+        """
+        data = self._find(key)[1]
+        if not data:
+            return None
+        score, move, depth, genbound = _unpack(data)
+        return depth, score, genbound & 3, move
+
+    def lookup(self, position: Union[Board, int]) -> Optional[TranspositionEntry]:
+        """Recupera a entrada de uma posição (tabuleiro ou chave Zobrist)."""
+        key = self._key_of(position)
+        data = self._find(key)[1]
+        if not data:
+            return None
+        score, move, depth, genbound = _unpack(data)
+        return TranspositionEntry(key=key, depth=depth, score=score,
+                                  flag=FLAG_NAMES[genbound & 3],
+                                  best_move=decode_move(move), age=genbound >> 2)
+
+    def store(self, position: Union[Board, int], depth: int, score: float,
+              flag: Union[str, int] = 'exact', best_move: Optional[MoveLike] = None):
+        """
+        Armazena o resultado de uma busca.
+
+        A mesma posição é sempre sobrescrita. Uma posição nova ocupa a posição
+        de profundidade se for mais profunda ou se a atual for de outra
+        geração (a antiga desce para a posição de substituição); senão vai
+        direto para a posição de substituição. ``best_move`` aceita as formas
+        de ``as_move`` e volta da consulta como ``chess.Move``.
+        """
+        key = self._key_of(position)
+        bound = FLAG_CODES[flag] if isinstance(flag, str) else flag
+        if best_move is not None and not isinstance(best_move, chess.Move):
+            best_move = as_move(best_move)
+        move = encode_move(best_move)
+        cells = self._cells
+        index, previous = self._find(key)
+        if previous:
+            if not move:
+                # Sem lance novo, preserva o melhor lance já conhecido da posição.
+                move = _unpack(previous)[1]
+        else:
+            index = key % self.num_buckets * 4
+            first_data = cells[index + 1]
+            if first_data:
+                _, _, first_depth, first_genbound = _unpack(first_data)
+                if first_genbound >> 2 == self.age and depth < first_depth:
+                    index += 2
+                else:
+                    cells[index + 3] = first_data
+                    cells[index + 2] = cells[index]
+
+        data = _pack(score, move, depth, self.age << 2 | bound)
+        cells[index + 1] = data
+        cells[index] = key ^ data
+
+    def clear(self):
+        """Limpa a tabela sem realocar."""
+        self.words.fill(0)
+        self.age = 0
+
+    def get_size(self) -> int:
+        """Número de entradas ocupadas."""
+        return int(np.count_nonzero(self.slots['genbound'] & 3))
+
+    def hashfull(self) -> int:
+        """Ocupação em permilagem, estimada pelas primeiras entradas como no protocolo UCI."""
+        sample = self.slots.reshape(-1)[:1000]
+        return int(np.count_nonzero(sample['genbound'] & 3)) * 1000 // len(sample)
+
+    def get_statistics(self) -> Dict[str, int]:
+        """Contagem de entradas por tipo de limite."""
+        bounds = self.slots['genbound'] & 3
+        return {
+            'total_entries': int(np.count_nonzero(bounds)),
+            'capacity': self.num_buckets * BUCKET_SIZE,
+            'size_bytes': self.size_bytes,
+            'exact_scores': int(np.count_nonzero(bounds == EXACT)),
+            'lowerbound_scores': int(np.count_nonzero(bounds == LOWERBOUND)),
+            'upperbound_scores': int(np.count_nonzero(bounds == UPPERBOUND)),
+        }
@@ -2,8 +2,17 @@
 Sistema de avaliação do tabuleiro para a IA de xadrez.
 """
 
-from typing import Dict, Tuple
-from ..core.board import Board, Color, Piece, PieceType
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..core.board import Board, Color, Piece, PieceType, PieceSquareTable
+from ..core.board.board import Bitboards
+from .cache.pawn_table import PawnEntry, PawnHashTable
+from ..traditional.bitboards import (
+    BB_SQUARES, KING_ATTACKS, KNIGHT_ATTACKS, bishop_attacks, lsb, popcount, queen_attacks,
+    rook_attacks, scan
+)
 
 # Valores das peças
 PIECE_VALUES = {
@@ -15,8 +24,26 @@ PIECE_VALUES = {
     PieceType.KING: 20000
 }
 
-# Tabelas de posição para cada tipo de peça
-PAWN_TABLE = [
+# Fases da partida; as tabelas de posição têm um valor para cada uma.
+MIDGAME = 0
+ENDGAME = 1
+
+# Peso de cada peça na fase: a posição inicial soma MAX_PHASE (meio-jogo puro)
+# e a fase cai até 0 (final puro) conforme as peças saem do tabuleiro.
+PHASE_WEIGHTS = {
+    PieceType.KNIGHT: 1,
+    PieceType.BISHOP: 1,
+    PieceType.ROOK: 2,
+    PieceType.QUEEN: 4
+}
+MAX_PHASE = 24
+
+def _flat(rows: List[List[int]]) -> np.ndarray:
+    """Converte uma tabela 8x8 (linha 0 = oitava fileira, visão das brancas) em array plano por casa (a1 = 0)."""
+    return np.array(rows[::-1], dtype=np.int16).reshape(64)
+
+# Tabelas de posição para cada tipo de peça, do ponto de vista das brancas
+PAWN_TABLE = _flat([
     [0,  0,  0,  0,  0,  0,  0,  0],
     [50, 50, 50, 50, 50, 50, 50, 50],
     [10, 10, 20, 30, 30, 20, 10, 10],
@@ -25,9 +52,9 @@ PAWN_TABLE = [
     [5, -5,-10,  0,  0,-10, -5,  5],
     [5, 10, 10,-20,-20, 10, 10,  5],
     [0,  0,  0,  0,  0,  0,  0,  0]
-]
+])
 
-KNIGHT_TABLE = [
+KNIGHT_TABLE = _flat([
     [-50,-40,-30,-30,-30,-30,-40,-50],
     [-40,-20,  0,  0,  0,  0,-20,-40],
     [-30,  0, 10, 15, 15, 10,  0,-30],
@@ -36,9 +63,9 @@ KNIGHT_TABLE = [
     [-30,  5, 10, 15, 15, 10,  5,-30],
     [-40,-20,  0,  5,  5,  0,-20,-40],
     [-50,-40,-30,-30,-30,-30,-40,-50]
-]
+])
 
-BISHOP_TABLE = [
+BISHOP_TABLE = _flat([
     [-20,-10,-10,-10,-10,-10,-10,-20],
     [-10,  0,  0,  0,  0,  0,  0,-10],
     [-10,  0,  5, 10, 10,  5,  0,-10],
@@ -47,9 +74,9 @@ BISHOP_TABLE = [
     [-10, 10, 10, 10, 10, 10, 10,-10],
     [-10,  5,  0,  0,  0,  0,  5,-10],
     [-20,-10,-10,-10,-10,-10,-10,-20]
-]
+])
 
-ROOK_TABLE = [
+ROOK_TABLE = _flat([
     [0,  0,  0,  0,  0,  0,  0,  0],
     [5, 10, 10, 10, 10, 10, 10,  5],
     [-5,  0,  0,  0,  0,  0,  0, -5],
@@ -58,9 +85,9 @@ ROOK_TABLE = [
     [-5,  0,  0,  0,  0,  0,  0, -5],
     [-5,  0,  0,  0,  0,  0,  0, -5],
     [0,  0,  0,  5,  5,  0,  0,  0]
-]
+])
 
-QUEEN_TABLE = [
+QUEEN_TABLE = _flat([
     [-20,-10,-10, -5, -5,-10,-10,-20],
     [-10,  0,  0,  0,  0,  0,  0,-10],
     [-10,  0,  5,  5,  5,  5,  0,-10],
@@ -69,9 +96,9 @@ QUEEN_TABLE = [
     [-10,  5,  5,  5,  5,  5,  0,-10],
     [-10,  0,  5,  0,  0,  0,  0,-10],
     [-20,-10,-10, -5, -5,-10,-10,-20]
-]
+])
 
-KING_TABLE = [
+KING_TABLE = _flat([
     [-30,-40,-40,-50,-50,-40,-40,-30],
     [-30,-40,-40,-50,-50,-40,-40,-30],
     [-30,-40,-40,-50,-50,-40,-40,-30],
@@ -80,58 +107,288 @@ KING_TABLE = [
     [-10,-20,-20,-20,-20,-20,-20,-10],
     [20, 20,  0,  0,  0,  0, 20, 20],
     [20, 30, 10,  0,  0, 10, 30, 20]
+])
+
+# No final, peões valem pelo avanço e o rei deve ir para o centro.
+PAWN_ENDGAME_TABLE = _flat([
+    [0,  0,  0,  0,  0,  0,  0,  0],
+    [80, 80, 80, 80, 80, 80, 80, 80],
+    [50, 50, 50, 50, 50, 50, 50, 50],
+    [30, 30, 30, 30, 30, 30, 30, 30],
+    [15, 15, 15, 15, 15, 15, 15, 15],
+    [5,  5,  5,  5,  5,  5,  5,  5],
+    [0,  0,  0,  0,  0,  0,  0,  0],
+    [0,  0,  0,  0,  0,  0,  0,  0]
+])
+
+KING_ENDGAME_TABLE = _flat([
+    [-50,-40,-30,-20,-20,-30,-40,-50],
+    [-30,-20,-10,  0,  0,-10,-20,-30],
+    [-30,-10, 20, 30, 30, 20,-10,-30],
+    [-30,-10, 30, 40, 40, 30,-10,-30],
+    [-30,-10, 30, 40, 40, 30,-10,-30],
+    [-30,-10, 20, 30, 30, 20,-10,-30],
+    [-30,-30,  0,  0,  0,  0,-30,-30],
+    [-50,-30,-30,-30,-30,-30,-30,-50]
+])
+
+PHASE_TABLES = {
+    MIDGAME: {
+        PieceType.PAWN: PAWN_TABLE,
+        PieceType.KNIGHT: KNIGHT_TABLE,
+        PieceType.BISHOP: BISHOP_TABLE,
+        PieceType.ROOK: ROOK_TABLE,
+        PieceType.QUEEN: QUEEN_TABLE,
+        PieceType.KING: KING_TABLE
+    },
+    ENDGAME: {
+        PieceType.PAWN: PAWN_ENDGAME_TABLE,
+        PieceType.KNIGHT: KNIGHT_TABLE,
+        PieceType.BISHOP: BISHOP_TABLE,
+        PieceType.ROOK: ROOK_TABLE,
+        PieceType.QUEEN: QUEEN_TABLE,
+        PieceType.KING: KING_ENDGAME_TABLE
+    }
+}
+
+# Casa equivalente do ponto de vista do outro lado (a1 <-> a8).
+MIRROR = np.arange(64) ^ 56
+
+def _build_position_tables() -> np.ndarray:
+    tables = np.zeros((2, 2, 7, 64), dtype=np.int16)
+    for phase, by_type in PHASE_TABLES.items():
+        for piece_type, table in by_type.items():
+            tables[phase, int(Color.WHITE.value), piece_type.value] = table
+            tables[phase, int(Color.BLACK.value), piece_type.value] = table[MIRROR]
+    return tables
+
+# POSITION_TABLES[fase][cor][tipo][casa], com as tabelas das pretas já espelhadas;
+# a cor e o tipo seguem a numeração do python-chess (pretas = 0, peão = 1).
+POSITION_TABLES = _build_position_tables()
+
+def _build_value_tables() -> np.ndarray:
+    values = np.zeros((7,), dtype=np.int16)
+    for piece_type, value in PIECE_VALUES.items():
+        values[piece_type.value] = value
+    return POSITION_TABLES + values[:, None]
+
+# Valor base mais posicional, por fase; VALUE_TABLES[fase][cor][tipo][casa].
+VALUE_TABLES = _build_value_tables()
+
+# Material e posição somados incrementalmente pelo tabuleiro a cada lance, uma soma por fase.
+MIDGAME_TABLE = PieceSquareTable(VALUE_TABLES[MIDGAME].tolist())
+ENDGAME_TABLE = PieceSquareTable(VALUE_TABLES[ENDGAME].tolist())
+
+# Estrutura de peões: penalidade por peão extra na coluna, por peão isolado e
+# bônus do peão passado pela fileira relativa (0 = primeira fileira do lado).
+DOUBLED_PAWN_PENALTY = 10
+ISOLATED_PAWN_PENALTY = 15
+PASSED_PAWN_BONUS = (0, 5, 10, 20, 35, 60, 100, 0)
+
+# Peso de cada casa alcançável (vazia ou com peça adversária) na mobilidade.
+MOBILITY_WEIGHTS = {
+    PieceType.KNIGHT: 4,
+    PieceType.BISHOP: 3,
+    PieceType.ROOK: 2,
+    PieceType.QUEEN: 1
+}
+
+FILE_MASKS = [0x0101010101010101 << file for file in range(8)]
+ADJACENT_FILE_MASKS = [
+    (FILE_MASKS[file - 1] if file > 0 else 0) | (FILE_MASKS[file + 1] if file < 7 else 0)
+    for file in range(8)
 ]
 
-POSITION_TABLES = {
-    PieceType.PAWN: PAWN_TABLE,
-    PieceType.KNIGHT: KNIGHT_TABLE,
-    PieceType.BISHOP: BISHOP_TABLE,
-    PieceType.ROOK: ROOK_TABLE,
-    PieceType.QUEEN: QUEEN_TABLE,
-    PieceType.KING: KING_TABLE
+def _passed_pawn_masks() -> List[List[int]]:
+    masks = [[0] * 64, [0] * 64]
+    for square in range(64):
+        rank, file = divmod(square, 8)
+        span = FILE_MASKS[file] | ADJACENT_FILE_MASKS[file]
+        # Fileiras à frente do peão: acima para as brancas, abaixo para as pretas.
+        below = (1 << 8 * rank) - 1
+        masks[1][square] = span & ~below & ~(0xFF << 8 * rank)
+        masks[0][square] = span & below
+    return masks
+
+# PASSED_PAWN_MASKS[cor][casa]: casas que um peão adversário precisa ocupar para
+# barrar ou capturar o peão em ``casa`` (cor na numeração do python-chess).
+PASSED_PAWN_MASKS = _passed_pawn_masks()
+
+# Segurança do rei: bônus por peão do escudo e custo por casa atacada da zona do
+# rei, por tipo de atacante. O total cai a zero no final, junto com a fase.
+KING_SHIELD_BONUS = 10
+KING_ATTACK_WEIGHTS = {
+    PieceType.KNIGHT: 2,
+    PieceType.BISHOP: 2,
+    PieceType.ROOK: 3,
+    PieceType.QUEEN: 5
 }
 
-def get_piece_position_value(piece: Piece, row: int, col: int) -> int:
-    """Retorna o valor posicional de uma peça."""
-    table = POSITION_TABLES[piece.type]
-    if piece.color == Color.BLACK:
-        # Inverte a tabela para peças pretas
-        row = 7 - row
-        return table[row][col]
-    return table[row][col]
+def _king_masks() -> Tuple[List[List[int]], List[List[int]]]:
+    zones = [[0] * 64, [0] * 64]
+    shields = [[0] * 64, [0] * 64]
+    for square in range(64):
+        rank, file = divmod(square, 8)
+        around = KING_ATTACKS[square] | BB_SQUARES[square]
+        span = FILE_MASKS[file] | ADJACENT_FILE_MASKS[file]
+        # Zona: o rei, as casas vizinhas e a fileira seguinte na direção do adversário.
+        zones[1][square] = around | (around << 8) & (1 << 64) - 1
+        zones[0][square] = around | around >> 8
+        # Escudo: as duas fileiras à frente do rei, na sua coluna e nas vizinhas.
+        ahead = sum(0xFF << 8 * r for r in (rank + 1, rank + 2) if r < 8)
+        behind = sum(0xFF << 8 * r for r in (rank - 1, rank - 2) if r >= 0)
+        shields[1][square] = span & ahead
+        shields[0][square] = span & behind
+    return zones, shields
+
+# KING_ZONE_MASKS[cor][casa do rei] e KING_SHIELD_MASKS[cor][casa do rei].
+KING_ZONE_MASKS, KING_SHIELD_MASKS = _king_masks()
+
+# Peças que contam na mobilidade e no ataque ao rei: bitboard, função de ataques
+# e os dois pesos, já resolvidos para não consultar os dicionários a cada nó.
+_ATTACKERS = tuple(
+    (name, attacks_of, MOBILITY_WEIGHTS[piece_type], KING_ATTACK_WEIGHTS[piece_type])
+    for piece_type, name, attacks_of in (
+        (PieceType.KNIGHT, 'knights', lambda square, occupied: KNIGHT_ATTACKS[square]),
+        (PieceType.BISHOP, 'bishops', bishop_attacks),
+        (PieceType.ROOK, 'rooks', rook_attacks),
+        (PieceType.QUEEN, 'queens', queen_attacks)
+    )
+)
+
+# Estrutura de peões já avaliada, pela chave Zobrist só dos peões.
+PAWN_HASH = PawnHashTable()
+
+def game_phase(board: Board) -> int:
+    """Fase da partida, de MAX_PHASE (todas as peças) a 0 (só reis e peões)."""
+    return _phase(board.bitboards())
+
+def _phase(bbs: Bitboards) -> int:
+    phase = (popcount(bbs.knights | bbs.bishops)
+             + 2 * popcount(bbs.rooks)
+             + 4 * popcount(bbs.queens))
+    return min(phase, MAX_PHASE)
+
+def taper(midgame: int, endgame: int, phase: int) -> int:
+    """Interpola entre os valores de meio-jogo e de final conforme a fase."""
+    return (midgame * phase + endgame * (MAX_PHASE - phase)) // MAX_PHASE
+
+def get_piece_position_value(piece: Piece, row: int, col: int, phase: int = MAX_PHASE) -> int:
+    """Retorna o valor posicional de uma peça na fase dada (por padrão, meio-jogo)."""
+    square = (7 - row) * 8 + col
+    color = int(piece.color.value)
+    return taper(int(POSITION_TABLES[MIDGAME, color, piece.type.value, square]),
+                 int(POSITION_TABLES[ENDGAME, color, piece.type.value, square]),
+                 phase)
 
-def evaluate_piece(piece: Piece, row: int, col: int) -> int:
+def evaluate_piece(piece: Piece, row: int, col: int, phase: int = MAX_PHASE) -> int:
     """Avalia uma peça individual considerando seu valor base e posição."""
     base_value = PIECE_VALUES[piece.type]
-    position_value = get_piece_position_value(piece, row, col)
+    position_value = get_piece_position_value(piece, row, col, phase)
     return base_value + position_value
 
 def evaluate_material(board: Board) -> Dict[Color, int]:
-    """Avalia o material total para cada cor."""
-    material = {Color.WHITE: 0, Color.BLACK: 0}
-    
-    for row in range(8):
-        for col in range(8):
-            piece = board.get_piece(row, col)
-            if piece is not None:
-                material[piece.color] += evaluate_piece(piece, row, col)
-                
-    return material
+    """Avalia o material total para cada cor, interpolado pela fase da partida."""
+    return _by_color(_material(board, game_phase(board)))
+
+def _material(board: Board, phase: int) -> List[int]:
+    white_midgame, black_midgame = board.piece_square_totals(MIDGAME_TABLE)
+    white_endgame, black_endgame = board.piece_square_totals(ENDGAME_TABLE)
+    return [taper(black_midgame, black_endgame, phase),
+            taper(white_midgame, white_endgame, phase)]
+
+def _king_square(kings: int) -> Optional[int]:
+    return lsb(kings) if kings else None
+
+def _by_color(values: Sequence[int]) -> Dict[Color, int]:
+    return {Color.WHITE: values[1], Color.BLACK: values[0]}
+
+def _attack_terms(bbs: Bitboards) -> Tuple[List[int], List[int]]:
+    """
+    Mobilidade de cada cor e pressão sobre a zona do rei adversário, em uma
+    única passada pelas peças; listas indexadas pela cor do python-chess.
+    """
+    occupied = bbs.white | bbs.black
+    sides = (bbs.black, bbs.white)
+    mobility = [0, 0]
+    pressure = [0, 0]
+    for color in (0, 1):
+        own = sides[color]
+        enemy_king = _king_square(bbs.kings & sides[1 - color])
+        zone = KING_ZONE_MASKS[1 - color][enemy_king] if enemy_king is not None else 0
+        reachable = ~own
+        for name, attacks_of, weight, attack_weight in _ATTACKERS:
+            pieces = getattr(bbs, name) & own
+            # Mesmo laço de scan(), sem o custo do gerador: é o trecho mais quente da avaliação.
+            while pieces:
+                low = pieces & -pieces
+                attacks = attacks_of(low.bit_length() - 1, occupied)
+                mobility[color] += weight * popcount(attacks & reachable)
+                if attacks & zone:
+                    pressure[color] += attack_weight * popcount(attacks & zone)
+                pieces ^= low
+    return mobility, pressure
 
 def evaluate_mobility(board: Board) -> Dict[Color, int]:
     """Avalia a mobilidade das peças de cada cor."""
-    # TODO: Implementar avaliação de mobilidade
-    return {Color.WHITE: 0, Color.BLACK: 0}
+    return _by_color(_attack_terms(board.bitboards())[0])
+
+def pawn_structure_terms(pawns: int, enemy_pawns: int, color: int) -> Tuple[int, int, int, int]:
+    """
+    Estrutura dos peões de uma cor: ``(score, passados, isolados, dobrados)``,
+    com as três máscaras como bitboards. ``color`` segue o python-chess.
+    """
+    score = passed = isolated = doubled = 0
+    for file in range(8):
+        on_file = pawns & FILE_MASKS[file]
+        if not on_file:
+            continue
+        count = popcount(on_file)
+        if count > 1:
+            doubled |= on_file
+            score -= DOUBLED_PAWN_PENALTY * (count - 1)
+        if not pawns & ADJACENT_FILE_MASKS[file]:
+            isolated |= on_file
+            score -= ISOLATED_PAWN_PENALTY * count
+    masks = PASSED_PAWN_MASKS[color]
+    for square in scan(pawns):
+        if not enemy_pawns & masks[square]:
+            passed |= BB_SQUARES[square]
+            rank = square >> 3
+            score += PASSED_PAWN_BONUS[rank if color else 7 - rank]
+    return score, passed, isolated, doubled
 
 def evaluate_pawn_structure(board: Board) -> Dict[Color, int]:
-    """Avalia a estrutura de peões."""
-    # TODO: Implementar avaliação de estrutura de peões
-    return {Color.WHITE: 0, Color.BLACK: 0}
+    """Avalia a estrutura de peões (dobrados, isolados e passados)."""
+    return _by_color(pawn_structure(board).scores)
+
+def pawn_structure(board: Board, bbs: Optional[Bitboards] = None) -> PawnEntry:
+    """Estrutura de peões completa (scores e máscaras), pela tabela de hash de peões."""
+    key = board.pawn_key
+    return PAWN_HASH.probe(key) or _store_pawn_structure(key, bbs or board.bitboards())
+
+def _store_pawn_structure(key: int, bbs: Bitboards) -> PawnEntry:
+    white_pawns, black_pawns = bbs.pawns & bbs.white, bbs.pawns & bbs.black
+    black = pawn_structure_terms(black_pawns, white_pawns, 0)
+    white = pawn_structure_terms(white_pawns, black_pawns, 1)
+    return PAWN_HASH.store(key, *zip(black, white))
+
+def _king_safety(bbs: Bitboards, pressure: List[int], phase: int) -> List[int]:
+    sides = (bbs.black, bbs.white)
+    safety = [0, 0]
+    for color in (0, 1):
+        king = _king_square(bbs.kings & sides[color])
+        if king is None:
+            continue
+        shield = popcount(KING_SHIELD_MASKS[color][king] & bbs.pawns & sides[color])
+        raw = KING_SHIELD_BONUS * shield - pressure[1 - color]
+        safety[color] = raw * phase // MAX_PHASE
+    return safety
 
 def evaluate_king_safety(board: Board) -> Dict[Color, int]:
-    """Avalia a segurança do rei."""
-    # TODO: Implementar avaliação de segurança do rei
-    return {Color.WHITE: 0, Color.BLACK: 0}
+    """Avalia a segurança do rei: escudo de peões e ataques à zona do rei, pesados pela fase."""
+    bbs = board.bitboards()
+    return _by_color(_king_safety(bbs, _attack_terms(bbs)[1], _phase(bbs)))
 
 def evaluate_position(board: Board) -> int:
     """
@@ -139,25 +396,29 @@ def evaluate_position(board: Board) -> int:
     Retorna um valor positivo se as brancas estão melhor,
     negativo se as pretas estão melhor.
     """
-    # Avalia diferentes aspectos da posição
-    material = evaluate_material(board)
-    mobility = evaluate_mobility(board)
-    pawn_structure = evaluate_pawn_structure(board)
-    king_safety = evaluate_king_safety(board)
+    # Material e posição vêm dos acumuladores do tabuleiro; mobilidade e ataques ao
+    # rei saem de uma única passada pelas peças.
+    bbs = board.bitboards()
+    phase = _phase(bbs)
+    material = _material(board, phase)
+    pawn_key = board.pawn_key
+    pawns = PAWN_HASH.probe_scores(pawn_key) or _store_pawn_structure(pawn_key, bbs).scores
+    mobility, pressure = _attack_terms(bbs)
+    king_safety = _king_safety(bbs, pressure, phase)
     
     # Combina as avaliações com pesos
     white_score = (
-        material[Color.WHITE] +
-        mobility[Color.WHITE] +
-        pawn_structure[Color.WHITE] +
-        king_safety[Color.WHITE]
+        material[1] +
+        mobility[1] +
+        pawns[1] +
+        king_safety[1]
     )
     
     black_score = (
-        material[Color.BLACK] +
-        mobility[Color.BLACK] +
-        pawn_structure[Color.BLACK] +
-        king_safety[Color.BLACK]
+        material[0] +
+        mobility[0] +
+        pawns[0] +
+        king_safety[0]
     )
     
     return white_score - black_score
@@ -0,0 +1,227 @@
+"""
+Busca paralela Lazy SMP.
+
+Vários processos buscam a mesma raiz ao mesmo tempo e compartilham uma
+tabela de transposição em memória compartilhada, sem travas (ver
+``TranspositionTable.create_shared``). Os processos não dividem a árvore:
+cada um faz o seu aprofundamento iterativo, e o que um deles grava na
+tabela poda a busca dos outros. Os auxiliares começam em profundidades
+alternadas para não percorrerem as mesmas iterações em sincronia.
+
+O processo principal também busca; quando ele termina, os auxiliares são
+interrompidos e vale o resultado da iteração completa mais profunda. Um
+auxiliar que morre (falta de memória, kill) ou não responde ao pedido de
+parada é descartado e a busca fica com os resultados que chegaram; os
+auxiliares que faltam são recriados na busca seguinte.
+
+Os auxiliares são criados logo no construtor, pelo ``forkserver`` (ou
+``spawn`` onde ele não existe), e não por ``fork``: a busca costuma rodar
+numa thread (UCI, ponderação, API), e um processo copiado por ``fork``
+enquanto outra thread segura uma trava herda essa trava fechada para sempre.
+"""
+
+import multiprocessing
+import os
+import pickle
+import queue
+import time
+from typing import Callable, List, Optional
+
+from ..core.board import Board
+from .cache.transposition_table import TranspositionTable
+from .evaluation import evaluate_position
+from .search import AlphaBetaSearch, SearchInfo, SearchResult
+
+DEFAULT_HASH_MB = 64.0
+# Depois do pedido de parada, quanto esperar pelos auxiliares (segundos) e de
+# quanto em quanto tempo verificar se algum morreu.
+HELPER_RESULT_TIMEOUT = 5.0
+HELPER_POLL_INTERVAL = 0.05
+
+# Identificador da mensagem de prontidão; as buscas são numeradas a partir de 1.
+_READY = 0
+
+
+def _helper_main(table_name: str, max_size: int, evaluate: Callable[[Board], int],
+                 tasks, results, stop_event):
+    """Laço de um processo auxiliar: busca cada tarefa até receber None."""
+    table = TranspositionTable.attach(table_name, max_size)
+    engine = AlphaBetaSearch(table=table, evaluate=evaluate, stop_event=stop_event)
+    # Avisa que terminou de importar e está pronto para buscar.
+    results.put((_READY, None))
+    try:
+        while True:
+            task = tasks.get()
+            if task is None:
+                break
+            search_id, snapshot, depth, movetime, nodes, start_depth, age, check_interval = task
+            board = pickle.loads(snapshot)
+            # Mesma frequência de verificação do principal, para parar junto com ele.
+            engine.check_interval = check_interval
+            # search() avança a geração; o auxiliar deve ficar na mesma do principal.
+            table.age = (age - 1) & 63
+            results.put((search_id, engine.search(board, depth=depth, movetime=movetime,
+                                                  nodes=nodes, start_depth=start_depth)))
+    finally:
+        table.close()
+
+
+def _drain(tasks):
+    while True:
+        try:
+            tasks.get_nowait()
+        except queue.Empty:
+            return
+
+
+class LazySMPSearch:
+    """Busca alpha-beta em vários processos com tabela de transposição compartilhada."""
+
+    def __init__(self, threads: Optional[int] = None, hash_mb: float = DEFAULT_HASH_MB,
+                 evaluate: Callable[[Board], int] = evaluate_position):
+        """
+        ``threads`` é o número total de processos de busca, contando o
+        principal (por padrão, um por núcleo).
+        """
+        self.threads = max(1, threads or os.cpu_count() or 1)
+        self.evaluate = evaluate
+        self.table = TranspositionTable.create_shared(hash_mb)
+        if 'forkserver' in multiprocessing.get_all_start_methods():
+            self._context = multiprocessing.get_context('forkserver')
+            # O servidor importa o motor uma vez; cada auxiliar já nasce com ele carregado.
+            self._context.set_forkserver_preload([__name__])
+        else:
+            self._context = multiprocessing.get_context('spawn')
+        self._stop_event = self._context.Event()
+        self.engine = AlphaBetaSearch(table=self.table, evaluate=evaluate,
+                                      stop_event=self._stop_event)
+        self._tasks = self._context.Queue()
+        self._results = self._context.Queue()
+        self._helpers: List[multiprocessing.process.BaseProcess] = []
+        self._search_id = 0
+        self._wait_ready(self._start_helpers())
+
+    def __enter__(self) -> "LazySMPSearch":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _start_helpers(self) -> int:
+        """Recria os auxiliares que faltam; devolve quantos foram criados."""
+        self._helpers = [helper for helper in self._helpers if helper.is_alive()]
+        started = 0
+        while len(self._helpers) < self.threads - 1:
+            helper = self._context.Process(
+                target=_helper_main,
+                args=(self.table.shared_name, self.table.max_size, self.evaluate,
+                      self._tasks, self._results, self._stop_event),
+                daemon=True,
+            )
+            helper.start()
+            self._helpers.append(helper)
+            started += 1
+        return started
+
+    def _wait_ready(self, count: int):
+        """Espera ``count`` auxiliares avisarem que estão prontos, até ``HELPER_RESULT_TIMEOUT``."""
+        deadline = time.monotonic() + HELPER_RESULT_TIMEOUT
+        while count > 0:
+            try:
+                self._results.get(timeout=HELPER_POLL_INTERVAL)
+            except queue.Empty:
+                if time.monotonic() >= deadline or not any(
+                        helper.is_alive() for helper in self._helpers):
+                    return
+                continue
+            count -= 1
+
+    def search(self, board: Board, depth: Optional[int] = None,
+               movetime: Optional[float] = None, nodes: Optional[int] = None,
+               soft_time: Optional[float] = None,
+               on_iteration: Optional[Callable[[SearchInfo], None]] = None,
+               multipv: int = 1) -> SearchResult:
+        """
+        Mesma interface de ``AlphaBetaSearch.search``; o limite de nós é
+        dividido entre os processos e ``nodes`` no resultado soma todos eles.
+        O prazo flexível, o callback e o multi-PV valem para o processo
+        principal, que interrompe os auxiliares ao terminar; os auxiliares só
+        alimentam a tabela.
+        """
+        self._start_helpers()
+        # Tarefas que um auxiliar morto não chegou a pegar.
+        _drain(self._tasks)
+        self._stop_event.clear()
+        self._search_id += 1
+        share = -(-nodes // self.threads) if nodes is not None else None
+        age = (self.table.age + 1) & 63
+        # A fila serializa em outra thread; o tabuleiro é fotografado antes que a busca o altere.
+        snapshot = pickle.dumps(board)
+        for index in range(1, self.threads):
+            self._tasks.put((self._search_id, snapshot, depth, movetime, share,
+                             1 + index % 2, age, self.engine.check_interval))
+
+        main = self.engine.search(board, depth=depth, movetime=movetime, nodes=share,
+                                  soft_time=soft_time, on_iteration=on_iteration,
+                                  multipv=multipv)
+        self._stop_event.set()
+        results = [main] + self._collect(self.threads - 1)
+
+        if multipv > 1:
+            # As linhas do multi-PV só existem no principal.
+            best = main
+        else:
+            # max() devolve o primeiro em caso de empate, preferindo o processo principal.
+            best = max(results, key=lambda result: result.depth)
+        return SearchResult(best.best_move, best.score, best.depth,
+                            sum(result.nodes for result in results), main.elapsed, best.pv,
+                            best.lines)
+
+    def _collect(self, expected: int) -> List[SearchResult]:
+        """
+        Resultados desta busca vindos dos auxiliares. Para de esperar por um
+        auxiliar que morreu e, passado ``HELPER_RESULT_TIMEOUT``, encerra os
+        que não responderam.
+        """
+        results: List[SearchResult] = []
+        deadline = time.monotonic() + HELPER_RESULT_TIMEOUT
+        while len(results) < expected:
+            try:
+                search_id, result = self._results.get(timeout=HELPER_POLL_INTERVAL)
+            except queue.Empty:
+                alive = [helper for helper in self._helpers if helper.is_alive()]
+                if len(alive) < len(self._helpers):
+                    expected -= len(self._helpers) - len(alive)
+                    self._helpers = alive
+                elif time.monotonic() >= deadline:
+                    for helper in self._helpers:
+                        helper.terminate()
+                    self._helpers.clear()
+                    break
+                continue
+            # Resultados atrasados de buscas anteriores são descartados.
+            if search_id == self._search_id:
+                results.append(result)
+        return results
+
+    def stop(self):
+        """Interrompe a busca em andamento em todos os processos."""
+        self._stop_event.set()
+
+    def clear(self):
+        """Esquece a tabela compartilhada e o histórico do processo principal."""
+        self.engine.clear()
+
+    def close(self):
+        """Encerra os auxiliares e libera a memória compartilhada."""
+        if self.table.shared_name is None:
+            return
+        self._stop_event.set()
+        for _ in self._helpers:
+            self._tasks.put(None)
+        for helper in self._helpers:
+            helper.join(timeout=5)
+            if helper.is_alive():
+                helper.terminate()
+        self._helpers.clear()
+        self.table.close(unlink=True)
@@ -0,0 +1,202 @@
+"""
+Ponderação: busca em segundo plano enquanto o adversário pensa.
+
+Depois de escolher o lance, ``PonderingSearch`` joga-o numa cópia do
+tabuleiro junto com a resposta esperada (o segundo lance da variante
+principal) e continua buscando essa posição numa thread. Quando o lance do
+adversário chega:
+
+- acerto (a posição é a ponderada): a busca em segundo plano já é a busca
+  da vez. Se ela já alcançou a profundidade pedida ou já usou o prazo
+  flexível do relógio, a resposta é imediata; senão continua até o que
+  falta, contando o tempo já ponderado;
+- erro: a busca em segundo plano é interrompida e uma nova começa.
+
+Nos dois casos o motor e a sua tabela de transposição são os mesmos entre
+os lances, então as primeiras iterações da busca seguinte saem da tabela.
+"""
+
+import pickle
+import threading
+import time
+from typing import Callable, Optional
+
+from ..core.board import Board
+from .search import DEFAULT_DEPTH, AlphaBetaSearch, SearchInfo, SearchResult
+from .time_manager import SearchController, SearchLimits, allocate_time
+
+# Limite de uma ponderação sem acerto nem erro (o adversário sumiu).
+MAX_PONDER_TIME = 60.0
+
+
+class PonderingSearch:
+    """Busca com controle de tempo que pondera a resposta esperada entre os lances."""
+
+    def __init__(self, engine: Optional[AlphaBetaSearch] = None,
+                 max_ponder_time: float = MAX_PONDER_TIME):
+        self.controller = SearchController(engine)
+        self.max_ponder_time = max_ponder_time
+        self.ponder_hits = 0
+        self.ponder_misses = 0
+        self.last_ponder_hit = False
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        # Serializa o término da ponderação entre quem a interrompe e close().
+        self._join_lock = threading.Lock()
+        self._closed = False
+        self._ponder_key: Optional[int] = None
+        self._ponder_multipv = 1
+        self._ponder_start = 0.0
+        self._ponder_info: Optional[SearchInfo] = None
+        self._ponder_result: Optional[SearchResult] = None
+        # Critérios de parada da ponderação, definidos no acerto ou no cancelamento.
+        self._cancelled = False
+        self._stop_depth: Optional[int] = None
+        self._stop_nodes: Optional[int] = None
+        self._stop_time: Optional[float] = None
+        self._timer: Optional[threading.Timer] = None
+        # Callback de quem aproveitou a ponderação, chamado nas iterações seguintes.
+        self._on_iteration: Optional[Callable[[SearchInfo], None]] = None
+
+    @property
+    def pondering(self) -> bool:
+        return self._thread is not None
+
+    def think(self, board: Board, limits: Optional[SearchLimits] = None,
+              on_iteration: Optional[Callable[[SearchInfo], None]] = None,
+              ponder: bool = True, multipv: int = 1) -> SearchResult:
+        """
+        Melhor lance para o lado a jogar dentro de ``limits``, aproveitando a
+        ponderação se ela acertou a posição. Com ``ponder``, começa a
+        ponderar a resposta esperada antes de retornar; a ponderação analisa
+        as mesmas ``multipv`` linhas.
+        """
+        limits = limits or SearchLimits()
+        result = None
+        if self._thread is not None:
+            if board.zobrist_key == self._ponder_key and multipv == self._ponder_multipv:
+                result = self._ponder_hit(board, limits, on_iteration)
+                self.ponder_hits += 1
+            else:
+                self.stop_pondering()
+                self.ponder_misses += 1
+        self.last_ponder_hit = result is not None
+        if result is None:
+            result = self.controller.search(board, limits, on_iteration=on_iteration,
+                                            multipv=multipv)
+        if ponder:
+            self.start_pondering(board, result, multipv)
+        return result
+
+    def start_pondering(self, board: Board, result: SearchResult, multipv: int = 1) -> bool:
+        """
+        Pondera a posição depois de ``result.best_move`` e da resposta
+        esperada; devolve False se não há resposta a ponderar.
+        """
+        self.stop_pondering()
+        if self._closed or result.best_move is None or len(result.pv) < 2:
+            return False
+        # A busca em segundo plano não pode mexer no tabuleiro de quem chamou.
+        position = pickle.loads(pickle.dumps(board))
+        position.push(result.best_move)
+        if result.pv[1] not in position.legal_moves():
+            return False
+        position.push(result.pv[1])
+        with self._lock:
+            self._cancelled = False
+            self._stop_depth = self._stop_nodes = self._stop_time = None
+            self._ponder_info = None
+            self._on_iteration = None
+        self._ponder_result = None
+        self._ponder_key = position.zobrist_key
+        self._ponder_multipv = multipv
+        self._ponder_start = time.perf_counter()
+        self._thread = threading.Thread(target=self._ponder, args=(position,), daemon=True)
+        self._thread.start()
+        return True
+
+    def _ponder(self, position: Board):
+        limits = SearchLimits(movetime=self.max_ponder_time)
+        self._ponder_result = self.controller.search(position, limits,
+                                                     on_iteration=self._ponder_iteration,
+                                                     multipv=self._ponder_multipv)
+
+    def _ponder_iteration(self, info: SearchInfo):
+        with self._lock:
+            self._ponder_info = info
+            # Sob a trava, para não passar à frente da iteração repassada no acerto.
+            if self._on_iteration is not None:
+                self._on_iteration(info)
+            finished = (self._cancelled
+                        or (self._stop_depth is not None and info.depth >= self._stop_depth)
+                        or (self._stop_nodes is not None and info.nodes >= self._stop_nodes)
+                        or (self._stop_time is not None and time.perf_counter() >= self._stop_time))
+        # Também cobre um pedido de parada feito antes de a busca começar, que ela zera.
+        if finished:
+            self.controller.stop()
+
+    def _ponder_hit(self, board: Board, limits: SearchLimits,
+                    on_iteration: Optional[Callable[[SearchInfo], None]] = None) -> SearchResult:
+        """
+        Termina a ponderação que acertou a posição, já ou quando cumprir
+        ``limits``. ``on_iteration`` recebe a última iteração já concluída e
+        as que vierem depois.
+        """
+        soft, hard = allocate_time(limits, board.current_turn)
+        depth = limits.depth
+        if depth is None and soft is None and hard is None and limits.nodes is None:
+            depth = DEFAULT_DEPTH
+        now = time.perf_counter()
+        pondered = now - self._ponder_start
+        with self._lock:
+            info = self._ponder_info
+            if on_iteration is not None and info is not None:
+                on_iteration(info)
+            done = (
+                (depth is not None and info is not None and info.depth >= depth)
+                or (limits.nodes is not None and info is not None and info.nodes >= limits.nodes)
+                or (soft is not None and pondered >= soft)
+                or (soft is None and hard is not None and pondered >= hard)
+            )
+            if done:
+                self._cancelled = True
+            else:
+                # O tempo ponderado conta como já gasto nesta busca.
+                self._stop_depth, self._stop_nodes = depth, limits.nodes
+                if soft is not None:
+                    self._stop_time = now + soft - pondered
+                self._on_iteration = on_iteration
+        if done:
+            self.controller.stop()
+        elif hard is not None:
+            self._timer = threading.Timer(hard - pondered, self.controller.stop)
+            self._timer.daemon = True
+            self._timer.start()
+        self._join()
+        return self._ponder_result
+
+    def stop_pondering(self) -> Optional[SearchResult]:
+        """Interrompe a ponderação em andamento e devolve o que ela encontrou."""
+        if self._thread is None:
+            return None
+        with self._lock:
+            self._cancelled = True
+        self.controller.stop()
+        self._join()
+        return self._ponder_result
+
+    def _join(self):
+        with self._join_lock:
+            if self._thread is None:
+                return
+            self._thread.join()
+            self._thread = None
+            self._ponder_key = None
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+    def close(self):
+        """Interrompe a ponderação; depois disso, ``think`` não pondera mais."""
+        self._closed = True
+        self.stop_pondering()
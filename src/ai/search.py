@@ -0,0 +1,467 @@
+"""
+Busca alpha-beta para a IA de xadrez.
+
+Negamax com poda alpha-beta e janela nula (PVS), aprofundamento iterativo
+com janelas de aspiração, busca de quiescência nas capturas e cortes pela
+tabela de transposição. Os lances são ordenados pelo lance da tabela, por
+MVV-LVA nas capturas, pelos lances killer e pela heurística de histórico.
+As folhas são avaliadas por ``evaluate_position``.
+
+Os scores são em centipeões do ponto de vista do lado a jogar; mates valem
+``MATE_SCORE`` menos a distância em meios-lances.
+
+No modo multi-PV (``multipv=k``) cada iteração busca a raiz k vezes,
+excluindo a cada vez os lances já escolhidos: as k melhores linhas saem de
+um único aprofundamento iterativo e compartilham a tabela de transposição,
+em vez de k buscas independentes.
+"""
+
+import time
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional, Tuple
+
+import chess
+
+from ..core.board import Board, Color
+from ..traditional.movements import generate_legal_moves
+from .cache.transposition_table import (
+    EXACT,
+    LOWERBOUND,
+    UPPERBOUND,
+    TranspositionTable,
+    decode_move,
+    encode_move,
+)
+from .evaluation import evaluate_position
+
+INFINITY = 1_000_000
+MATE_SCORE = 100_000
+# Scores acima disto são mates; a tabela guarda-os relativos ao nó.
+MATE_BOUND = MATE_SCORE - 1000
+DRAW_SCORE = 0
+
+MAX_PLY = 128
+DEFAULT_DEPTH = 4
+ASPIRATION_WINDOW = 50
+# Limites de tempo e de nós são verificados a cada CHECK_INTERVAL nós.
+CHECK_INTERVAL = 1024
+# Com prazo flexível: para depois de tantas iterações com o mesmo melhor lance,
+# se já usou esta fração do prazo flexível.
+STABLE_ITERATIONS = 3
+STABLE_FRACTION = 0.3
+# A próxima iteração costuma custar algumas vezes a anterior; não começa uma
+# que não deve terminar antes do prazo rígido.
+NEXT_ITERATION_FACTOR = 2.0
+
+# Valores para MVV-LVA, indexados pelo tipo de peça do python-chess.
+ORDER_VALUES = (0, 1, 3, 3, 5, 9, 20)
+TT_MOVE_ORDER = 1 << 30
+CAPTURE_ORDER = 1 << 24
+KILLER_ORDER = 1 << 22
+
+
+@dataclass
+class PVLine:
+    """Uma linha do multi-PV: score do lado a jogar e variante a partir da raiz."""
+    score: int
+    pv: List[chess.Move]
+
+    @property
+    def move(self) -> chess.Move:
+        return self.pv[0]
+
+
+@dataclass
+class SearchResult:
+    """Resultado de uma busca; ``lines`` traz as linhas do multi-PV, da melhor para a pior."""
+    best_move: Optional[chess.Move]
+    score: int
+    depth: int
+    nodes: int
+    elapsed: float
+    pv: List[chess.Move] = field(default_factory=list)
+    lines: List[PVLine] = field(default_factory=list)
+
+    @property
+    def nps(self) -> float:
+        return self.nodes / self.elapsed if self.elapsed > 0 else 0.0
+
+
+@dataclass
+class SearchInfo:
+    """Progresso publicado ao fim de cada iteração do aprofundamento."""
+    depth: int
+    score: int
+    nodes: int
+    elapsed: float
+    best_move: chess.Move
+    pv: List[chess.Move]
+    lines: List[PVLine] = field(default_factory=list)
+
+    @property
+    def nps(self) -> float:
+        return self.nodes / self.elapsed if self.elapsed > 0 else 0.0
+
+
+class SearchAborted(Exception):
+    """Interrompe a busca quando o orçamento de tempo ou de nós acaba."""
+
+
+def _score_to_tt(score: int, ply: int) -> int:
+    if score >= MATE_BOUND:
+        return score + ply
+    if score <= -MATE_BOUND:
+        return score - ply
+    return score
+
+
+def _score_from_tt(score: int, ply: int) -> int:
+    if score >= MATE_BOUND:
+        return score - ply
+    if score <= -MATE_BOUND:
+        return score + ply
+    return score
+
+
+class AlphaBetaSearch:
+    """Motor de busca alpha-beta com aprofundamento iterativo."""
+
+    def __init__(self, table: Optional[TranspositionTable] = None,
+                 evaluate: Callable[[Board], int] = evaluate_position,
+                 hash_mb: float = 16.0, stop_event=None):
+        """
+        ``stop_event`` (``threading.Event`` ou ``multiprocessing.Event``) permite
+        interromper a busca de fora do processo, como faz ``stop``.
+        """
+        self.table = table if table is not None else TranspositionTable(size_mb=hash_mb)
+        self.evaluate = evaluate
+        self.stop_event = stop_event
+        # Com que frequência (em nós) os limites de tempo e de nós são verificados.
+        self.check_interval = CHECK_INTERVAL
+        self.nodes = 0
+        self._stop = False
+        self._deadline: Optional[float] = None
+        self._node_limit: Optional[int] = None
+        self._killers: List[List[Optional[chess.Move]]] = []
+        self._history: List[List[int]] = []
+
+    def stop(self):
+        """Pede o fim da busca em andamento (pode ser chamado de outra thread)."""
+        self._stop = True
+
+    def clear(self):
+        """Esquece a tabela de transposição e as heurísticas de ordenação."""
+        self.table.clear()
+        self._history = [[0] * 64 for _ in range(64)]
+
+    def search(self, board: Board, depth: Optional[int] = None,
+               movetime: Optional[float] = None, nodes: Optional[int] = None,
+               start_depth: int = 1, soft_time: Optional[float] = None,
+               on_iteration: Optional[Callable[[SearchInfo], None]] = None,
+               multipv: int = 1) -> SearchResult:
+        """
+        Procura o melhor lance para o lado a jogar.
+
+        ``depth`` limita a profundidade, ``movetime`` o tempo em segundos e
+        ``nodes`` o número de nós; sem nenhum limite, busca até
+        ``DEFAULT_DEPTH``. Ao estourar o tempo ou os nós, devolve a última
+        iteração completa. O tabuleiro volta ao estado original.
+
+        ``start_depth`` pula as primeiras iterações; as buscas auxiliares do
+        Lazy SMP o usam para não repetir as mesmas profundidades.
+
+        ``soft_time`` (segundos) é o prazo flexível: não começa iterações
+        depois dele, para antes se o melhor lance se mantém estável e não
+        começa uma iteração que provavelmente estouraria ``movetime``, que
+        continua sendo o prazo rígido. ``on_iteration`` recebe um
+        ``SearchInfo`` a cada iteração completa.
+
+        ``multipv`` é o número de linhas devolvidas em ``lines``.
+        """
+        if depth is None:
+            depth = DEFAULT_DEPTH if movetime is None and nodes is None else MAX_PLY - 1
+        start = time.perf_counter()
+        self._deadline = start + movetime if movetime is not None else None
+        self._node_limit = nodes
+        self._stop = False
+        self.nodes = 0
+        self._killers = [[None, None] for _ in range(MAX_PLY + 1)]
+        if not self._history:
+            self._history = [[0] * 64 for _ in range(64)]
+        else:
+            # Histórico de lances anteriores continua útil, mas pesa menos.
+            for row in self._history:
+                for index, value in enumerate(row):
+                    row[index] = value >> 3
+        self.table.new_search()
+
+        root_moves = generate_legal_moves(board)
+        result = SearchResult(root_moves[0] if root_moves else None, 0, 0, 0, 0.0)
+        if not root_moves:
+            result.score = -MATE_SCORE if board.is_in_check() else DRAW_SCORE
+            return result
+
+        history_length = len(board.move_history)
+        score = 0
+        multipv = max(1, min(multipv, len(root_moves)))
+        line_scores: List[int] = []
+        soft_deadline = start + soft_time if soft_time is not None else None
+        stable = 0
+        for current in range(min(start_depth, depth), depth + 1):
+            iteration_start = time.perf_counter()
+            try:
+                if multipv == 1:
+                    score, best_move = self._aspiration(board, current, score, root_moves)
+                    found = [(score, best_move)]
+                else:
+                    found = self._search_lines(board, current, line_scores, root_moves, multipv)
+                    score, best_move = found[0]
+            except SearchAborted:
+                while len(board.move_history) > history_length:
+                    board.pop()
+                break
+            stable = stable + 1 if best_move == result.best_move and result.depth else 0
+            result.best_move, result.score, result.depth = best_move, score, current
+            result.pv = self._principal_variation(board, best_move, current)
+            result.lines = [PVLine(line_score, result.pv if move == best_move
+                                   else self._principal_variation(board, move, current))
+                            for line_score, move in found]
+            line_scores = [line_score for line_score, _ in found]
+            now = time.perf_counter()
+            if on_iteration is not None:
+                on_iteration(SearchInfo(current, score, self.nodes, now - start, best_move,
+                                        list(result.pv), list(result.lines)))
+            # Os melhores lances da iteração anterior são os primeiros da próxima.
+            for _, move in reversed(found):
+                root_moves.remove(move)
+                root_moves.insert(0, move)
+            if all(abs(line_score) >= MATE_BOUND and MATE_SCORE - abs(line_score) <= current
+                   for line_score in line_scores):
+                break
+            if self._deadline is not None and now >= self._deadline:
+                break
+            if soft_deadline is not None:
+                if now >= soft_deadline:
+                    break
+                if stable >= STABLE_ITERATIONS and now - start >= soft_time * STABLE_FRACTION:
+                    break
+                if (self._deadline is not None
+                        and now + (now - iteration_start) * NEXT_ITERATION_FACTOR > self._deadline):
+                    break
+        result.nodes = self.nodes
+        result.elapsed = time.perf_counter() - start
+        return result
+
+    def _search_lines(self, board: Board, depth: int, previous: List[int],
+                      root_moves: List[chess.Move], count: int) -> List[Tuple[int, chess.Move]]:
+        """
+        As ``count`` melhores linhas da raiz: cada busca exclui os lances já
+        escolhidos. Só a primeira grava a raiz na tabela; as outras dariam o
+        score do melhor lance restante como se fosse o da posição.
+        """
+        remaining = list(root_moves)
+        found: List[Tuple[int, chess.Move]] = []
+        for index in range(count):
+            if index < len(previous):
+                guess = previous[index]
+            else:
+                guess = found[-1][0] if found else 0
+            found.append(self._aspiration(board, depth, guess, remaining, store=index == 0))
+            remaining.remove(found[-1][1])
+        # Instabilidades da busca podem inverter linhas vizinhas.
+        found.sort(key=lambda line: line[0], reverse=True)
+        return found
+
+    def _aspiration(self, board: Board, depth: int, previous: int,
+                    root_moves: List[chess.Move], store: bool = True) -> Tuple[int, chess.Move]:
+        """Busca a raiz numa janela estreita ao redor do score anterior, abrindo-a se falhar."""
+        if depth < 3 or abs(previous) >= MATE_BOUND:
+            return self._search_root(board, depth, -INFINITY, INFINITY, root_moves, store)
+        window = ASPIRATION_WINDOW
+        alpha, beta = previous - window, previous + window
+        while True:
+            score, move = self._search_root(board, depth, alpha, beta, root_moves, store)
+            if score <= alpha:
+                alpha = max(score - window, -INFINITY)
+            elif score >= beta:
+                beta = min(score + window, INFINITY)
+            else:
+                return score, move
+            window *= 2
+
+    def _search_root(self, board: Board, depth: int, alpha: int, beta: int,
+                     root_moves: List[chess.Move], store: bool = True) -> Tuple[int, chess.Move]:
+        alpha_start = alpha
+        best_score, best_move = -INFINITY, root_moves[0]
+        for index, move in enumerate(root_moves):
+            board.push(move)
+            if index == 0:
+                score = -self._negamax(board, depth - 1, -beta, -alpha, 1)
+            else:
+                score = -self._negamax(board, depth - 1, -alpha - 1, -alpha, 1)
+                if alpha < score < beta:
+                    score = -self._negamax(board, depth - 1, -beta, -alpha, 1)
+            board.pop()
+            if score > best_score:
+                best_score, best_move = score, move
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        break
+        if best_score <= alpha_start:
+            bound = UPPERBOUND
+        elif best_score >= beta:
+            bound = LOWERBOUND
+        else:
+            bound = EXACT
+        if store:
+            self.table.store(board.zobrist_key, depth, best_score, bound, best_move)
+        return best_score, best_move
+
+    def _check_limits(self):
+        if self._stop or (self.stop_event is not None and self.stop_event.is_set()):
+            raise SearchAborted
+        if self._node_limit is not None and self.nodes >= self._node_limit:
+            raise SearchAborted
+        if self._deadline is not None and time.perf_counter() >= self._deadline:
+            raise SearchAborted
+
+    def _static_score(self, board: Board) -> int:
+        score = self.evaluate(board)
+        return score if board.current_turn == Color.WHITE else -score
+
+    def _negamax(self, board: Board, depth: int, alpha: int, beta: int, ply: int) -> int:
+        if board.halfmove_clock >= 100 or board.is_repetition(2):
+            return DRAW_SCORE
+        in_check = board.is_in_check()
+        if in_check:
+            depth += 1
+        if depth <= 0 or ply >= MAX_PLY:
+            return self._quiescence(board, alpha, beta, ply)
+        self.nodes += 1
+        if self.nodes % self.check_interval == 0:
+            self._check_limits()
+
+        key = board.zobrist_key
+        tt_move = 0
+        entry = self.table.probe(key)
+        if entry is not None:
+            tt_depth, tt_score, bound, tt_move = entry
+            if tt_depth >= depth:
+                score = _score_from_tt(int(tt_score), ply)
+                if (bound == EXACT
+                        or (bound == LOWERBOUND and score >= beta)
+                        or (bound == UPPERBOUND and score <= alpha)):
+                    return score
+
+        moves = generate_legal_moves(board)
+        if not moves:
+            return -MATE_SCORE + ply if in_check else DRAW_SCORE
+
+        alpha_start = alpha
+        best_score, best_move = -INFINITY, None
+        for index, (move, capture) in enumerate(self._ordered(board, moves, tt_move, ply)):
+            board.push(move)
+            if index == 0:
+                score = -self._negamax(board, depth - 1, -beta, -alpha, ply + 1)
+            else:
+                score = -self._negamax(board, depth - 1, -alpha - 1, -alpha, ply + 1)
+                if alpha < score < beta:
+                    score = -self._negamax(board, depth - 1, -beta, -alpha, ply + 1)
+            board.pop()
+            if score > best_score:
+                best_score, best_move = score, move
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        if not capture:
+                            self._record_cutoff(move, depth, ply)
+                        break
+
+        if best_score <= alpha_start:
+            bound = UPPERBOUND
+        elif best_score >= beta:
+            bound = LOWERBOUND
+        else:
+            bound = EXACT
+        self.table.store(key, depth, _score_to_tt(best_score, ply), bound, best_move)
+        return best_score
+
+    def _quiescence(self, board: Board, alpha: int, beta: int, ply: int) -> int:
+        """Resolve as capturas pendentes antes de avaliar a posição."""
+        self.nodes += 1
+        if self.nodes % self.check_interval == 0:
+            self._check_limits()
+        stand_pat = self._static_score(board)
+        if stand_pat >= beta or ply >= MAX_PLY:
+            return stand_pat
+        if stand_pat > alpha:
+            alpha = stand_pat
+
+        captures = [move for move, capture in self._ordered(board, generate_legal_moves(board), 0, ply)
+                    if capture or move.promotion]
+        for move in captures:
+            board.push(move)
+            score = -self._quiescence(board, -beta, -alpha, ply + 1)
+            board.pop()
+            if score >= beta:
+                return score
+            if score > alpha:
+                alpha = score
+        return alpha
+
+    def _ordered(self, board: Board, moves: List[chess.Move], tt_move: int,
+                 ply: int) -> List[Tuple[chess.Move, bool]]:
+        """Lances ordenados, cada um com a indicação de captura."""
+        killers = self._killers[ply]
+        history = self._history
+        ep_square = board.ep_square
+        piece_type_at = board.piece_type_at
+        scored = []
+        for move in moves:
+            from_square, to_square = move.from_square, move.to_square
+            victim = piece_type_at(to_square)
+            if victim is None and to_square == ep_square and piece_type_at(from_square) == chess.PAWN:
+                victim = chess.PAWN
+            if tt_move and encode_move(move) == tt_move:
+                order = TT_MOVE_ORDER
+            elif victim:
+                order = CAPTURE_ORDER + ORDER_VALUES[victim] * 32 - ORDER_VALUES[piece_type_at(from_square)]
+            elif move.promotion:
+                order = CAPTURE_ORDER + ORDER_VALUES[move.promotion]
+            elif move == killers[0]:
+                order = KILLER_ORDER + 1
+            elif move == killers[1]:
+                order = KILLER_ORDER
+            else:
+                order = history[from_square][to_square]
+            scored.append((order, move, victim is not None))
+        scored.sort(key=lambda item: item[0], reverse=True)
+        return [(move, capture) for _, move, capture in scored]
+
+    def _record_cutoff(self, move: chess.Move, depth: int, ply: int):
+        killers = self._killers[ply]
+        if killers[0] != move:
+            killers[1] = killers[0]
+            killers[0] = move
+        row = self._history[move.from_square]
+        row[move.to_square] = min(row[move.to_square] + depth * depth, KILLER_ORDER - 1)
+
+    def _principal_variation(self, board: Board, best_move: chess.Move, depth: int) -> List[chess.Move]:
+        """Reconstrói a variante principal seguindo os melhores lances da tabela."""
+        pv = [best_move]
+        board.push(best_move)
+        seen = {board.zobrist_key}
+        while len(pv) < depth:
+            entry = self.table.probe(board.zobrist_key)
+            move = decode_move(entry[3]) if entry else None
+            if move is None or move not in generate_legal_moves(board):
+                break
+            board.push(move)
+            pv.append(move)
+            if board.zobrist_key in seen:
+                break
+            seen.add(board.zobrist_key)
+        for _ in pv:
+            board.pop()
+        return pv
@@ -0,0 +1,120 @@
+"""
+Controle de tempo da busca.
+
+``SearchLimits`` reúne os modos de limite do protocolo UCI: tempo fixo por
+lance (``movetime``), relógio (``wtime``/``btime`` com incremento e lances
+até o controle), limite de nós e profundidade. ``allocate_time`` converte o
+relógio em dois prazos:
+
+- flexível (``soft``): a fatia "justa" do tempo restante; a busca não começa
+  iterações depois dele e para antes se o melhor lance estiver estável;
+- rígido (``hard``): nunca é ultrapassado; a busca verifica o relógio a cada
+  ``check_interval`` nós e devolve a última iteração completa.
+
+``SearchController`` aplica os limites a um motor (``AlphaBetaSearch`` ou
+``LazySMPSearch``) e repassa o progresso de cada iteração a um callback.
+Os tempos são em segundos.
+"""
+
+from dataclasses import dataclass
+from typing import Callable, Optional, Tuple, Union
+
+from ..core.board import Board, Color
+from .parallel_search import LazySMPSearch
+from .search import MAX_PLY, AlphaBetaSearch, SearchInfo, SearchResult
+
+# Reserva para latência de comunicação e da GUI, descontada de todo prazo.
+MOVE_OVERHEAD = 0.03
+# Sem ``movestogo``, supõe que ainda faltam tantos lances na partida.
+DEFAULT_MOVES_TO_GO = 30
+# Fração do incremento somada ao prazo flexível.
+INCREMENT_SHARE = 0.75
+# O prazo rígido é até tantas vezes o flexível, sem passar desta fração do relógio.
+HARD_FACTOR = 4.0
+MAX_CLOCK_FRACTION = 0.25
+MIN_TIME = 0.005
+# Nós entre verificações do relógio e do limite de nós: ~1-5 ms nesta busca.
+TIMED_CHECK_INTERVAL = 64
+
+
+@dataclass
+class SearchLimits:
+    """Limites de uma busca; os que ficam em None não restringem."""
+    depth: Optional[int] = None
+    movetime: Optional[float] = None
+    wtime: Optional[float] = None
+    btime: Optional[float] = None
+    winc: float = 0.0
+    binc: float = 0.0
+    movestogo: Optional[int] = None
+    nodes: Optional[int] = None
+    infinite: bool = False
+
+    def has_clock(self) -> bool:
+        return self.wtime is not None or self.btime is not None
+
+
+def allocate_time(limits: SearchLimits, color: Color) -> Tuple[Optional[float], Optional[float]]:
+    """Prazos (flexível, rígido) em segundos para ``color``; None quando não há limite de tempo."""
+    if limits.infinite:
+        return None, None
+    if limits.movetime is not None:
+        hard = max(MIN_TIME, limits.movetime - MOVE_OVERHEAD)
+        return None, hard
+    if not limits.has_clock():
+        return None, None
+    white = color == Color.WHITE
+    remaining = limits.wtime if white else limits.btime
+    increment = limits.winc if white else limits.binc
+    if remaining is None:
+        return None, None
+    available = max(MIN_TIME, remaining - MOVE_OVERHEAD)
+    moves_to_go = max(1, limits.movestogo or DEFAULT_MOVES_TO_GO)
+    soft = min(available, available / moves_to_go + increment * INCREMENT_SHARE)
+    # Com o controle chegando (último lance), pode usar quase tudo.
+    ceiling = available if moves_to_go == 1 else max(soft, available * MAX_CLOCK_FRACTION)
+    hard = min(ceiling, soft * HARD_FACTOR)
+    return max(MIN_TIME, soft), max(MIN_TIME, hard)
+
+
+class SearchController:
+    """Busca com controle de tempo sobre um motor de busca."""
+
+    def __init__(self, engine: Optional[Union[AlphaBetaSearch, LazySMPSearch]] = None,
+                 check_interval: int = TIMED_CHECK_INTERVAL):
+        self.engine = engine if engine is not None else AlphaBetaSearch()
+        self.check_interval = check_interval
+        self.last_soft: Optional[float] = None
+        self.last_hard: Optional[float] = None
+
+    def _root_engine(self) -> AlphaBetaSearch:
+        return self.engine.engine if isinstance(self.engine, LazySMPSearch) else self.engine
+
+    def search(self, board: Board, limits: Optional[SearchLimits] = None,
+               on_iteration: Optional[Callable[[SearchInfo], None]] = None,
+               multipv: int = 1) -> SearchResult:
+        """
+        Busca a posição para o lado a jogar dentro de ``limits`` e chama
+        ``on_iteration`` com profundidade, nós, NPS e variante principal a
+        cada iteração completa. ``multipv`` é o número de linhas analisadas.
+        """
+        limits = limits or SearchLimits()
+        soft, hard = allocate_time(limits, board.current_turn)
+        self.last_soft, self.last_hard = soft, hard
+        depth = limits.depth
+        if limits.infinite and depth is None and limits.nodes is None:
+            depth = MAX_PLY - 1
+        root = self._root_engine()
+        previous_interval = root.check_interval
+        if hard is not None or limits.nodes is not None:
+            root.check_interval = min(previous_interval, self.check_interval)
+        try:
+            return self.engine.search(board, depth=depth, movetime=hard, nodes=limits.nodes,
+                                      soft_time=soft, on_iteration=on_iteration,
+                                      multipv=multipv)
+        finally:
+            root.check_interval = previous_interval
+
+    def stop(self):
+        """Interrompe a busca em andamento (de outra thread)."""
+        self.engine.stop()
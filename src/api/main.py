@@ -2,14 +2,20 @@ from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
 from typing import Optional, List
+from collections import OrderedDict
 import sys
 import os
+import threading
 
 # Adicionar diretório raiz ao path para importar módulos src
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
 from src.cultural.storyteller import StoryGenerator
 from src.cultural.narrative import CulturalContext, NarrativeStyle
+from src.ai.ponder import PonderingSearch
+from src.ai.search import AlphaBetaSearch
+from src.ai.time_manager import SearchLimits
+from src.engine.uci import MAX_MULTIPV, format_score, parse_position
 
 # Metadata para documentação OpenAPI
 tags_metadata = [
@@ -21,6 +27,10 @@ tags_metadata = [
         "name": "narrative",
         "description": "Sistema de geração de narrativas culturais para partidas de xadrez",
     },
+    {
+        "name": "engine",
+        "description": "Lances da IA, com ponderação entre os lances de cada partida",
+    },
 ]
 
 app = FastAPI(
@@ -118,6 +128,20 @@ class MoveEvent(BaseModel):
             }
         }
 
+class EngineMoveRequest(BaseModel):
+    """Posição e limites para a IA escolher um lance"""
+    game_id: str = Field(default="default", description="Partida; a ponderação e a tabela de transposição são por partida", example="default")
+    fen: str = Field(default="startpos", description="Posição inicial da partida em FEN, ou startpos", example="startpos")
+    moves: List[str] = Field(default_factory=list, description="Lances jogados desde a posição inicial, em UCI", example=["e2e4"])
+    movetime_ms: Optional[int] = Field(default=None, description="Tempo fixo para o lance, em ms", example=1000)
+    wtime_ms: Optional[int] = Field(default=None, description="Relógio das brancas, em ms")
+    btime_ms: Optional[int] = Field(default=None, description="Relógio das pretas, em ms")
+    winc_ms: int = Field(default=0, description="Incremento das brancas, em ms")
+    binc_ms: int = Field(default=0, description="Incremento das pretas, em ms")
+    depth: Optional[int] = Field(default=None, description="Profundidade máxima", example=4)
+    ponder: bool = Field(default=True, description="Ponderar a resposta esperada enquanto o jogador pensa")
+    multipv: int = Field(default=1, ge=1, le=MAX_MULTIPV, description="Linhas candidatas analisadas na mesma busca (painel de análise)", example=3)
+
 # Instância global do gerador (simplificado para demo)
 # Em produção, isso seria gerenciado por sessão
 generator = None
@@ -286,6 +310,139 @@ async def generate_move_narrative(event: MoveEvent):
         "piece": piece_name
     }
 
+# Motores da IA por partida. Cada um guarda a tabela de transposição e a
+# ponderação entre um lance e o seguinte; as partidas mais antigas são
+# encerradas além do limite.
+MAX_ENGINE_SESSIONS = 8
+ENGINE_HASH_MB = 16
+# A ponderação roda em threads deste processo e disputa o GIL com as
+# requisições: só as partidas mais recentes ponderam, e por pouco tempo.
+MAX_PONDERING_SESSIONS = 2
+ENGINE_PONDER_TIME = 15.0
+engine_sessions: "OrderedDict[str, PonderingSearch]" = OrderedDict()
+engine_locks = {}
+engine_sessions_lock = threading.Lock()
+
+def get_engine_session(game_id: str):
+    """Motor e trava da partida, criando-os se preciso."""
+    evicted = []
+    with engine_sessions_lock:
+        if game_id in engine_sessions:
+            engine_sessions.move_to_end(game_id)
+        else:
+            while len(engine_sessions) >= MAX_ENGINE_SESSIONS:
+                old_id, old_engine = engine_sessions.popitem(last=False)
+                evicted.append((old_engine, engine_locks.pop(old_id)))
+            engine_sessions[game_id] = PonderingSearch(AlphaBetaSearch(hash_mb=ENGINE_HASH_MB),
+                                                       max_ponder_time=ENGINE_PONDER_TIME)
+            engine_locks[game_id] = threading.Lock()
+        session = engine_sessions[game_id], engine_locks[game_id]
+    # Fora da trava global, para não segurar as outras partidas, e com a trava
+    # da partida despejada, para não fechar um motor no meio de um lance.
+    for old_engine, old_lock in evicted:
+        with old_lock:
+            old_engine.close()
+    return session
+
+def limit_pondering():
+    """Interrompe a ponderação das partidas além das ``MAX_PONDERING_SESSIONS`` mais recentes."""
+    with engine_sessions_lock:
+        sessions = [(engine_sessions[game_id], engine_locks[game_id])
+                    for game_id in reversed(engine_sessions)]
+    pondering = 0
+    for engine, lock in sessions:
+        if not engine.pondering:
+            continue
+        pondering += 1
+        # Uma partida com a trava ocupada está calculando um lance: não é interrompida.
+        if pondering > MAX_PONDERING_SESSIONS and lock.acquire(blocking=False):
+            try:
+                engine.stop_pondering()
+            finally:
+                lock.release()
+
+def _ms(value: Optional[int]) -> Optional[float]:
+    return None if value is None else max(0, value) / 1000.0
+
+@app.post(
+    "/api/engine/move",
+    tags=["engine"],
+    summary="Lance da IA",
+    description="""
+    Escolhe o lance da IA para a posição e, com `ponder`, continua buscando a
+    resposta esperada do jogador em segundo plano.
+    
+    Se o jogador fizer o lance esperado, a próxima chamada aproveita essa
+    busca e responde na hora (`ponder_hit`); se não, a busca recomeça, ainda
+    com a tabela de transposição da partida.
+    
+    Com `multipv`, `lines` traz as melhores linhas candidatas, todas da mesma
+    busca.
+    """,
+    response_description="Lance escolhido, avaliação e variante principal"
+)
+def engine_move(request: EngineMoveRequest):
+    """
+    Calcula o lance da IA.
+    
+    Roda fora do event loop (endpoint síncrono): a busca ocupa a CPU.
+    
+    Raises:
+        HTTPException 400: Se a posição ou algum lance for inválido
+    """
+    setup = ["startpos"] if request.fen == "startpos" else ["fen"] + request.fen.split()
+    try:
+        board = parse_position(setup + ["moves"] + request.moves)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Posição inválida: {e}")
+    limits = SearchLimits(
+        depth=request.depth,
+        movetime=_ms(request.movetime_ms),
+        wtime=_ms(request.wtime_ms),
+        btime=_ms(request.btime_ms),
+        winc=_ms(request.winc_ms),
+        binc=_ms(request.binc_ms),
+    )
+    engine, lock = get_engine_session(request.game_id)
+    with lock:
+        result = engine.think(board, limits, ponder=request.ponder, multipv=request.multipv)
+        ponder_hit = engine.last_ponder_hit
+    if request.ponder:
+        limit_pondering()
+    if result.best_move is None:
+        raise HTTPException(status_code=400, detail="Sem lances legais nesta posição")
+    return {
+        "move": result.best_move.uci(),
+        "ponder": result.pv[1].uci() if len(result.pv) > 1 else None,
+        "score": format_score(result.score),
+        "depth": result.depth,
+        "nodes": result.nodes,
+        "time_ms": int(result.elapsed * 1000),
+        "pv": [move.uci() for move in result.pv],
+        "lines": [
+            {"score": format_score(line.score), "pv": [move.uci() for move in line.pv]}
+            for line in result.lines
+        ],
+        "ponder_hit": ponder_hit,
+    }
+
+@app.delete(
+    "/api/engine/{game_id}",
+    tags=["engine"],
+    summary="Encerrar motor da partida",
+    description="Interrompe a ponderação e libera a tabela de transposição da partida",
+)
+def close_engine(game_id: str):
+    """Encerra o motor da partida, se existir."""
+    with engine_sessions_lock:
+        engine = engine_sessions.pop(game_id, None)
+        lock = engine_locks.pop(game_id, None)
+    if engine is None:
+        raise HTTPException(status_code=404, detail="Partida sem motor")
+    with lock:
+        engine.close()
+    return {"game_id": game_id, "closed": True}
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
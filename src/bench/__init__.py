@@ -0,0 +1,3 @@
+"""
+Benchmarks de throughput e corretude do motor de xadrez.
+"""
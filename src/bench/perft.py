@@ -0,0 +1,205 @@
+"""
+Perft: contagem de nós da árvore de lances para medir corretude e velocidade.
+
+Compara os geradores do projeto com o python-chess, que serve de referência:
+
+- ``board``: ``Board.legal_moves()`` (python-chess por dentro) com ``push``/``pop``;
+- ``traditional``: gerador por bitboards de ``src.traditional.movements``;
+- ``python-chess``: ``chess.Board`` puro.
+
+Uso::
+
+    python -m src.bench.perft --fen "<fen>" --depth 4 --divide
+    python -m src.bench.perft --suite --depth 3 --json perft.json
+
+O JSON gravado com ``--json`` pode ser comparado entre versões.
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence
+
+import chess
+
+from ..core.board import Board
+from ..traditional.movements import generate_legal_moves
+
+# Posições padrão (chessprogramming.org/Perft_Results) e contagens por profundidade.
+SUITE = {
+    "initial": (chess.STARTING_FEN,
+                [20, 400, 8902, 197281, 4865609]),
+    "kiwipete": ("r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+                 [48, 2039, 97862, 4085603]),
+    "position3": ("8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+                  [14, 191, 2812, 43238, 674624]),
+    "position4": ("r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1",
+                  [6, 264, 9467, 422333]),
+    "position5": ("rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8",
+                  [44, 1486, 62379, 2103487]),
+    "position6": ("r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10",
+                  [46, 2079, 89890, 3894594]),
+}
+
+REFERENCE = "python-chess"
+
+
+@dataclass
+class DepthResult:
+    """Nós e tempo de uma profundidade."""
+    depth: int
+    nodes: int
+    seconds: float
+    nps: float
+
+
+@dataclass
+class PerftResult:
+    """Resultado de um gerador em uma posição."""
+    name: str
+    fen: str
+    generator: str
+    depth: int
+    nodes: int
+    expected: Optional[int]
+    matches_reference: Optional[bool]
+    per_depth: List[DepthResult] = field(default_factory=list)
+    divide: Dict[str, int] = field(default_factory=dict)
+
+
+def _perft(position, depth: int, generate: Callable) -> int:
+    moves = generate(position)
+    if depth == 1:
+        return len(moves)
+    nodes = 0
+    for move in moves:
+        position.push(move)
+        nodes += _perft(position, depth - 1, generate)
+        position.pop()
+    return nodes
+
+
+def _board_moves(board: Board) -> Sequence[chess.Move]:
+    return board.legal_moves()
+
+
+def _chess_moves(board: chess.Board) -> List[chess.Move]:
+    return list(board.legal_moves)
+
+
+GENERATORS = {
+    "board": (Board.from_fen, _board_moves),
+    "traditional": (Board.from_fen, generate_legal_moves),
+    REFERENCE: (chess.Board, _chess_moves),
+}
+
+
+def perft(fen: str, depth: int, generator: str = "traditional") -> int:
+    """Conta as folhas da árvore de lances a partir de ``fen`` até ``depth``."""
+    factory, generate = GENERATORS[generator]
+    if depth == 0:
+        return 1
+    return _perft(factory(fen), depth, generate)
+
+
+def divide(fen: str, depth: int, generator: str = "traditional") -> Dict[str, int]:
+    """Contagem de perft por lance da raiz, para localizar divergências."""
+    factory, generate = GENERATORS[generator]
+    position = factory(fen)
+    counts = {}
+    for move in generate(position):
+        position.push(move)
+        counts[move.uci()] = _perft(position, depth - 1, generate) if depth > 1 else 1
+        position.pop()
+    return dict(sorted(counts.items()))
+
+
+def run(name: str, fen: str, depth: int, generators: Sequence[str],
+        expected: Optional[Sequence[int]] = None, with_divide: bool = False) -> List[PerftResult]:
+    """Roda perft de 1 até ``depth`` em cada gerador e compara com a referência."""
+    results = []
+    reference_nodes: Dict[int, int] = {}
+    # A referência roda primeiro para que os outros geradores sejam comparados a ela.
+    ordered = sorted(generators, key=lambda g: g != REFERENCE)
+    for generator in ordered:
+        result = PerftResult(name, fen, generator, depth, 0,
+                             expected[depth - 1] if expected and len(expected) >= depth else None,
+                             None)
+        for current in range(1, depth + 1):
+            start = time.perf_counter()
+            nodes = perft(fen, current, generator)
+            seconds = time.perf_counter() - start
+            result.per_depth.append(DepthResult(current, nodes, seconds,
+                                                nodes / seconds if seconds > 0 else 0.0))
+            if generator == REFERENCE:
+                reference_nodes[current] = nodes
+        result.nodes = result.per_depth[-1].nodes
+        if reference_nodes:
+            result.matches_reference = all(
+                d.nodes == reference_nodes[d.depth] for d in result.per_depth
+            )
+        if with_divide:
+            result.divide = divide(fen, depth, generator)
+        results.append(result)
+    return results
+
+
+def _print_result(result: PerftResult, out) -> None:
+    status = ""
+    if result.expected is not None:
+        status = " ok" if result.nodes == result.expected else f" ESPERADO {result.expected}"
+    if result.matches_reference is False:
+        status += " DIVERGE DA REFERÊNCIA"
+    print(f"[{result.name}] {result.generator}: depth {result.depth} "
+          f"nodes {result.nodes}{status}", file=out)
+    for item in result.per_depth:
+        print(f"  depth {item.depth:2d}  nodes {item.nodes:10d}  "
+              f"{item.seconds:9.3f}s  {item.nps:12.0f} nps", file=out)
+    for move, nodes in result.divide.items():
+        print(f"  {move}: {nodes}", file=out)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m src.bench.perft", description=__doc__.split("\n\n")[0])
+    parser.add_argument("--fen", default=chess.STARTING_FEN, help="posição inicial (FEN)")
+    parser.add_argument("--depth", type=int, default=3, help="profundidade máxima")
+    parser.add_argument("--suite", action="store_true",
+                        help="roda as posições padrão (inicial, Kiwipete, 3 a 6)")
+    parser.add_argument("--generator", choices=sorted(GENERATORS) + ["all"], default="all")
+    parser.add_argument("--divide", action="store_true", help="mostra a contagem por lance da raiz")
+    parser.add_argument("--json", dest="json_path", help="grava os resultados neste arquivo")
+    args = parser.parse_args(argv)
+
+    generators = sorted(GENERATORS) if args.generator == "all" else [args.generator]
+    positions = ([(name, fen, counts) for name, (fen, counts) in SUITE.items()]
+                 if args.suite else [("custom", args.fen, None)])
+
+    results = []
+    for name, fen, counts in positions:
+        for result in run(name, fen, args.depth, generators, counts, args.divide):
+            _print_result(result, sys.stdout)
+            results.append(result)
+
+    if args.json_path:
+        report = {
+            "python": platform.python_version(),
+            "python_chess": chess.__version__,
+            "depth": args.depth,
+            "results": [asdict(result) for result in results],
+        }
+        with open(args.json_path, "w") as f:
+            json.dump(report, f, indent=2)
+
+    failed = any(
+        result.matches_reference is False
+        or (result.expected is not None and result.nodes != result.expected)
+        for result in results
+    )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1 +1,2 @@
-from .board import Board, Color, PieceType, Piece, Position
+from .board import Board, Bitboards, Color, PieceType, Piece, Position, UndoRecord
+from .piece_square import PieceSquareTable
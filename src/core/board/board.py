@@ -2,10 +2,13 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from enum import Enum
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, NamedTuple, Optional, Tuple, Union
 
 import chess
 
+from .piece_square import PieceSquareTable
+from .zobrist import pawn_delta, pawn_hash, piece_delta, state_key, zobrist_hash
+
 
 class Color(Enum):
     WHITE = chess.WHITE
@@ -36,15 +39,94 @@ class Position:
         return f"{self.file}{self.rank}"
 
 
+# Interned pieces so the view rebuild does not go through Enum lookups.
+_PIECES: Dict[Tuple[int, bool], Piece] = {
+    (piece_type.value, color.value): Piece(piece_type, color)
+    for piece_type in PieceType
+    for color in Color
+}
+
+
+def _piece_from_chess(piece: chess.Piece) -> Piece:
+    return _PIECES[(piece.piece_type, piece.color)]
+
+
+class UndoRecord(NamedTuple):
+    """State a ``Board.push`` cannot recompute on ``Board.pop``.
+
+    Castling rights, en passant square and clocks are restored by the inner
+    ``chess.Board`` stack, so only what lives outside it is kept here.
+    """
+
+    captured: Optional[Piece]
+    last_move: Optional[Tuple[str, str]]
+    key: int
+    pawn_key: Optional[int] = None
+
+
+class Bitboards(NamedTuple):
+    """Occupancy masks of a position, one bit per square (a1 = bit 0)."""
+
+    white: chess.Bitboard
+    black: chess.Bitboard
+    pawns: chess.Bitboard
+    knights: chess.Bitboard
+    bishops: chess.Bitboard
+    rooks: chess.Bitboard
+    queens: chess.Bitboard
+    kings: chess.Bitboard
+
+
+class _PieceMap(dict):
+    """``pieces`` view that reports hand edits back to its owning Board."""
+
+    __slots__ = ("_owner",)
+
+    def __init__(self, owner: "Board") -> None:
+        super().__init__()
+        self._owner = owner
+
+
+def _editing(name: str):
+    method = getattr(dict, name)
+
+    def wrapper(self, *args, **kwargs):
+        owner = self._owner
+        owner._refresh_pieces()
+        result = method(self, *args, **kwargs)
+        owner._mark_pieces_edited()
+        return result
+
+    wrapper.__name__ = name
+    return wrapper
+
+
+for _name in ("__setitem__", "__delitem__", "__ior__", "clear", "pop", "popitem", "setdefault", "update"):
+    setattr(_PieceMap, _name, _editing(_name))
+
+
 class Board:
-    """Simple chess board wrapper backed by python-chess."""
+    """Simple chess board wrapper backed by python-chess.
+
+    A single ``chess.Board`` is kept for the lifetime of the object and moves
+    are pushed onto it; ``pieces`` is a view rebuilt lazily from it. Editing
+    ``pieces`` by hand marks the python-chess board stale, and it is rebuilt
+    from the view on the next query.
+    """
 
     def __init__(self) -> None:
-        self.pieces: Dict[str, Piece] = {}
+        self._board = chess.Board()
+        self._pieces = _PieceMap(self)
+        self._pieces_stale = True
+        self._board_stale = False
+        self._status: Dict[str, object] = {}
+        self._undo: List[UndoRecord] = []
+        self._key: Optional[int] = None
+        self._pawn_key: Optional[int] = None
+        self._totals: Dict[PieceSquareTable, List[int]] = {}
         self.move_history: List[Tuple[str, str]] = []
         self.captured_pieces: List[Piece] = []
-        self.current_turn: Color = Color.WHITE
-        self.last_move: Optional[Tuple[str, str]] = None
+        self._last_move: Optional[Tuple[str, str]] = None
         self.piece_symbols = {
             (PieceType.PAWN, Color.WHITE): "♙",
             (PieceType.KNIGHT, Color.WHITE): "♘",
@@ -61,146 +143,370 @@ class Board:
         }
         self.setup_initial_position()
 
+    # ------------------------------------------------------------------
+    # Views
+    @property
+    def pieces(self) -> Dict[str, Piece]:
+        self._refresh_pieces()
+        return self._pieces
+
+    @pieces.setter
+    def pieces(self, pieces: Dict[str, Piece]) -> None:
+        self._pieces.clear()
+        self._pieces.update(pieces)
+
+    @property
+    def current_turn(self) -> Color:
+        return Color.WHITE if self._board.turn == chess.WHITE else Color.BLACK
+
+    @current_turn.setter
+    def current_turn(self, color: Color) -> None:
+        self._board.turn = color.value
+        self._mark_state_edited()
+
+    @property
+    def castling_rights(self) -> chess.Bitboard:
+        """Rook squares that still carry castling rights (``chess.BB_*`` mask)."""
+        return self._chess_board().castling_rights
+
+    @castling_rights.setter
+    def castling_rights(self, rights: chess.Bitboard) -> None:
+        self._chess_board().castling_rights = rights
+        self._mark_state_edited()
+
+    @property
+    def ep_square(self) -> Optional[chess.Square]:
+        """Square skipped by the last double pawn push, if any."""
+        return self._chess_board().ep_square
+
+    @ep_square.setter
+    def ep_square(self, square: Optional[chess.Square]) -> None:
+        self._chess_board().ep_square = square
+        self._mark_state_edited()
+
+    @property
+    def halfmove_clock(self) -> int:
+        return self._board.halfmove_clock
+
+    @halfmove_clock.setter
+    def halfmove_clock(self, value: int) -> None:
+        self._board.halfmove_clock = value
+        self._status.clear()
+
+    @property
+    def fullmove_number(self) -> int:
+        return self._board.fullmove_number
+
+    @fullmove_number.setter
+    def fullmove_number(self, value: int) -> None:
+        self._board.fullmove_number = value
+
+    @property
+    def last_move(self) -> Optional[Tuple[str, str]]:
+        return self._last_move
+
+    @last_move.setter
+    def last_move(self, move: Optional[Tuple[str, str]]) -> None:
+        # Declaring the previous move by hand is the only way to set up an
+        # en passant position without a FEN, so derive the ep square here.
+        self._last_move = move
+        ep_square = None
+        if move:
+            from_sq = chess.parse_square(move[0])
+            to_sq = chess.parse_square(move[1])
+            moved = self.pieces.get(move[1])
+            if (moved and moved.type == PieceType.PAWN
+                    and chess.square_file(from_sq) == chess.square_file(to_sq)
+                    and abs(chess.square_rank(from_sq) - chess.square_rank(to_sq)) == 2):
+                ep_square = (from_sq + to_sq) // 2
+        self.ep_square = ep_square
+
     # ------------------------------------------------------------------
     # Helpers
-    def _to_chess_board(self) -> chess.Board:
+    def _chess_board(self) -> chess.Board:
+        if self._board_stale:
+            self._rebuild_chess_board()
+        return self._board
+
+    def _rebuild_chess_board(self) -> None:
+        # Hand edits only touch piece placement: the rest of the state is
+        # carried over and dropped where the new placement contradicts it.
+        old = self._board
         board = chess.Board(None)
-        for pos, piece in self.pieces.items():
+        for pos, piece in dict.items(self._pieces):
             square = chess.parse_square(pos)
             board.set_piece_at(square, chess.Piece(piece.type.value, piece.color.value))
-        board.turn = self.current_turn == Color.WHITE
-        board.castling_rights = chess.BB_ALL
-        if self.last_move:
-            from_sq, to_sq = self.last_move
-            moved = self.pieces.get(to_sq)
-            if moved and moved.type == PieceType.PAWN:
-                r_from = chess.square_rank(chess.parse_square(from_sq))
-                r_to = chess.square_rank(chess.parse_square(to_sq))
-                if abs(r_from - r_to) == 2:
-                    ep_rank = (r_from + r_to) // 2
-                    file = chess.square_file(chess.parse_square(to_sq))
-                    board.ep_square = chess.square(file, ep_rank)
-        return board
+        board.turn = old.turn
+        board.castling_rights = old.castling_rights
+        board.castling_rights = board.clean_castling_rights()
+        board.halfmove_clock = old.halfmove_clock
+        board.fullmove_number = old.fullmove_number
+        ep_square = old.ep_square
+        if ep_square is not None:
+            pushed = ep_square - 8 if board.turn == chess.WHITE else ep_square + 8
+            if (chess.square_rank(ep_square) == (5 if board.turn == chess.WHITE else 2)
+                    and not board.piece_at(ep_square)
+                    and board.piece_at(pushed) == chess.Piece(chess.PAWN, not board.turn)):
+                board.ep_square = ep_square
+        self._board = board
+        self._board_stale = False
+        self._undo.clear()
+
+    def _refresh_pieces(self) -> None:
+        if not self._pieces_stale:
+            return
+        view = self._pieces
+        dict.clear(view)
+        for square, piece in self._board.piece_map().items():
+            dict.__setitem__(view, chess.SQUARE_NAMES[square], _piece_from_chess(piece))
+        self._pieces_stale = False
+
+    def _mark_pieces_edited(self) -> None:
+        self._board_stale = True
+        self._totals.clear()
+        self._mark_state_edited()
 
-    def _sync_from_chess_board(self, board: chess.Board) -> None:
-        self.pieces.clear()
-        for square in chess.SQUARES:
-            piece = board.piece_at(square)
-            if piece:
-                pos = chess.square_name(square)
-                self.pieces[pos] = Piece(PieceType(piece.piece_type), Color(piece.color))
-        self.current_turn = Color.WHITE if board.turn == chess.WHITE else Color.BLACK
+    def _mark_state_edited(self) -> None:
+        self._status.clear()
+        self._key = None
+        self._pawn_key = None
+
+    def _mark_moved(self) -> None:
+        self._pieces_stale = True
+        self._status.clear()
+
+    def __getstate__(self) -> Dict[str, object]:
+        self._chess_board()
+        state = self.__dict__.copy()
+        del state["_pieces"]
+        state["_pieces_stale"] = True
+        state["_status"] = {}
+        state["_totals"] = {}
+        return state
+
+    def __setstate__(self, state: Dict[str, object]) -> None:
+        self.__dict__.update(state)
+        self._pieces = _PieceMap(self)
 
     # ------------------------------------------------------------------
     def setup_initial_position(self) -> None:
-        board = chess.Board()
-        self._sync_from_chess_board(board)
+        self._set_chess_board(chess.Board())
+
+    def _set_chess_board(self, board: chess.Board) -> None:
+        self._board = board
+        self._board_stale = False
+        self._mark_state_edited()
+        self._mark_moved()
+        self._undo.clear()
+        self._totals.clear()
         self.move_history.clear()
         self.captured_pieces.clear()
-        self.last_move = None
+        self._last_move = None
+
+    @property
+    def zobrist_key(self) -> int:
+        """64-bit Polyglot-compatible Zobrist key, updated incrementally by push/pop."""
+        if self._key is None:
+            self._key = zobrist_hash(self._chess_board())
+        return self._key
+
+    @property
+    def pawn_key(self) -> int:
+        """Zobrist key of the pawns alone; only pawn moves and pawn captures change it.
+
+        Computed on first use, then kept up to date by push/pop.
+        """
+        if self._pawn_key is None:
+            self._pawn_key = pawn_hash(self._chess_board())
+        return self._pawn_key
+
+    def piece_square_totals(self, table: PieceSquareTable) -> Tuple[int, int]:
+        """(white, black) sums of ``table`` over the pieces on the board.
+
+        The first call computes them; from then on push/pop keep them updated
+        move by move, so later calls are O(1).
+        """
+        totals = self._totals.get(table)
+        if totals is None:
+            totals = self._totals[table] = table.totals(self._chess_board())
+        return totals[chess.WHITE], totals[chess.BLACK]
+
+    def is_repetition(self, count: int = 3) -> bool:
+        """Whether the current position occurred ``count`` times since the last irreversible move."""
+        key = self.zobrist_key
+        undo = self._undo
+        stop = max(len(undo) - self._board.halfmove_clock, 0)
+        seen = 1
+        for index in range(len(undo) - 2, stop - 1, -2):
+            if undo[index].key == key:
+                seen += 1
+                if seen >= count:
+                    return True
+        return False
+
+    def to_fen(self) -> str:
+        """FEN of the exact position, including castling, ep and clocks."""
+        return self._chess_board().fen()
+
+    @classmethod
+    def from_fen(cls, fen: str) -> "Board":
+        """Creates a board from a FEN string. Raises ``ValueError`` if invalid."""
+        board = cls()
+        board._set_chess_board(chess.Board(fen))
+        return board
 
     def display(self) -> str:
-        return self._to_chess_board().unicode()
+        return self._chess_board().unicode()
 
-    def get_piece(self, pos: str) -> Optional[Piece]:
+    def get_piece(self, pos: Union[str, int], col: Optional[int] = None) -> Optional[Piece]:
+        """Piece at ``"e4"`` or at ``(row, col)``, row 0 being rank 8."""
+        if col is not None:
+            if not self.is_valid_position(pos, col):
+                return None
+            piece = self._chess_board().piece_at(chess.square(col, 7 - pos))
+            return _piece_from_chess(piece) if piece else None
         return self.pieces.get(pos)
 
+    def bitboards(self) -> Bitboards:
+        board = self._chess_board()
+        return Bitboards(board.occupied_co[chess.WHITE], board.occupied_co[chess.BLACK],
+                         board.pawns, board.knights, board.bishops, board.rooks,
+                         board.queens, board.kings)
+
+    def piece_type_at(self, square: chess.Square) -> Optional[chess.PieceType]:
+        """python-chess piece type on ``square`` (a1 = 0); a cheap probe for search code."""
+        return self._chess_board().piece_type_at(square)
+
+    @staticmethod
+    def is_valid_position(row: int, col: int) -> bool:
+        return 0 <= row < 8 and 0 <= col < 8
+
     # ------------------------------------------------------------------
     # Core move logic
     def _move_exposes_check(self, from_pos: str, to_pos: str) -> bool:
-        board = self._to_chess_board()
+        board = self._chess_board()
         move = chess.Move.from_uci(from_pos + to_pos)
         return board.is_into_check(move)
 
     def _is_valid_move(self, piece: Piece, from_pos: str, to_pos: str) -> bool:
-        board = self._to_chess_board()
+        board = self._chess_board()
         move = chess.Move.from_uci(from_pos + to_pos)
-        return move in board.legal_moves
+        return board.is_legal(move)
 
     def _has_legal_moves(self) -> bool:
-        board = self._to_chess_board()
-        return any(board.legal_moves)
+        status = self._status.get("has_legal_moves")
+        if status is None:
+            legal = self._status.get("legal_moves")
+            if legal is not None:
+                status = bool(legal)
+            else:
+                status = any(self._chess_board().legal_moves)
+            self._status["has_legal_moves"] = status
+        return status
+
+    def legal_moves(self) -> Tuple[chess.Move, ...]:
+        """Legal moves of the side to move, cached until the position changes."""
+        legal = self._status.get("legal_moves")
+        if legal is None:
+            legal = self._status["legal_moves"] = tuple(self._chess_board().legal_moves)
+        return legal
 
     def _is_path_clear(self, from_pos: str, to_pos: str) -> bool:
         from_sq = chess.parse_square(from_pos)
         to_sq = chess.parse_square(to_pos)
+        pieces = self.pieces
         for sq in chess.SquareSet.between(from_sq, to_sq):
-            if chess.square_name(sq) in self.pieces:
+            if chess.square_name(sq) in pieces:
                 return False
         return True
 
     def _is_en_passant_target(self, target: str) -> bool:
-        if not self.last_move:
-            return False
-        from_pos, to_pos = self.last_move
-        moved = self.pieces.get(to_pos)
-        if not moved or moved.type != PieceType.PAWN:
-            return False
-        r_from = chess.square_rank(chess.parse_square(from_pos))
-        r_to = chess.square_rank(chess.parse_square(to_pos))
-        if abs(r_from - r_to) != 2:
-            return False
-        ep_rank = (r_from + r_to) // 2
-        file = chess.square_file(chess.parse_square(to_pos))
-        return chess.square_name(chess.square(file, ep_rank)) == target
+        return self.ep_square == chess.parse_square(target)
 
     def move_piece(self, from_pos: str, to_pos: str) -> Dict[str, object]:
-        board = self._to_chess_board()
+        board = self._chess_board()
         move = chess.Move.from_uci(from_pos + to_pos)
-        if move not in board.legal_moves:
+        if not board.is_legal(move):
             if board.is_castling(move):
                 return {"success": False, "error": "casa atacada durante o roque"}
-            if self._move_exposes_check(from_pos, to_pos):
+            if board.is_into_check(move):
                 return {"success": False, "error": "movimento expõe o rei ao xeque"}
             return {"success": False, "error": "movimento ilegal"}
-        captured = board.piece_at(chess.parse_square(to_pos))
-        moving_piece = self.pieces.get(from_pos)
-        if not moving_piece:
+        if not board.piece_at(move.from_square):
             return {"success": False, "error": "sem peça na origem"}
-        is_castle = board.is_castling(move)
+        self.push(move)
+        return {"success": True}
+
+    def push(self, move: Union[chess.Move, str]) -> None:
+        """Makes a move without validating it; undo it with ``pop``.
+
+        Search and rule checks use this pair to try moves in place. The move
+        must be at least pseudo-legal; ``move_piece`` is the validated entry
+        point for player moves.
+        """
+        board = self._chess_board()
+        if isinstance(move, str):
+            move = chess.Move.from_uci(move)
+        if board.is_en_passant(move):
+            captured = _PIECES[(chess.PAWN, not board.turn)]
+        else:
+            captured_piece = board.piece_at(move.to_square)
+            captured = _piece_from_chess(captured_piece) if captured_piece else None
+        key = self.zobrist_key
+        pawn_key = self._pawn_key
+        self._undo.append(UndoRecord(captured, self._last_move, key, pawn_key))
+        key ^= piece_delta(board, move) ^ state_key(board)
+        if pawn_key is not None:
+            self._pawn_key = pawn_key ^ pawn_delta(board, move)
+        for table, totals in self._totals.items():
+            table.update(totals, board, move)
         board.push(move)
-        # update our representation
-        self.pieces.pop(from_pos)
-        self.pieces[to_pos] = moving_piece
-        if is_castle:
-            if to_pos == "g1":
-                rook = self.pieces.pop("h1", None)
-                if rook:
-                    self.pieces["f1"] = rook
-            elif to_pos == "c1":
-                rook = self.pieces.pop("a1", None)
-                if rook:
-                    self.pieces["d1"] = rook
-            elif to_pos == "g8":
-                rook = self.pieces.pop("h8", None)
-                if rook:
-                    self.pieces["f8"] = rook
-            elif to_pos == "c8":
-                rook = self.pieces.pop("a8", None)
-                if rook:
-                    self.pieces["d8"] = rook
-        if moving_piece.type == PieceType.PAWN and captured is None and from_pos[0] != to_pos[0]:
-            # en passant capture
-            captured_sq = to_pos[0] + from_pos[1]
-            captured_piece = self.pieces.pop(captured_sq, None)
-            if captured_piece:
-                self.captured_pieces.append(captured_piece)
+        self._key = key ^ state_key(board)
+        self._mark_moved()
         if captured:
-            self.captured_pieces.append(Piece(PieceType(captured.piece_type), Color(captured.color)))
-        self.move_history.append((from_pos, to_pos))
-        self.current_turn = Color.BLACK if self.current_turn == Color.WHITE else Color.WHITE
-        self.last_move = (from_pos, to_pos)
-        return {"success": True}
+            self.captured_pieces.append(captured)
+        last_move = (chess.SQUARE_NAMES[move.from_square], chess.SQUARE_NAMES[move.to_square])
+        self.move_history.append(last_move)
+        self._last_move = last_move
+
+    def pop(self) -> chess.Move:
+        """Takes back the last ``push``/``move_piece``. Raises ``IndexError`` if none.
+
+        Hand edits to ``pieces`` start a new history, so nothing made before
+        them can be taken back.
+        """
+        # Sync first: rebuilding after a hand edit drops the undo records.
+        board = self._chess_board()
+        record = self._undo.pop()
+        move = board.pop()
+        for table, totals in self._totals.items():
+            table.update(totals, board, move, -1)
+        self._mark_moved()
+        if record.captured:
+            self.captured_pieces.pop()
+        self.move_history.pop()
+        self._last_move = record.last_move
+        self._key = record.key
+        self._pawn_key = record.pawn_key
+        return move
 
     # ------------------------------------------------------------------
     # Status helpers
     def is_in_check(self) -> bool:
-        return self._to_chess_board().is_check()
+        status = self._status.get("check")
+        if status is None:
+            status = self._status["check"] = self._chess_board().is_check()
+        return status
 
     def is_checkmate(self) -> bool:
-        return self._to_chess_board().is_checkmate()
+        return self.is_in_check() and not self._has_legal_moves()
 
     def is_stalemate(self) -> bool:
-        board = self._to_chess_board()
-        return board.is_stalemate() or board.is_insufficient_material()
-
+        status = self._status.get("stalemate")
+        if status is None:
+            status = (
+                (not self.is_in_check() and not self._has_legal_moves())
+                or self._chess_board().is_insufficient_material()
+            )
+            self._status["stalemate"] = status
+        return status
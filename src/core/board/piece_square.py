@@ -0,0 +1,55 @@
+"""Running piece-square sums for Board positions.
+
+A ``PieceSquareTable`` assigns a value to every (color, piece type, square).
+``Board.piece_square_totals`` keeps the per-color sums of a table up to date
+across ``push``/``pop`` by applying only what each move changes, the same way
+the Zobrist key is maintained.
+"""
+
+from __future__ import annotations
+
+from typing import List, Sequence
+
+import chess
+
+from .zobrist import castling_squares
+
+
+class PieceSquareTable:
+    """Values indexed ``[color][piece_type][square]`` (python-chess numbering; piece_type 0 unused)."""
+
+    __slots__ = ("values",)
+
+    def __init__(self, values: Sequence[Sequence[Sequence[int]]]) -> None:
+        self.values = [[list(squares) for squares in by_type] for by_type in values]
+
+    def totals(self, board: chess.Board) -> List[int]:
+        """Sums computed from scratch, indexed by python-chess color (``[black, white]``)."""
+        totals = [0, 0]
+        for square, piece in board.piece_map().items():
+            totals[piece.color] += self.values[piece.color][piece.piece_type][square]
+        return totals
+
+    def update(self, totals: List[int], board: chess.Board, move: chess.Move, sign: int = 1) -> None:
+        """Applies ``move`` to ``totals`` in place; ``board`` is the position before it.
+
+        ``sign=-1`` takes the move back, so ``pop`` can undo without storing the sums.
+        """
+        from_square, to_square = move.from_square, move.to_square
+        color = board.turn
+        own = self.values[color]
+        piece_type = board.piece_type_at(from_square)
+
+        if piece_type == chess.KING and board.is_castling(move):
+            king_to, rook_from, rook_to = castling_squares(board, move)
+            totals[color] += sign * (own[chess.KING][king_to] - own[chess.KING][from_square]
+                                     + own[chess.ROOK][rook_to] - own[chess.ROOK][rook_from])
+            return
+
+        captured = board.piece_type_at(to_square)
+        if captured:
+            totals[not color] -= sign * self.values[not color][captured][to_square]
+        elif piece_type == chess.PAWN and to_square == board.ep_square:
+            captured_square = to_square - 8 if color == chess.WHITE else to_square + 8
+            totals[not color] -= sign * self.values[not color][chess.PAWN][captured_square]
+        totals[color] += sign * (own[move.promotion or piece_type][to_square] - own[piece_type][from_square])
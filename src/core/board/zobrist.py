@@ -0,0 +1,110 @@
+"""Zobrist keys for Board positions.
+
+The random numbers are the Polyglot ones, so keys match opening books in that
+format: pieces, castling rights, the en passant file (only when a pawn of the
+side to move could capture there) and the side to move.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, List, Tuple
+
+import chess
+from chess.polyglot import POLYGLOT_RANDOM_ARRAY as _RANDOM
+
+# PIECE_KEYS[color][piece_type][square]; piece_type 0 is unused.
+PIECE_KEYS: List[List[List[int]]] = [
+    [[0] * 64] + [_RANDOM[64 * ((piece_type - 1) * 2 + color):][:64] for piece_type in chess.PIECE_TYPES]
+    for color in (0, 1)
+]
+CASTLING_KEYS: Dict[chess.Square, int] = {
+    chess.H1: _RANDOM[768],
+    chess.A1: _RANDOM[769],
+    chess.H8: _RANDOM[770],
+    chess.A8: _RANDOM[771],
+}
+EP_KEYS: List[int] = _RANDOM[772:780]
+TURN_KEY: int = _RANDOM[780]
+
+
+def state_key(board: chess.Board) -> int:
+    """Key of everything but piece placement: castling, ep file and side to move."""
+    key = TURN_KEY if board.turn == chess.WHITE else 0
+    rights = board.castling_rights
+    if rights:
+        for square, castling_key in CASTLING_KEYS.items():
+            if rights & chess.BB_SQUARES[square]:
+                key ^= castling_key
+    ep_square = board.ep_square
+    if ep_square is not None and (chess.BB_PAWN_ATTACKS[not board.turn][ep_square]
+                                  & board.pawns & board.occupied_co[board.turn]):
+        key ^= EP_KEYS[ep_square & 7]
+    return key
+
+
+def zobrist_hash(board: chess.Board) -> int:
+    """Full Zobrist key of a position, computed from scratch."""
+    key = state_key(board)
+    for square, piece in board.piece_map().items():
+        key ^= PIECE_KEYS[piece.color][piece.piece_type][square]
+    return key
+
+
+def pawn_hash(board: chess.Board) -> int:
+    """Key of the pawn placement alone, for pawn-structure caches."""
+    key = 0
+    for color in chess.COLORS:
+        keys = PIECE_KEYS[color][chess.PAWN]
+        for square in chess.scan_forward(board.pawns & board.occupied_co[color]):
+            key ^= keys[square]
+    return key
+
+
+def pawn_delta(board: chess.Board, move: chess.Move) -> int:
+    """XOR of the pawn keys that ``move`` changes (often 0); call it before pushing."""
+    from_square, to_square = move.from_square, move.to_square
+    color = board.turn
+    delta = 0
+    moving_pawn = board.pawns & chess.BB_SQUARES[from_square]
+    if moving_pawn:
+        keys = PIECE_KEYS[color][chess.PAWN]
+        delta = keys[from_square] if move.promotion else keys[from_square] ^ keys[to_square]
+    if board.pawns & board.occupied_co[not color] & chess.BB_SQUARES[to_square]:
+        delta ^= PIECE_KEYS[not color][chess.PAWN][to_square]
+    elif moving_pawn and to_square == board.ep_square:
+        captured_square = to_square - 8 if color == chess.WHITE else to_square + 8
+        delta ^= PIECE_KEYS[not color][chess.PAWN][captured_square]
+    return delta
+
+
+def castling_squares(board: chess.Board, move: chess.Move) -> Tuple[int, int, int]:
+    """King destination, rook origin and rook destination of a castling move."""
+    from_square, to_square = move.from_square, move.to_square
+    rank = from_square & ~7
+    kingside = (to_square & 7) > (from_square & 7)
+    if board.occupied_co[board.turn] & chess.BB_SQUARES[to_square]:
+        rook_from = to_square  # king takes own rook (Chess960 notation)
+    else:
+        rook_from = rank + (7 if kingside else 0)
+    return rank + (6 if kingside else 2), rook_from, rank + (5 if kingside else 3)
+
+
+def piece_delta(board: chess.Board, move: chess.Move) -> int:
+    """XOR of the piece keys that ``move`` changes; call it before pushing."""
+    from_square, to_square = move.from_square, move.to_square
+    color = board.turn
+    keys = PIECE_KEYS[color]
+    piece_type = board.piece_type_at(from_square)
+    delta = keys[piece_type][from_square]
+
+    if piece_type == chess.KING and board.is_castling(move):
+        king_to, rook_from, rook_to = castling_squares(board, move)
+        return delta ^ keys[chess.KING][king_to] ^ keys[chess.ROOK][rook_from] ^ keys[chess.ROOK][rook_to]
+
+    captured = board.piece_type_at(to_square)
+    if captured:
+        delta ^= PIECE_KEYS[not color][captured][to_square]
+    elif piece_type == chess.PAWN and to_square == board.ep_square:
+        captured_square = to_square - 8 if color == chess.WHITE else to_square + 8
+        delta ^= PIECE_KEYS[not color][chess.PAWN][captured_square]
+    return delta ^ keys[move.promotion or piece_type][to_square]
@@ -3,6 +3,8 @@ Gerador de histórias para xadrez.
 """
 
 from typing import List, Optional, Dict
+import chess
+from ..ai.search import MATE_BOUND, MATE_SCORE, PVLine
 from ..core.board import Board, Color, Piece, PieceType
 from ..core.game import GameState
 from .narrative import CulturalContext, NarrativeStyle
@@ -187,6 +189,37 @@ class StoryGenerator:
             
         return narrative
         
+    def generate_candidates_narrative(self, board: Board, lines: List[PVLine]) -> str:
+        """
+        Descreve os planos em disputa a partir das linhas de uma busca
+        multi-PV (``SearchResult.lines``), com os scores do lado a jogar.
+        Comentário sobre a posição: não entra na história do jogo.
+        """
+        if not lines:
+            return ""
+        position = chess.Board(board.to_fen())
+        options = []
+        for line in lines:
+            if abs(line.score) >= MATE_BOUND:
+                moves_to_mate = (MATE_SCORE - abs(line.score) + 1) // 2
+                verdict = f"mate em {moves_to_mate}" if line.score > 0 else "leva ao mate"
+            else:
+                verdict = f"{line.score / 100:+.2f}"
+            options.append(f"{position.san(line.move)} ({verdict})")
+        listed = ", ".join(options)
+        
+        if self.context.style == NarrativeStyle.HISTORICAL:
+            return f"No conselho de guerra, {len(options)} planos são debatidos: {listed}."
+        elif self.context.style == NarrativeStyle.MYTHOLOGICAL:
+            return f"Os oráculos revelam {len(options)} destinos possíveis: {listed}."
+        elif self.context.style == NarrativeStyle.DRAMATIC:
+            return f"Tudo pode mudar agora; os caminhos em jogo são {listed}."
+        elif self.context.style == NarrativeStyle.STRATEGIC:
+            return f"Candidatos principais: {listed}."
+        else:  # EDUCATIONAL
+            return (f"Os lances mais fortes aqui são {listed}. Compare as variantes "
+                    "para entender por que o primeiro é o preferido.")
+        
     def generate_endgame_narrative(self, board: Board, game_state: GameState) -> str:
         """Gera narrativa para o final do jogo."""
         if game_state == GameState.CHECKMATE:
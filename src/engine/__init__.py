@@ -0,0 +1,3 @@
+"""
+Interfaces do motor de xadrez para ferramentas externas (protocolo UCI).
+"""
@@ -0,0 +1,341 @@
+"""
+Front-end UCI do motor de busca.
+
+Permite usar ``src.ai`` em GUIs, no ``chess.engine.SimpleEngine`` do
+python-chess e em torneios automáticos (cutechess e similares)::
+
+    python -m src.engine.uci
+
+Comandos aceitos: ``uci``, ``isready``, ``ucinewgame``, ``setoption``
+(``Hash`` em MB, ``Threads`` e ``MultiPV``), ``position``, ``go`` (``depth``, ``nodes``,
+``movetime``, ``wtime``/``btime``/``winc``/``binc``/``movestogo``,
+``infinite`` e ``ponder``), ``stop``, ``ponderhit`` e ``quit``; os demais são
+ignorados, como pede o protocolo.
+
+A busca roda numa thread separada para que ``stop``, ``ponderhit`` e
+``isready`` sejam atendidos durante ela. Em ``go infinite`` e ``go ponder``
+o ``bestmove`` só é enviado depois de ``stop`` ou ``ponderhit``. No
+``ponderhit`` o relógio informado no ``go ponder`` passa a valer a partir
+daquele instante, com o prazo flexível verificado a cada iteração e o
+rígido por um temporizador.
+"""
+
+import argparse
+import dataclasses
+import sys
+import threading
+import time
+from typing import Iterable, List, Optional, Sequence, TextIO, Union
+
+from ..ai.parallel_search import LazySMPSearch
+from ..ai.search import MATE_BOUND, MATE_SCORE, AlphaBetaSearch, SearchInfo, SearchResult
+from ..ai.time_manager import TIMED_CHECK_INTERVAL, SearchController, SearchLimits, allocate_time
+from ..core.board import Board
+
+ENGINE_NAME = "Aeon Chess"
+ENGINE_AUTHOR = "Aeon Chess Team"
+
+DEFAULT_HASH_MB = 16
+MIN_HASH_MB = 1
+MAX_HASH_MB = 4096
+MAX_THREADS = 64
+MAX_MULTIPV = 16
+
+# Parâmetros numéricos do ``go``; os tempos chegam em milissegundos.
+_GO_TIMES = {'movetime', 'wtime', 'btime', 'winc', 'binc'}
+_GO_INTEGERS = {'depth', 'nodes', 'movestogo'}
+_GO_KEYWORDS = _GO_TIMES | _GO_INTEGERS | {'infinite', 'ponder', 'searchmoves', 'mate'}
+
+
+def format_score(score: int) -> str:
+    """Score do lado a jogar no formato UCI (``cp`` ou ``mate`` em lances)."""
+    if score >= MATE_BOUND:
+        return f"mate {(MATE_SCORE - score + 1) // 2}"
+    if score <= -MATE_BOUND:
+        return f"mate -{(MATE_SCORE + score + 1) // 2}"
+    return f"cp {score}"
+
+
+def parse_go(tokens: Sequence[str]) -> SearchLimits:
+    """Limites de um ``go``; valores inválidos são ignorados."""
+    limits = SearchLimits()
+    index = 0
+    while index < len(tokens):
+        token = tokens[index]
+        index += 1
+        if token == 'infinite':
+            limits.infinite = True
+        elif token in _GO_TIMES or token in _GO_INTEGERS:
+            if index >= len(tokens):
+                break
+            try:
+                value = int(tokens[index])
+            except ValueError:
+                continue
+            index += 1
+            if token in _GO_TIMES:
+                value = max(0, value) / 1000.0
+            setattr(limits, token, value)
+        elif token == 'searchmoves':
+            # Não suportado: pula a lista de lances.
+            while index < len(tokens) and tokens[index] not in _GO_KEYWORDS:
+                index += 1
+    return limits
+
+
+def parse_position(tokens: Sequence[str]) -> Board:
+    """
+    Tabuleiro de um ``position startpos|fen <fen> [moves ...]``. Levanta
+    ``ValueError`` para FEN ou lance inválido.
+    """
+    if 'moves' in tokens:
+        split = tokens.index('moves')
+        setup, moves = tokens[:split], tokens[split + 1:]
+    else:
+        setup, moves = tokens, []
+    if setup and setup[0] == 'fen':
+        board = Board.from_fen(' '.join(setup[1:]))
+    elif setup and setup[0] == 'startpos':
+        board = Board()
+    else:
+        raise ValueError("position sem startpos nem fen")
+    for uci in moves:
+        legal = {move.uci(): move for move in board.legal_moves()}
+        if uci not in legal:
+            raise ValueError(f"lance ilegal: {uci}")
+        board.push(legal[uci])
+    return board
+
+
+class UCIEngine:
+    """Estado de uma sessão UCI: opções, posição atual e busca em andamento."""
+
+    def __init__(self, output: TextIO = sys.stdout, hash_mb: int = DEFAULT_HASH_MB,
+                 threads: int = 1):
+        self.output = output
+        self.hash_mb = hash_mb
+        self.threads = threads
+        self.multipv = 1
+        self.board = Board()
+        self.controller = self._make_controller()
+        self._output_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._limits = SearchLimits()
+        self._pondering = False
+        # Liberado quando o bestmove pode ser enviado.
+        self._release = threading.Event()
+        self._stop_requested = threading.Event()
+        self._soft_deadline: Optional[float] = None
+        self._timer: Optional[threading.Timer] = None
+
+    def _make_controller(self) -> SearchController:
+        if self.threads > 1:
+            engine: Union[AlphaBetaSearch, LazySMPSearch] = LazySMPSearch(
+                threads=self.threads, hash_mb=self.hash_mb)
+            root = engine.engine
+        else:
+            engine = root = AlphaBetaSearch(hash_mb=self.hash_mb)
+        # stop precisa de resposta rápida mesmo em buscas sem prazo.
+        root.check_interval = TIMED_CHECK_INTERVAL
+        return SearchController(engine)
+
+    def _close_controller(self):
+        if isinstance(self.controller.engine, LazySMPSearch):
+            self.controller.engine.close()
+
+    def send(self, line: str):
+        with self._output_lock:
+            self.output.write(line + "\n")
+            self.output.flush()
+
+    def run(self, lines: Iterable[str]):
+        """Processa comandos até ``quit`` ou o fim da entrada."""
+        try:
+            for line in lines:
+                if not self.handle(line):
+                    break
+        finally:
+            self.close()
+
+    def handle(self, line: str) -> bool:
+        """Executa um comando; devolve False em ``quit``."""
+        tokens = line.split()
+        if not tokens:
+            return True
+        command, args = tokens[0], tokens[1:]
+        if command == 'quit':
+            return False
+        if command == 'uci':
+            self.send(f"id name {ENGINE_NAME}")
+            self.send(f"id author {ENGINE_AUTHOR}")
+            self.send(f"option name Hash type spin default {DEFAULT_HASH_MB} "
+                      f"min {MIN_HASH_MB} max {MAX_HASH_MB}")
+            self.send(f"option name Threads type spin default 1 min 1 max {MAX_THREADS}")
+            self.send(f"option name MultiPV type spin default 1 min 1 max {MAX_MULTIPV}")
+            self.send("option name Ponder type check default false")
+            self.send("uciok")
+        elif command == 'isready':
+            self.send("readyok")
+        elif command == 'ucinewgame':
+            self.stop()
+            self.controller.engine.clear()
+        elif command == 'setoption':
+            self.stop()
+            self._set_option(args)
+        elif command == 'position':
+            self.stop()
+            try:
+                self.board = parse_position(args)
+            except ValueError as error:
+                self.send(f"info string {error}")
+        elif command == 'go':
+            self.stop()
+            self._go(parse_go(args), ponder='ponder' in args)
+        elif command == 'stop':
+            self.stop()
+        elif command == 'ponderhit':
+            self._ponderhit()
+        return True
+
+    def _set_option(self, args: List[str]):
+        """``setoption name <nome> value <valor>``; nomes sem diferenciar maiúsculas."""
+        if 'value' not in args or not args or args[0] != 'name':
+            return
+        split = args.index('value')
+        name = ' '.join(args[1:split]).lower()
+        value = ' '.join(args[split + 1:])
+        if name == 'hash':
+            try:
+                hash_mb = min(MAX_HASH_MB, max(MIN_HASH_MB, int(value)))
+            except ValueError:
+                return
+            if hash_mb != self.hash_mb:
+                self.hash_mb = hash_mb
+                self._close_controller()
+                self.controller = self._make_controller()
+        elif name == 'threads':
+            try:
+                threads = min(MAX_THREADS, max(1, int(value)))
+            except ValueError:
+                return
+            if threads != self.threads:
+                self.threads = threads
+                self._close_controller()
+                self.controller = self._make_controller()
+        elif name == 'multipv':
+            try:
+                self.multipv = min(MAX_MULTIPV, max(1, int(value)))
+            except ValueError:
+                return
+
+    def _go(self, limits: SearchLimits, ponder: bool):
+        self._limits = limits
+        self._pondering = ponder
+        self._soft_deadline = None
+        self._stop_requested.clear()
+        self._release.clear()
+        if ponder:
+            # Enquanto o adversário pensa, a busca não tem prazo.
+            limits = dataclasses.replace(limits, infinite=True, movetime=None,
+                                         wtime=None, btime=None)
+        if not (ponder or limits.infinite):
+            self._release.set()
+        self._thread = threading.Thread(target=self._search, args=(self.board, limits),
+                                        daemon=True)
+        self._thread.start()
+
+    def _search(self, board: Board, limits: SearchLimits):
+        result = self.controller.search(board, limits, on_iteration=self._report,
+                                        multipv=self.multipv)
+        self._release.wait()
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self.send(self._bestmove(result))
+
+    def _report(self, info: SearchInfo):
+        stats = f"nodes {info.nodes} nps {int(info.nps)} time {int(info.elapsed * 1000)}"
+        if self.multipv > 1:
+            for index, pv_line in enumerate(info.lines, 1):
+                self.send(f"info depth {info.depth} multipv {index} "
+                          f"score {format_score(pv_line.score)} {stats} "
+                          f"pv {' '.join(move.uci() for move in pv_line.pv)}")
+        else:
+            line = f"info depth {info.depth} score {format_score(info.score)} {stats}"
+            if info.pv:
+                line += " pv " + " ".join(move.uci() for move in info.pv)
+            self.send(line)
+        # A busca zera o pedido de parada ao começar; um stop que chegou
+        # antes disso é repassado aqui.
+        if self._stop_requested.is_set() or (
+                self._soft_deadline is not None and time.perf_counter() >= self._soft_deadline):
+            self.controller.stop()
+
+    @staticmethod
+    def _bestmove(result: SearchResult) -> str:
+        if result.best_move is None:
+            return "bestmove 0000"
+        line = f"bestmove {result.best_move.uci()}"
+        if len(result.pv) > 1:
+            line += f" ponder {result.pv[1].uci()}"
+        return line
+
+    def _ponderhit(self):
+        """O adversário jogou o lance esperado: a busca continua, agora com relógio."""
+        if not self._pondering or self._thread is None:
+            return
+        self._pondering = False
+        limits = self._limits
+        soft, hard = allocate_time(limits, self.board.current_turn)
+        now = time.perf_counter()
+        if soft is not None:
+            self._soft_deadline = now + soft
+        if hard is not None:
+            self._timer = threading.Timer(hard, self.controller.stop)
+            self._timer.daemon = True
+            self._timer.start()
+        if not limits.infinite:
+            self._release.set()
+
+    def stop(self):
+        """Interrompe a busca em andamento e espera o seu bestmove."""
+        if self._thread is None:
+            return
+        self._stop_requested.set()
+        self.controller.stop()
+        self._release.set()
+        self.wait()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Espera a busca em andamento terminar; devolve False se o prazo acabar antes."""
+        thread = self._thread
+        if thread is None:
+            return True
+        thread.join(timeout)
+        if thread.is_alive():
+            return False
+        self._thread = None
+        self._pondering = False
+        return True
+
+    def close(self):
+        self.stop()
+        self._close_controller()
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m src.engine.uci",
+                                     description="Motor de xadrez no protocolo UCI.")
+    parser.add_argument("--hash", type=int, default=DEFAULT_HASH_MB,
+                        help="tabela de transposição em MB")
+    parser.add_argument("--threads", type=int, default=1,
+                        help="processos de busca (Lazy SMP)")
+    args = parser.parse_args(argv)
+
+    engine = UCIEngine(sys.stdout, hash_mb=args.hash, threads=args.threads)
+    engine.run(sys.stdin)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -15,6 +15,7 @@ from .optimization import (
     ComputationOptimizer,
     PerformanceMonitor
 )
+from .memory import MemorySample, estimate_bytes, sample_memory
 
 __all__ = [
     'ComputationResult',
@@ -25,5 +26,8 @@ __all__ = [
     'PerformanceMetrics',
     'MemoryOptimizer',
     'ComputationOptimizer',
-    'PerformanceMonitor'
+    'PerformanceMonitor',
+    'MemorySample',
+    'estimate_bytes',
+    'sample_memory'
 ]
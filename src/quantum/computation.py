@@ -5,11 +5,19 @@ Este módulo implementa cálculos avançados e paralelizados para operações
 críticas de performance no motor de xadrez.
 """
 
+import pickle
+import time
 import numpy as np
-from typing import List, Tuple, Optional
+from typing import Dict, List, Sequence, Tuple, Optional
 from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 from dataclasses import dataclass
+import chess
+from ..ai.batch_evaluation import evaluate_batch
+from ..ai.parallel_search import LazySMPSearch
+from ..ai.search import AlphaBetaSearch
 from ..core.board import Board, Color, Piece, PieceType
+from ..traditional.bitboards import square_index, square_position
+from .optimization import PerformanceMetrics
 
 @dataclass
 class ComputationResult:
@@ -20,14 +28,79 @@ class ComputationResult:
     nodes_evaluated: int
     execution_time: float
 
+# Cada tarefa do pool deve levar ao menos isto, para diluir o custo de IPC.
+TARGET_TASK_SECONDS = 0.05
+# Tarefas por processo na primeira chamada, antes de conhecer o custo por posição.
+INITIAL_CHUNKS_PER_PROCESS = 4
+# Abaixo disto (estimado), o trabalho inteiro roda no próprio processo.
+MIN_PARALLEL_SECONDS = 0.02
+
+# Motor de cada processo do pool, criado uma vez pelo initializer e mantido
+# entre as tarefas: a tabela de transposição continua quente de uma chamada
+# para a outra.
+_WORKER_ENGINE: Optional[AlphaBetaSearch] = None
+
+
+def _init_worker(hash_mb: float):
+    global _WORKER_ENGINE
+    _WORKER_ENGINE = AlphaBetaSearch(hash_mb=hash_mb)
+
+
+def _score_position(engine: AlphaBetaSearch, board: Board, depth: int) -> int:
+    """Score do lado a jogar: busca com ``depth`` > 0, avaliação estática com 0."""
+    if depth <= 0:
+        score = engine.evaluate(board)
+        return score if board.current_turn == Color.WHITE else -score
+    return engine.search(board, depth=depth).score
+
+
+def _score_fens(fens: List[str], depth: int) -> Tuple[List[int], float]:
+    """Tarefa do pool: scores das posições em FEN e o tempo gasto no processo."""
+    global _WORKER_ENGINE
+    if _WORKER_ENGINE is None:
+        _WORKER_ENGINE = AlphaBetaSearch()
+    start = time.perf_counter()
+    scores = [_score_position(_WORKER_ENGINE, Board.from_fen(fen), depth) for fen in fens]
+    return scores, time.perf_counter() - start
+
+
 class ParallelComputation:
-    """Implementa computação paralela para análise de posições."""
+    """
+    Implementa computação paralela para análise de posições.
+
+    As posições vão para os processos como FEN (strings curtas), nunca como
+    tabuleiros ou métodos ligados a ``self``; cada processo mantém o seu
+    motor e a sua tabela de transposição entre as chamadas. O tamanho dos
+    lotes é ajustado pelo custo medido por posição, e ``metrics`` registra
+    o tempo perdido com a paralelização na última chamada.
+    """
     
-    def __init__(self, num_threads: int = 4, num_processes: int = 2):
+    def __init__(self, num_threads: int = 4, num_processes: int = 2, hash_mb: float = 16.0,
+                 chunk_size: Optional[int] = None):
+        """``chunk_size`` fixa o tamanho dos lotes; sem ele, o tamanho é ajustado sozinho."""
         self.num_threads = num_threads
         self.num_processes = num_processes
+        self.chunk_size = chunk_size
         self.thread_executor = ThreadPoolExecutor(max_workers=num_threads)
-        self.process_executor = ProcessPoolExecutor(max_workers=num_processes)
+        self.process_executor = ProcessPoolExecutor(max_workers=num_processes,
+                                                    initializer=_init_worker,
+                                                    initargs=(hash_mb,))
+        # Motor usado quando o trabalho é pequeno demais para o pool.
+        self.local_engine = AlphaBetaSearch(hash_mb=hash_mb)
+        self.metrics = PerformanceMetrics(0.0, 0.0, 0, 0, 0.0, 0)
+        # Segundos por posição medidos nos processos, por profundidade.
+        self._seconds_per_position: Dict[int, float] = {}
+
+    def __enter__(self) -> "ParallelComputation":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Encerra os processos e as threads."""
+        self.process_executor.shutdown(wait=True)
+        self.thread_executor.shutdown(wait=True)
         
     def parallel_position_evaluation(self,
                                    board: Board,
@@ -36,60 +109,97 @@ class ParallelComputation:
         """
         Avalia múltiplas posições em paralelo.
         Retorna lista de scores para cada posição.
+
+        ``positions`` são lances ((linha, coluna), (linha, coluna)) ou
+        ``chess.Move`` a partir de ``board``; cada score é do ponto de vista
+        de quem faz o lance, com ``depth`` meios-lances contando o próprio
+        lance, na ordem de ``positions``.
         """
-        # Divide as posições entre os processos disponíveis
-        chunks = np.array_split(positions, self.num_processes)
-        
-        # Submete cada chunk para avaliação em um processo separado
-        futures = [
-            self.process_executor.submit(
-                self._evaluate_positions_chunk, board, chunk, depth
-            )
-            for chunk in chunks
-        ]
-        
-        # Coleta resultados
-        results = []
+        fens = []
+        for move in positions:
+            board.push(self._to_move(board, move))
+            fens.append(board.to_fen())
+            board.pop()
+        return [-score for score in self.evaluate_fens(fens, depth - 1)]
+
+    def evaluate_fens(self, fens: Sequence[str], depth: int) -> List[float]:
+        """
+        Scores das posições em FEN para o lado a jogar em cada uma, na mesma
+        ordem. Com ``depth`` <= 0 a avaliação estática é feita em lote (ver
+        ``evaluate_batch``) no próprio processo.
+        """
+        start = time.perf_counter()
+        count = len(fens)
+        if depth <= 0:
+            boards = [Board.from_fen(fen) for fen in fens]
+            signs = np.array([1 if b.current_turn == Color.WHITE else -1 for b in boards])
+            scores = (evaluate_batch(boards).scores * signs).tolist() if boards else []
+            self._record(count, time.perf_counter() - start, 0.0)
+            return [float(score) for score in scores]
+
+        cost = self._seconds_per_position.get(depth)
+        if self.num_processes <= 1 or count < 2 or (
+                cost is not None and cost * count < MIN_PARALLEL_SECONDS):
+            engine = self.local_engine
+            scores = [_score_position(engine, Board.from_fen(fen), depth) for fen in fens]
+            self._record(count, time.perf_counter() - start, 0.0)
+            return [float(score) for score in scores]
+
+        size = self._chunk_size(count, depth)
+        futures = [self.process_executor.submit(_score_fens, list(fens[i:i + size]), depth)
+                   for i in range(0, count, size)]
+        scores: List[float] = []
+        busy = 0.0
         for future in futures:
-            results.extend(future.result())
-            
-        return results
-        
-    def _evaluate_positions_chunk(self,
-                                board: Board,
-                                positions: List[Tuple[Tuple[int, int], Tuple[int, int]]],
-                                depth: int) -> List[float]:
-        """Avalia um chunk de posições em um processo."""
-        results = []
-        for from_pos, to_pos in positions:
-            # Faz uma cópia do tabuleiro para avaliação
-            board_copy = self._copy_board(board)
-            # Executa o movimento
-            board_copy.move_piece(from_pos, to_pos)
-            # Avalia a posição
-            score = self._evaluate_single_position(board_copy, depth)
-            results.append(score)
-        return results
+            chunk_scores, seconds = future.result()
+            scores.extend(float(score) for score in chunk_scores)
+            busy += seconds
+        elapsed = time.perf_counter() - start
+
+        per_position = busy / count
+        self._seconds_per_position[depth] = (per_position if cost is None
+                                             else (cost + per_position) / 2)
+        # O que passa do trabalho útil dividido entre os processos ocupados é custo
+        # da paralelização: serialização, filas, espera pelo lote mais lento.
+        workers = min(self.num_processes, len(futures))
+        self._record(count, elapsed, max(0.0, elapsed - busy / workers))
+        return scores
+
+    def _chunk_size(self, count: int, depth: int) -> int:
+        if self.chunk_size:
+            return self.chunk_size
+        # Nunca menos lotes que processos, para nenhum ficar parado.
+        balanced = -(-count // self.num_processes)
+        cost = self._seconds_per_position.get(depth)
+        if cost is None:
+            return max(1, -(-count // (self.num_processes * INITIAL_CHUNKS_PER_PROCESS)))
+        return max(1, min(balanced, int(TARGET_TASK_SECONDS / max(cost, 1e-9))))
+
+    def _record(self, count: int, elapsed: float, overhead: float):
+        self.metrics = PerformanceMetrics(
+            operation_time=elapsed,
+            memory_usage=0.0,
+            cache_hits=0,
+            cache_misses=0,
+            parallelization_overhead=overhead,
+            total_operations=self.metrics.total_operations + count,
+        )
+
+    @staticmethod
+    def _to_move(board: Board, move) -> chess.Move:
+        if isinstance(move, chess.Move):
+            return move
+        (from_row, from_col), (to_row, to_col) = move
+        from_square, to_square = square_index(from_row, from_col), square_index(to_row, to_col)
+        for legal in board.legal_moves():
+            if (legal.from_square == from_square and legal.to_square == to_square
+                    and legal.promotion in (None, chess.QUEEN)):
+                return legal
+        raise ValueError(f"lance ilegal: {move}")
         
     def _copy_board(self, board: Board) -> Board:
         """Cria uma cópia profunda do tabuleiro."""
-        new_board = Board()
-        for row in range(8):
-            for col in range(8):
-                piece = board.get_piece(row, col)
-                if piece is not None:
-                    new_board.squares[row][col] = Piece(
-                        piece.type, piece.color
-                    )
-        return new_board
-        
-    def _evaluate_single_position(self, board: Board, depth: int) -> float:
-        """
-        Avalia uma única posição.
-        Esta é uma implementação simplificada que será expandida posteriormente.
-        """
-        # TODO: Implementar avaliação mais sofisticada
-        return 0.0
+        return pickle.loads(pickle.dumps(board))
 
 class VectorizedOperations:
     """Implementa operações vetorizadas para cálculos em massa."""
@@ -128,62 +238,81 @@ class VectorizedOperations:
                 
         return patterns
 
+    @staticmethod
+    def evaluate_positions(boards: List[Board]) -> np.ndarray:
+        """Avalia várias posições de uma vez (brancas menos pretas), ver ``evaluate_batch``."""
+        return evaluate_batch(boards).scores
+
 class OptimizedSearch:
-    """Implementa busca otimizada de movimentos."""
+    """Busca de movimentos sobre o motor alpha-beta de ``src.ai.search``."""
     
-    def __init__(self, max_depth: int = 4):
+    def __init__(self, max_depth: int = 4, time_limit: Optional[float] = None,
+                 node_limit: Optional[int] = None, hash_mb: float = 16.0, threads: int = 1):
+        """Com ``threads`` > 1, a busca roda em Lazy SMP com tabela compartilhada."""
         self.max_depth = max_depth
-        self.parallel_comp = ParallelComputation()
+        self.time_limit = time_limit
+        self.node_limit = node_limit
+        if threads > 1:
+            self.engine = LazySMPSearch(threads=threads, hash_mb=hash_mb)
+        else:
+            self.engine = AlphaBetaSearch(hash_mb=hash_mb)
         
-    def find_best_move(self, board: Board, color: Color) -> Optional[Tuple[Tuple[int, int], Tuple[int, int]]]:
+    def __enter__(self) -> "OptimizedSearch":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Encerra os processos auxiliares e libera a tabela compartilhada do Lazy SMP."""
+        if isinstance(self.engine, LazySMPSearch):
+            self.engine.close()
+        
+    def search(self, board: Board) -> ComputationResult:
         """
-        Encontra o melhor movimento para a cor dada.
-        Usa computação paralela e otimizações avançadas.
+        Busca a posição para o lado a jogar respeitando a profundidade e os
+        limites de tempo (segundos) e de nós configurados.
         """
-        legal_moves = self._get_legal_moves(board, color)
-        if not legal_moves:
-            return None
-            
-        # Avalia movimentos em paralelo
-        scores = self.parallel_comp.parallel_position_evaluation(
-            board, legal_moves, self.max_depth
+        result = self.engine.search(board, depth=self.max_depth,
+                                    movetime=self.time_limit, nodes=self.node_limit)
+        return ComputationResult(
+            score=float(result.score),
+            best_moves=[self._to_positions(move) for move in result.pv],
+            depth=result.depth,
+            nodes_evaluated=result.nodes,
+            execution_time=result.elapsed
         )
         
-        # Encontra o melhor movimento
-        best_score_idx = np.argmax(scores)
-        return legal_moves[best_score_idx]
+    def find_best_move(self, board: Board, color: Color) -> Optional[Tuple[Tuple[int, int], Tuple[int, int]]]:
+        """
+        Encontra o melhor movimento para a cor dada, como ((linha, coluna), (linha, coluna)).
+        Retorna None se a cor não tiver lances legais.
+        """
+        if board.current_turn != color:
+            # Busca numa cópia com a vez trocada para não alterar o tabuleiro do jogo.
+            board = Board.from_fen(board.to_fen())
+            board.current_turn = color
+        result = self.engine.search(board, depth=self.max_depth,
+                                    movetime=self.time_limit, nodes=self.node_limit)
+        if result.best_move is None:
+            return None
+        return self._to_positions(result.best_move)
         
-    def _get_legal_moves(self, board: Board, color: Color) -> List[Tuple[Tuple[int, int], Tuple[int, int]]]:
-        """Obtém todos os movimentos legais para uma cor."""
-        legal_moves = []
-        for row in range(8):
-            for col in range(8):
-                piece = board.get_piece(row, col)
-                if piece is not None and piece.color == color:
-                    # TODO: Implementar geração de movimentos legais
-                    pass
-        return legal_moves
+    @staticmethod
+    def _to_positions(move: chess.Move) -> Tuple[Tuple[int, int], Tuple[int, int]]:
+        return square_position(move.from_square), square_position(move.to_square)
 
 class PositionHashing:
     """Implementa hashing eficiente de posições do tabuleiro."""
     
     @staticmethod
     def compute_position_hash(board: Board) -> int:
-        """Calcula um hash único para a posição atual."""
-        hash_value = 0
-        for row in range(8):
-            for col in range(8):
-                piece = board.get_piece(row, col)
-                if piece is not None:
-                    # Combina tipo da peça, cor e posição em um hash
-                    piece_value = (
-                        piece.type.value + 
-                        (1 if piece.color == Color.WHITE else 2) * 10 +
-                        row * 100 +
-                        col * 1000
-                    )
-                    hash_value ^= piece_value
-        return hash_value
+        """
+        Retorna a chave Zobrist de 64 bits da posição.
+        A chave cobre peças, lado a jogar, roques e coluna de en passant e é
+        mantida incrementalmente pelo tabuleiro a cada push/pop.
+        """
+        return board.zobrist_key
         
     @staticmethod
     def compare_positions(board1: Board, board2: Board) -> float:
@@ -0,0 +1,100 @@
+"""
+Medição real de memória do processo.
+
+- RSS e pico de RSS (``VmRSS``/``VmHWM``) vêm de ``/proc/self/status``;
+- USS, a memória exclusiva do processo (``Private_Clean + Private_Dirty``),
+  vem de ``/proc/self/smaps_rollup``: é o que seria liberado se o processo
+  terminasse, sem contar páginas compartilhadas (bibliotecas, tabelas
+  mapeadas em vários workers);
+- ``tracemalloc``, quando ligado, dá as alocações do Python e o seu pico.
+
+Fora do Linux só o pico de RSS (``resource.getrusage``) está disponível; os
+demais valores ficam em None.
+"""
+
+import sys
+import tracemalloc
+from typing import Any, Dict, NamedTuple, Optional
+
+PROC_STATUS = '/proc/self/status'
+PROC_SMAPS_ROLLUP = '/proc/self/smaps_rollup'
+
+
+class MemorySample(NamedTuple):
+    """Amostra de memória, em bytes; None quando a medida não está disponível."""
+    rss: Optional[int]
+    uss: Optional[int]
+    peak_rss: Optional[int]
+    traced: Optional[int]
+    traced_peak: Optional[int]
+
+
+def _read_kb_fields(path: str, *fields: str) -> Dict[str, int]:
+    """Campos ``Nome:   123 kB`` de um arquivo do /proc, em bytes."""
+    values = {}
+    try:
+        with open(path, 'r') as f:
+            for line in f:
+                name, _, rest = line.partition(':')
+                if name in fields:
+                    values[name] = int(rest.split()[0]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return values
+
+
+def read_rss() -> Dict[str, int]:
+    """RSS atual (``VmRSS``) e pico (``VmHWM``) do processo, em bytes."""
+    return _read_kb_fields(PROC_STATUS, 'VmRSS', 'VmHWM')
+
+
+def read_uss() -> Optional[int]:
+    """Memória exclusiva do processo, em bytes."""
+    fields = _read_kb_fields(PROC_SMAPS_ROLLUP, 'Private_Clean', 'Private_Dirty')
+    if not fields:
+        return None
+    return sum(fields.values())
+
+
+def _getrusage_peak() -> Optional[int]:
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss vem em kB no Linux e em bytes no macOS.
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def sample_memory(uss: bool = True) -> MemorySample:
+    """
+    Lê a memória do processo agora. ``uss=False`` pula o smaps_rollup, que
+    custa mais (o kernel percorre os mapeamentos).
+    """
+    status = read_rss()
+    traced = traced_peak = None
+    if tracemalloc.is_tracing():
+        traced, traced_peak = tracemalloc.get_traced_memory()
+    return MemorySample(
+        rss=status.get('VmRSS'),
+        uss=read_uss() if uss else None,
+        peak_rss=status.get('VmHWM', None) or _getrusage_peak(),
+        traced=traced,
+        traced_peak=traced_peak,
+    )
+
+
+def estimate_bytes(obj: Any) -> int:
+    """
+    Bytes estimados de um cache: usa ``nbytes``/``size_bytes`` quando o
+    objeto os informa (caches da IA, arrays NumPy) e, para dicionários, o
+    tamanho raso do dicionário, das chaves e dos valores.
+    """
+    for attribute in ('nbytes', 'size_bytes'):
+        value = getattr(obj, attribute, None)
+        if isinstance(value, int):
+            return value
+    if isinstance(obj, dict):
+        return sys.getsizeof(obj) + sum(sys.getsizeof(key) + sys.getsizeof(value)
+                                        for key, value in obj.items())
+    return sys.getsizeof(obj)
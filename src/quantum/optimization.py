@@ -7,9 +7,16 @@ from typing import List, Dict, Tuple, Optional
 from dataclasses import dataclass
 import time
 import logging
-from threading import Lock
+import tracemalloc
 from concurrent.futures import ThreadPoolExecutor
 
+from ..ai.cache.sharded import DEFAULT_SHARDS, ShardedCache
+from .memory import estimate_bytes, sample_memory
+
+# Crescimento de memória durante uma operação a partir do qual ela é apontada
+# nas sugestões de otimização.
+HIGH_MEMORY_GROWTH = 16 << 20
+
 @dataclass
 class PerformanceMetrics:
     """Métricas de performance do sistema."""
@@ -23,21 +30,28 @@ class PerformanceMetrics:
 class MemoryOptimizer:
     """Otimiza o uso de memória durante operações intensivas."""
     
-    def __init__(self, max_cache_size: int = 10000):
+    def __init__(self, max_cache_size: int = 10000, max_cache_bytes: Optional[int] = None,
+                 eviction_policy: str = 'lru', shards: int = DEFAULT_SHARDS):
         self.max_cache_size = max_cache_size
-        self.cache: Dict[int, dict] = {}
-        self.cache_lock = Lock()
+        # Cada shard tem a sua trava e despeja uma vítima por vez, escolhida pela política.
+        self.cache = ShardedCache(shards, max_bytes=max_cache_bytes, max_entries=max_cache_size,
+                                  policy=eviction_policy)
         self.metrics = PerformanceMetrics(0.0, 0.0, 0, 0, 0.0, 0)
+
+    def get_cached(self, key: int) -> Optional[dict]:
+        """Recupera um resultado do cache, ou None."""
+        value = self.cache.get(key)
+        self.metrics.cache_hits = self.cache.hits
+        self.metrics.cache_misses = self.cache.misses
+        return value
+
+    def cache_result(self, key: int, value: dict, depth: int = 0):
+        """Armazena um resultado no cache."""
+        self.cache.put(key, value, depth)
         
     def clear_old_entries(self):
-        """Remove entradas antigas do cache quando necessário."""
-        with self.cache_lock:
-            if len(self.cache) > self.max_cache_size:
-                # Remove 20% das entradas mais antigas
-                num_to_remove = self.max_cache_size // 5
-                keys_to_remove = list(self.cache.keys())[:num_to_remove]
-                for key in keys_to_remove:
-                    del self.cache[key]
+        """Aplica os limites atuais do cache, despejando pela política se necessário."""
+        self.cache.set_limits(self.cache.max_bytes, self.max_cache_size)
                     
     def optimize_array(self, data: np.ndarray) -> np.ndarray:
         """Otimiza um array para uso eficiente de memória."""
@@ -53,10 +67,28 @@ class MemoryOptimizer:
         return data
         
     def monitor_memory_usage(self) -> float:
-        """Monitora o uso atual de memória."""
-        # TODO: Implementar monitoramento real de memória
+        """Monitora o uso atual de memória: RSS do processo, em bytes."""
+        sample = sample_memory(uss=False)
+        self.metrics.memory_usage = float(sample.rss or 0)
+        return self.metrics.memory_usage
+
+    def cache_usage_percent(self) -> float:
+        """Ocupação do cache em relação ao orçamento (bytes, se houver, ou entradas)."""
+        if self.cache.max_bytes:
+            return self.cache.nbytes / self.cache.max_bytes * 100
         return len(self.cache) / self.max_cache_size * 100
 
+    def memory_report(self) -> Dict[str, Optional[float]]:
+        """Memória do processo e estimativa do cache, em bytes."""
+        sample = sample_memory()
+        return {
+            'rss_bytes': sample.rss,
+            'uss_bytes': sample.uss,
+            'peak_rss_bytes': sample.peak_rss,
+            'cache_bytes': self.cache.nbytes,
+            'cache_usage_percent': self.cache_usage_percent(),
+        }
+
 class ComputationOptimizer:
     """Otimiza computações intensivas."""
     
@@ -127,17 +159,59 @@ class ComputationOptimizer:
         return None
 
 class PerformanceMonitor:
-    """Monitora e otimiza a performance do sistema."""
+    """
+    Monitora e otimiza a performance do sistema.
+
+    A memória é medida de verdade (ver ``memory.py``): RSS e USS do processo
+    a cada operação e, com ``trace_allocations``, o pico de alocações do
+    Python durante cada operação via ``tracemalloc``. Caches registrados com
+    ``register_cache`` entram no resumo com o seu tamanho estimado e os seus
+    acertos e faltas.
+    """
     
-    def __init__(self):
+    def __init__(self, trace_allocations: bool = False):
         self.start_time = time.time()
         self.operation_count = 0
         self.total_execution_time = 0.0
         self.peak_memory_usage = 0.0
         self.performance_log: List[PerformanceMetrics] = []
+        self.caches: Dict[str, object] = {}
+        # Por nome de operação, em bytes: maior RSS nos extremos, pico de
+        # alocações do Python e maior crescimento de memória durante ela.
+        self.operation_peaks: Dict[str, Dict[str, int]] = {}
+        self._operation_name = 'operation'
+        self._start_rss = 0
+        self._start_hwm = 0
+        self._start_traced = 0
+        self._started_tracing = False
+        if trace_allocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+
+    def register_cache(self, name: str, cache: object):
+        """Inclui um cache nas estimativas de memória e na contagem de acertos."""
+        self.caches[name] = cache
+
+    def cache_sizes(self) -> Dict[str, int]:
+        """Bytes estimados de cada cache registrado."""
+        return {name: estimate_bytes(cache) for name, cache in self.caches.items()}
+
+    def _cache_counters(self) -> Tuple[int, int]:
+        hits = misses = 0
+        for cache in self.caches.values():
+            hits += getattr(cache, 'hits', 0)
+            misses += getattr(cache, 'misses', 0)
+        return hits, misses
         
-    def start_operation(self):
+    def start_operation(self, name: str = 'operation'):
         """Marca o início de uma operação."""
+        self._operation_name = name
+        sample = sample_memory(uss=False)
+        self._start_rss = sample.rss or 0
+        self._start_hwm = sample.peak_rss or 0
+        self._start_traced = sample.traced or 0
+        if tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
         self.start_time = time.time()
         
     def end_operation(self):
@@ -148,27 +222,50 @@ class PerformanceMonitor:
         self.operation_count += 1
         self.total_execution_time += execution_time
         
+        sample = sample_memory(uss=False)
+        rss = sample.rss or 0
+        hits, misses = self._cache_counters()
+        
         # Registra métricas
         metrics = PerformanceMetrics(
             operation_time=execution_time,
-            memory_usage=self._get_current_memory_usage(),
-            cache_hits=0,  # TODO: Implementar contagem real
-            cache_misses=0,  # TODO: Implementar contagem real
+            memory_usage=float(rss),
+            cache_hits=hits,
+            cache_misses=misses,
             parallelization_overhead=0.0,  # TODO: Implementar medição real
             total_operations=self.operation_count
         )
         
         self.performance_log.append(metrics)
         self._update_peak_memory_usage(metrics.memory_usage)
+
+        # Sem amostragem contínua, o RSS da operação é o maior dos extremos.
+        peaks = self.operation_peaks.setdefault(self._operation_name,
+                                                {'rss_bytes': 0, 'traced_bytes': 0,
+                                                 'growth_bytes': 0})
+        peaks['rss_bytes'] = max(peaks['rss_bytes'], rss, self._start_rss)
+        if sample.traced_peak is not None:
+            peaks['traced_bytes'] = max(peaks['traced_bytes'], sample.traced_peak)
+            # O pico do tracemalloc foi zerado no início: mede o que a operação alocou.
+            growth = sample.traced_peak - self._start_traced
+        else:
+            # Sem tracemalloc: o quanto o pico do processo (VmHWM) subiu ou o RSS cresceu.
+            growth = max((sample.peak_rss or 0) - self._start_hwm, rss - self._start_rss)
+        peaks['growth_bytes'] = max(peaks['growth_bytes'], growth)
         
     def _get_current_memory_usage(self) -> float:
-        """Retorna o uso atual de memória."""
-        # TODO: Implementar medição real de memória
-        return 0.0
+        """Retorna o uso atual de memória: RSS do processo, em bytes."""
+        return float(sample_memory(uss=False).rss or 0)
         
     def _update_peak_memory_usage(self, current_usage: float):
         """Atualiza o registro de pico de uso de memória."""
         self.peak_memory_usage = max(self.peak_memory_usage, current_usage)
+
+    def stop_tracing(self):
+        """Desliga o tracemalloc, se foi este monitor que o ligou."""
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
         
     def get_performance_summary(self) -> dict:
         """Retorna um resumo das métricas de performance."""
@@ -181,6 +278,8 @@ class PerformanceMonitor:
             self.total_execution_time / self.operation_count
             if self.operation_count > 0 else 0
         )
+        sample = sample_memory()
+        hits, misses = self._cache_counters()
         
         return {
             "total_operations": self.operation_count,
@@ -190,7 +289,18 @@ class PerformanceMonitor:
             "operations_per_second": (
                 self.operation_count / self.total_execution_time
                 if self.total_execution_time > 0 else 0
-            )
+            ),
+            "memory": {
+                "rss_bytes": sample.rss,
+                "uss_bytes": sample.uss,
+                "peak_rss_bytes": sample.peak_rss,
+                "traced_bytes": sample.traced,
+                "traced_peak_bytes": sample.traced_peak,
+            },
+            "cache_bytes": self.cache_sizes(),
+            "cache_hits": hits,
+            "cache_misses": misses,
+            "operation_peaks": {name: dict(peaks) for name, peaks in self.operation_peaks.items()},
         }
         
     def log_performance_issue(self, issue_type: str, details: str):
@@ -209,14 +319,15 @@ class PerformanceMonitor:
                     "Consider increasing parallelization for compute-intensive operations"
                 )
                 
-            high_memory_ops = [
-                m for m in self.performance_log
-                if m.memory_usage > self.peak_memory_usage * 0.8
-            ]
+            high_memory_ops = sorted(
+                name for name, peaks in self.operation_peaks.items()
+                if peaks['growth_bytes'] >= HIGH_MEMORY_GROWTH
+            )
             
             if high_memory_ops:
                 suggestions.append(
-                    "Implement memory optimization for operations with high memory usage"
+                    "Implement memory optimization for operations with high memory usage: "
+                    + ", ".join(high_memory_ops)
                 )
                 
             if any(m.cache_misses > m.cache_hits for m in self.performance_log):
@@ -0,0 +1,241 @@
+import pickle
+
+import chess
+import pytest
+from core.board.board import Board, Color, PieceType, Piece
+from src.core.board import PieceSquareTable
+
+
+@pytest.fixture
+def board():
+    return Board()
+
+
+def test_shadow_board_is_persistent(board):
+    """O tabuleiro python-chess é reutilizado entre jogadas."""
+    shadow = board._chess_board()
+    assert board.move_piece("e2", "e4")["success"]
+    assert board.move_piece("e7", "e5")["success"]
+    assert board._chess_board() is shadow
+    assert len(shadow.move_stack) == 2
+
+
+def test_pieces_view_follows_moves(board):
+    """A visão ``pieces`` acompanha jogadas, roques e capturas."""
+    for from_pos, to_pos in [("e2", "e4"), ("d7", "d5"), ("e4", "d5"), ("g8", "f6"),
+                             ("g1", "f3"), ("f6", "d5"), ("f1", "c4"), ("c8", "g4")]:
+        assert board.move_piece(from_pos, to_pos)["success"], (from_pos, to_pos)
+    assert board.move_piece("e1", "g1")["success"]
+
+    assert board.pieces["g1"] == Piece(PieceType.KING, Color.WHITE)
+    assert board.pieces["f1"] == Piece(PieceType.ROOK, Color.WHITE)
+    assert "e1" not in board.pieces and "h1" not in board.pieces
+    assert board.captured_pieces == [Piece(PieceType.PAWN, Color.BLACK), Piece(PieceType.PAWN, Color.WHITE)]
+    assert board.current_turn == Color.BLACK
+
+
+def test_hand_edits_invalidate_status(board):
+    """Editar ``pieces`` à mão invalida o estado em cache."""
+    assert not board.is_in_check()
+    board.pieces.clear()
+    board.pieces["e1"] = Piece(PieceType.KING, Color.WHITE)
+    board.pieces["e8"] = Piece(PieceType.ROOK, Color.BLACK)
+    board.pieces["a8"] = Piece(PieceType.KING, Color.BLACK)
+    assert board.is_in_check()
+
+    del board.pieces["e8"]
+    assert not board.is_in_check()
+
+
+def test_hand_edits_after_moves(board):
+    """Edições feitas depois de jogadas partem da posição atual."""
+    assert board.move_piece("e2", "e4")["success"]
+    board.pieces["e2"] = Piece(PieceType.QUEEN, Color.WHITE)
+    assert board.pieces["e4"] == Piece(PieceType.PAWN, Color.WHITE)
+    assert str(board._chess_board().piece_at(12)) == "Q"
+
+
+def test_pop_after_hand_edit(board):
+    """``pop`` depois de uma edição à mão não desfaz a posição editada."""
+    assert board.move_piece("e2", "e4")["success"]
+    board.pieces["e2"] = Piece(PieceType.QUEEN, Color.WHITE)
+    with pytest.raises(IndexError):
+        board.pop()
+    assert board.pieces["e2"] == Piece(PieceType.QUEEN, Color.WHITE)
+    assert board.move_piece("e7", "e5")["success"]
+    assert board.pop() == chess.Move.from_uci("e7e5")
+    assert board.pieces["e2"] == Piece(PieceType.QUEEN, Color.WHITE)
+    assert board.zobrist_key == Board.from_fen(board.to_fen()).zobrist_key
+
+
+def test_legal_moves_cached_per_position(board):
+    """Os lances legais são calculados uma vez por posição."""
+    first = board.legal_moves()
+    assert len(first) == 20
+    assert board.legal_moves() is first
+    board.move_piece("g1", "f3")
+    assert board.legal_moves() is not first
+
+
+def test_board_pickles(board):
+    """O tabuleiro sobrevive a pickle com a visão reconstruída."""
+    board.move_piece("e2", "e4")
+    clone = pickle.loads(pickle.dumps(board))
+    assert clone.pieces == board.pieces
+    assert clone.current_turn == Color.BLACK
+    clone.pieces["e4"] = Piece(PieceType.KNIGHT, Color.WHITE)
+    assert board.pieces["e4"].type == PieceType.PAWN
+    assert clone._chess_board().piece_at(28).piece_type == PieceType.KNIGHT.value
+
+
+def test_fen_round_trip():
+    """``to_fen``/``from_fen`` preservam roque, en passant e relógios."""
+    fen = "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1"
+    board = Board.from_fen(fen)
+    assert board.to_fen() == fen
+    assert board.castling_rights == chess.BB_A1 | chess.BB_H1 | chess.BB_A8 | chess.BB_H8
+
+
+def test_from_fen_rejects_garbage():
+    with pytest.raises(ValueError):
+        Board.from_fen("not a fen")
+
+
+def test_state_updated_by_move_piece(board):
+    """Roque, en passant e relógios são atualizados a cada jogada."""
+    assert board.to_fen() == chess.STARTING_FEN
+    board.move_piece("e2", "e4")
+    assert board.ep_square == chess.E3
+    assert board.halfmove_clock == 0 and board.fullmove_number == 1
+    board.move_piece("g8", "f6")
+    assert board.ep_square is None
+    assert board.halfmove_clock == 1 and board.fullmove_number == 2
+    board.move_piece("e1", "e2")
+    assert board.castling_rights == chess.BB_A8 | chess.BB_H8
+    assert board.to_fen() == "rnbqkb1r/pppppppp/5n2/8/4P3/8/PPPPKPPP/RNBQ1BNR b kq - 2 2"
+
+
+def test_lost_castling_rights_survive_hand_edits(board):
+    """Edições manuais não devolvem direitos de roque já perdidos."""
+    for from_pos, to_pos in [("e2", "e4"), ("e7", "e5"), ("e1", "e2"), ("e8", "e7"),
+                             ("e2", "e1"), ("e7", "e8")]:
+        assert board.move_piece(from_pos, to_pos)["success"]
+    for pos in ("f1", "g1"):
+        del board.pieces[pos]
+    assert board.castling_rights == 0
+    assert not board.move_piece("e1", "g1")["success"]
+
+
+@pytest.mark.parametrize("fen, uci", [
+    ("r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1", "e1g1"),
+    ("r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1", "e5f7"),
+    ("r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1", "a1b1"),
+    ("rnbqkbnr/ppp1p1pp/8/3pPp2/8/8/PPPP1PPP/RNBQKBNR w KQkq f6 0 3", "e5f6"),
+    ("n1n5/PPPk4/8/8/8/8/4Kppp/5N1N b - - 0 1", "g2h1q"),
+])
+def test_push_pop_restores_exact_state(fen, uci):
+    """``pop`` desfaz capturas, roques, en passant e promoções."""
+    board = Board.from_fen(fen)
+    pieces = dict(board.pieces)
+    board.push(uci)
+    assert board.to_fen() != fen
+    assert board.pop() == chess.Move.from_uci(uci)
+    assert board._chess_board().fen(en_passant="fen") == fen
+    assert board.pieces == pieces
+    assert board.captured_pieces == [] and board.move_history == []
+
+
+def test_push_records_history(board):
+    """``push`` mantém histórico, capturas e último lance como ``move_piece``."""
+    for uci in ("e2e4", "d7d5", "e4d5"):
+        board.push(uci)
+    assert board.move_history == [("e2", "e4"), ("d7", "d5"), ("e4", "d5")]
+    assert board.captured_pieces == [Piece(PieceType.PAWN, Color.BLACK)]
+    board.pop()
+    assert board.last_move == ("d7", "d5")
+    assert board.ep_square == chess.D6
+    assert board.captured_pieces == []
+
+
+def test_pop_without_moves(board):
+    with pytest.raises(IndexError):
+        board.pop()
+
+
+def test_zobrist_key_matches_polyglot_along_game():
+    """A chave incremental coincide com a Polyglot a cada lance e volta no ``pop``."""
+    import chess.polyglot
+
+    board = Board.from_fen("r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1")
+    keys = [board.zobrist_key]
+    for uci in ("e1g1", "h3g2", "a2a4", "b4a3", "e5f7", "g2f1q", "g1f1", "e8c8", "d5e6"):
+        board.push(uci)
+        assert board.zobrist_key == chess.polyglot.zobrist_hash(board._chess_board()), uci
+        keys.append(board.zobrist_key)
+    assert len(set(keys)) == len(keys)
+    while len(keys) > 1:
+        board.pop()
+        keys.pop()
+        assert board.zobrist_key == keys[-1]
+
+
+def test_pawn_key_changes_only_on_pawn_moves():
+    """A chave de peões acompanha lances de peão, capturas en passant e promoções."""
+    from src.core.board.zobrist import pawn_hash
+
+    board = Board.from_fen("r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1")
+    keys = [board.pawn_key]
+    for uci in ("e1g1", "h3g2", "a2a4", "b4a3", "e5f7", "g2f1q", "g1f1", "e8c8", "d5e6"):
+        board.push(uci)
+        assert board.pawn_key == pawn_hash(board._chess_board()), uci
+        keys.append(board.pawn_key)
+    # Os roques e a captura da dama promovida não mexem nos peões; o cavalo que toma f7, sim.
+    assert keys[1] == keys[0] and keys[6] == keys[7] == keys[8] and keys[5] != keys[4]
+    while len(keys) > 1:
+        board.pop()
+        keys.pop()
+        assert board.pawn_key == keys[-1]
+    board.pieces["e4"] = Piece(PieceType.PAWN, Color.BLACK)
+    assert board.pawn_key == pawn_hash(board._chess_board())
+
+
+def test_zobrist_key_follows_hand_edits(board):
+    start = board.zobrist_key
+    board.current_turn = Color.BLACK
+    assert board.zobrist_key != start
+    board.current_turn = Color.WHITE
+    assert board.zobrist_key == start
+    board.pieces["e4"] = Piece(PieceType.KNIGHT, Color.WHITE)
+    assert board.zobrist_key != start
+
+
+def test_repetition_detection(board):
+    for _ in range(2):
+        for uci in ("g1f3", "g8f6", "f3g1", "f6g8"):
+            assert not board.is_repetition()
+            board.push(uci)
+    assert board.is_repetition()
+    assert not board.is_repetition(4)
+    board.pop()
+    assert board.is_repetition(2)
+
+
+def test_piece_square_totals_follow_push_pop():
+    """As somas por cor acompanham roques, en passant e promoções, e voltam no ``pop``."""
+    values = [[[0] * 64] + [[color * 1000 + piece_type * 100 + square for square in range(64)]
+                            for piece_type in chess.PIECE_TYPES] for color in (0, 1)]
+    table = PieceSquareTable(values)
+    board = Board.from_fen("r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1")
+    history = [board.piece_square_totals(table)]
+    for uci in ("e1g1", "h3g2", "a2a4", "b4a3", "e5f7", "g2f1q", "g1f1", "e8c8", "d5e6"):
+        board.push(uci)
+        fresh = table.totals(board._chess_board())
+        assert board.piece_square_totals(table) == (fresh[chess.WHITE], fresh[chess.BLACK]), uci
+        history.append(board.piece_square_totals(table))
+    while len(history) > 1:
+        board.pop()
+        history.pop()
+        assert board.piece_square_totals(table) == history[-1]
+
+    board.pieces["d4"] = Piece(PieceType.QUEEN, Color.WHITE)
+    assert board.piece_square_totals(table)[0] == history[0][0] + 1500 + chess.D4
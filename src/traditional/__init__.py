@@ -9,7 +9,9 @@ from .movements import (
     get_bishop_moves,
     get_queen_moves,
     get_king_moves,
-    get_all_possible_moves
+    get_all_possible_moves,
+    generate_legal_moves,
+    is_square_attacked
 )
 from .rules import (
     is_check,
@@ -27,6 +29,8 @@ __all__ = [
     'get_queen_moves',
     'get_king_moves',
     'get_all_possible_moves',
+    'generate_legal_moves',
+    'is_square_attacked',
     'is_check',
     'is_checkmate',
     'is_stalemate',
@@ -0,0 +1,162 @@
+"""
+Bitboards e tabelas de ataque pré-calculadas para a geração de movimentos.
+
+As casas seguem a numeração do python-chess (a1 = 0, h8 = 63). Cavalo, rei
+e peão usam tabelas por casa. Peças deslizantes usam tabelas indexadas pela
+ocupação mascarada de cada linha (fileira, coluna e as duas diagonais), no
+estilo das "magic bitboards": o dicionário faz o papel da multiplicação
+mágica e cada consulta custa uma operação AND e um acesso.
+"""
+
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+BB_EMPTY = 0
+BB_ALL = (1 << 64) - 1
+BB_SQUARES = [1 << square for square in range(64)]
+
+BB_RANK_1 = 0x00000000000000FF
+BB_RANK_2 = BB_RANK_1 << 8
+BB_RANK_4 = BB_RANK_1 << 24
+BB_RANK_5 = BB_RANK_1 << 32
+BB_RANK_7 = BB_RANK_1 << 48
+BB_RANK_8 = BB_RANK_1 << 56
+BB_BACKRANKS = BB_RANK_1 | BB_RANK_8
+
+Delta = Tuple[int, int]
+
+
+def square_index(row: int, col: int) -> int:
+    """Converte (linha, coluna), com a linha 0 na oitava fileira, em índice de casa."""
+    return (7 - row) * 8 + col
+
+
+def square_position(square: int) -> Tuple[int, int]:
+    """Converte um índice de casa em (linha, coluna)."""
+    return 7 - (square >> 3), square & 7
+
+
+if hasattr(int, "bit_count"):  # Python 3.10+
+    popcount = int.bit_count
+else:
+    def popcount(bb: int) -> int:
+        return bin(bb).count("1")
+
+
+def lsb(bb: int) -> int:
+    return (bb & -bb).bit_length() - 1
+
+
+def scan(bb: int) -> Iterator[int]:
+    """Itera pelos índices das casas marcadas, do menor para o maior."""
+    while bb:
+        low = bb & -bb
+        yield low.bit_length() - 1
+        bb ^= low
+
+
+def _ray(square: int, delta: Delta, occupied: int = BB_EMPTY) -> List[int]:
+    """Casas a partir de ``square`` na direção dada, parando no primeiro bloqueio."""
+    rank, file = divmod(square, 8)
+    d_rank, d_file = delta
+    squares = []
+    rank, file = rank + d_rank, file + d_file
+    while 0 <= rank < 8 and 0 <= file < 8:
+        target = rank * 8 + file
+        squares.append(target)
+        if occupied & BB_SQUARES[target]:
+            break
+        rank, file = rank + d_rank, file + d_file
+    return squares
+
+
+def _step_attacks(deltas: Sequence[Delta]) -> List[int]:
+    table = []
+    for square in range(64):
+        bb = BB_EMPTY
+        for delta in deltas:
+            for target in _ray(square, delta)[:1]:
+                bb |= BB_SQUARES[target]
+        table.append(bb)
+    return table
+
+
+def _line_attacks(deltas: Sequence[Delta]) -> Tuple[List[int], List[Dict[int, int]]]:
+    """Máscaras de bloqueio e tabela de ataques por ocupação para uma linha."""
+    masks = []
+    tables = []
+    for square in range(64):
+        # A última casa de cada raio nunca bloqueia nada além dela mesma.
+        mask = BB_EMPTY
+        for delta in deltas:
+            for target in _ray(square, delta)[:-1]:
+                mask |= BB_SQUARES[target]
+        table = {}
+        subset = BB_EMPTY
+        while True:
+            attacks = BB_EMPTY
+            for delta in deltas:
+                for target in _ray(square, delta, subset):
+                    attacks |= BB_SQUARES[target]
+            table[subset] = attacks
+            subset = (subset - mask) & mask
+            if not subset:
+                break
+        masks.append(mask)
+        tables.append(table)
+    return masks, tables
+
+
+KNIGHT_ATTACKS = _step_attacks([(2, 1), (2, -1), (1, 2), (1, -2), (-1, 2), (-1, -2), (-2, 1), (-2, -1)])
+KING_ATTACKS = _step_attacks([(1, 1), (1, 0), (1, -1), (0, 1), (0, -1), (-1, 1), (-1, 0), (-1, -1)])
+# Indexado pela cor do python-chess: PAWN_ATTACKS[True] são os ataques das brancas.
+PAWN_ATTACKS = (_step_attacks([(-1, 1), (-1, -1)]), _step_attacks([(1, 1), (1, -1)]))
+
+RANK_MASKS, RANK_ATTACKS = _line_attacks([(0, 1), (0, -1)])
+FILE_MASKS, FILE_ATTACKS = _line_attacks([(1, 0), (-1, 0)])
+DIAG_MASKS, DIAG_ATTACKS = _line_attacks([(1, 1), (-1, -1)])
+ANTI_MASKS, ANTI_ATTACKS = _line_attacks([(1, -1), (-1, 1)])
+
+ROOK_RAYS = [RANK_ATTACKS[sq][0] | FILE_ATTACKS[sq][0] for sq in range(64)]
+BISHOP_RAYS = [DIAG_ATTACKS[sq][0] | ANTI_ATTACKS[sq][0] for sq in range(64)]
+
+
+def _between_table() -> List[List[int]]:
+    table = [[BB_EMPTY] * 64 for _ in range(64)]
+    for square in range(64):
+        for delta in [(1, 1), (1, 0), (1, -1), (0, 1), (0, -1), (-1, 1), (-1, 0), (-1, -1)]:
+            between = BB_EMPTY
+            for target in _ray(square, delta):
+                table[square][target] = between
+                between |= BB_SQUARES[target]
+    return table
+
+
+# BETWEEN[a][b]: casas estritamente entre a e b, ou vazio se não alinhadas.
+BETWEEN = _between_table()
+
+
+def rook_attacks(square: int, occupied: int) -> int:
+    return (RANK_ATTACKS[square][occupied & RANK_MASKS[square]]
+            | FILE_ATTACKS[square][occupied & FILE_MASKS[square]])
+
+
+def bishop_attacks(square: int, occupied: int) -> int:
+    return (DIAG_ATTACKS[square][occupied & DIAG_MASKS[square]]
+            | ANTI_ATTACKS[square][occupied & ANTI_MASKS[square]])
+
+
+def queen_attacks(square: int, occupied: int) -> int:
+    return rook_attacks(square, occupied) | bishop_attacks(square, occupied)
+
+
+def attackers_mask(square: int, by_white: bool, occupied: int, enemy: int,
+                   pawns: int, knights: int, bishops: int, rooks: int,
+                   queens: int, kings: int) -> int:
+    """Peças de ``enemy`` (da cor ``by_white``) que atacam ``square`` dada a ocupação."""
+    return enemy & (
+        (KNIGHT_ATTACKS[square] & knights)
+        | (KING_ATTACKS[square] & kings)
+        | (PAWN_ATTACKS[not by_white][square] & pawns)
+        | (rook_attacks(square, occupied) & (rooks | queens))
+        | (bishop_attacks(square, occupied) & (bishops | queens))
+    )
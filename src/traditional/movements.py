@@ -1,158 +1,242 @@
 """
 Implementação dos movimentos tradicionais das peças de xadrez.
+
+A geração trabalha sobre bitboards (ver ``bitboards.py``): cada peça consulta
+tabelas de ataque pré-calculadas em vez de percorrer casa a casa. As funções
+``get_*_moves`` mantêm a interface em (linha, coluna), com a linha 0 na
+oitava fileira, e devolvem movimentos pseudo-legais; ``generate_legal_moves``
+devolve os lances legais completos (roque, en passant e promoções) como
+``chess.Move``.
 """
 
-from typing import List, Tuple
+from typing import List, Optional, Tuple
+
+import chess
+
 from ..core.board import Board, Color, Piece, PieceType
+from .bitboards import (
+    BB_ALL,
+    BB_BACKRANKS,
+    BB_RANK_2,
+    BB_RANK_7,
+    BB_SQUARES,
+    BETWEEN,
+    BISHOP_RAYS,
+    KING_ATTACKS,
+    KNIGHT_ATTACKS,
+    PAWN_ATTACKS,
+    ROOK_RAYS,
+    attackers_mask,
+    bishop_attacks,
+    lsb,
+    queen_attacks,
+    rook_attacks,
+    scan,
+    square_index,
+    square_position,
+)
 
-def get_pawn_moves(board: Board, pos: Tuple[int, int]) -> List[Tuple[int, int]]:
-    """Retorna os movimentos possíveis para um peão."""
-    row, col = pos
-    piece = board.get_piece(row, col)
-    if piece is None or piece.type != PieceType.PAWN:
+PROMOTIONS = (chess.QUEEN, chess.ROOK, chess.BISHOP, chess.KNIGHT)
+
+# (casa do rei, casa da torre, destino do rei, casas que o rei atravessa)
+CASTLING_PATHS = {
+    chess.WHITE: [(chess.E1, chess.H1, chess.G1, BB_SQUARES[chess.F1] | BB_SQUARES[chess.G1]),
+                  (chess.E1, chess.A1, chess.C1, BB_SQUARES[chess.D1] | BB_SQUARES[chess.C1])],
+    chess.BLACK: [(chess.E8, chess.H8, chess.G8, BB_SQUARES[chess.F8] | BB_SQUARES[chess.G8]),
+                  (chess.E8, chess.A8, chess.C8, BB_SQUARES[chess.D8] | BB_SQUARES[chess.C8])],
+}
+
+
+def _to_positions(targets: int) -> List[Tuple[int, int]]:
+    return [square_position(square) for square in scan(targets)]
+
+
+def _ep_square(board: Board, white: bool) -> Optional[int]:
+    """Casa de en passant, se for a vez de ``white`` jogar."""
+    if (board.current_turn == Color.WHITE) != white:
+        return None
+    return board.ep_square
+
+
+def _pawn_targets(square: int, white: bool, own: int, enemy: int, ep_mask: int) -> int:
+    occupied = own | enemy
+    if white:
+        single = BB_SQUARES[square] << 8 & ~occupied
+        double = (single & (BB_RANK_2 << 8)) << 8 & ~occupied
+    else:
+        single = BB_SQUARES[square] >> 8 & ~occupied
+        double = (single & (BB_RANK_7 >> 8)) >> 8 & ~occupied
+    return single | double | (PAWN_ATTACKS[white][square] & (enemy | ep_mask))
+
+
+def _castling_candidates(board: Board, king: int, white: bool, own_rooks: int, occupied: int):
+    """Roques com direito, torre no lugar e caminho livre (sem testar ataques)."""
+    rights = board.castling_rights
+    for king_square, rook_square, target, path in CASTLING_PATHS[white]:
+        if (king == king_square and rights & own_rooks & BB_SQUARES[rook_square]
+                and not BETWEEN[king][rook_square] & occupied):
+            yield target, path
+
+
+def _targets(board: Board, pos: Tuple[int, int], piece_type: PieceType) -> List[Tuple[int, int]]:
+    """Destinos pseudo-legais da peça em ``pos`` se ela for do tipo pedido."""
+    piece = board.get_piece(*pos)
+    if piece is None or piece.type != piece_type:
         return []
+    square = square_index(*pos)
+    white = piece.color == Color.WHITE
+    bbs = board.bitboards()
+    own, enemy = (bbs.white, bbs.black) if white else (bbs.black, bbs.white)
+    occupied = own | enemy
+    if piece_type == PieceType.PAWN:
+        ep_square = _ep_square(board, white)
+        ep_mask = BB_SQUARES[ep_square] if ep_square is not None else 0
+        return _to_positions(_pawn_targets(square, white, own, enemy, ep_mask))
+    if piece_type == PieceType.KNIGHT:
+        targets = KNIGHT_ATTACKS[square]
+    elif piece_type == PieceType.BISHOP:
+        targets = bishop_attacks(square, occupied)
+    elif piece_type == PieceType.ROOK:
+        targets = rook_attacks(square, occupied)
+    elif piece_type == PieceType.QUEEN:
+        targets = queen_attacks(square, occupied)
+    else:
+        targets = KING_ATTACKS[square]
+        for target, _ in _castling_candidates(board, square, white, bbs.rooks & own, occupied):
+            targets |= BB_SQUARES[target]
+    return _to_positions(targets & ~own)
 
-    moves = []
-    direction = -1 if piece.color == Color.WHITE else 1
-    
-    # Movimento básico para frente
-    next_row = row + direction
-    if board.is_valid_position(next_row, col) and board.get_piece(next_row, col) is None:
-        moves.append((next_row, col))
-        
-        # Movimento duplo inicial
-        if ((piece.color == Color.WHITE and row == 6) or 
-            (piece.color == Color.BLACK and row == 1)):
-            next_row = row + 2 * direction
-            if board.get_piece(next_row, col) is None:
-                moves.append((next_row, col))
-    
-    # Capturas diagonais
-    for col_offset in [-1, 1]:
-        capture_col = col + col_offset
-        if board.is_valid_position(next_row, capture_col):
-            target = board.get_piece(next_row, capture_col)
-            if target is not None and target.color != piece.color:
-                moves.append((next_row, capture_col))
-    
-    return moves
+def get_pawn_moves(board: Board, pos: Tuple[int, int]) -> List[Tuple[int, int]]:
+    """Retorna os movimentos possíveis para um peão, incluindo en passant."""
+    return _targets(board, pos, PieceType.PAWN)
 
 def get_rook_moves(board: Board, pos: Tuple[int, int]) -> List[Tuple[int, int]]:
     """Retorna os movimentos possíveis para uma torre."""
-    row, col = pos
-    piece = board.get_piece(row, col)
-    if piece is None or piece.type != PieceType.ROOK:
-        return []
-
-    moves = []
-    directions = [(0, 1), (0, -1), (1, 0), (-1, 0)]  # Direções: direita, esquerda, baixo, cima
-    
-    for row_dir, col_dir in directions:
-        current_row, current_col = row + row_dir, col + col_dir
-        while board.is_valid_position(current_row, current_col):
-            target = board.get_piece(current_row, current_col)
-            if target is None:
-                moves.append((current_row, current_col))
-            else:
-                if target.color != piece.color:
-                    moves.append((current_row, current_col))
-                break
-            current_row += row_dir
-            current_col += col_dir
-    
-    return moves
+    return _targets(board, pos, PieceType.ROOK)
 
 def get_knight_moves(board: Board, pos: Tuple[int, int]) -> List[Tuple[int, int]]:
     """Retorna os movimentos possíveis para um cavalo."""
-    row, col = pos
-    piece = board.get_piece(row, col)
-    if piece is None or piece.type != PieceType.KNIGHT:
-        return []
-
-    moves = []
-    offsets = [
-        (-2, -1), (-2, 1),  # Movimentos em L para cima
-        (-1, -2), (-1, 2),  # Movimentos em L para os lados (cima)
-        (1, -2), (1, 2),    # Movimentos em L para os lados (baixo)
-        (2, -1), (2, 1)     # Movimentos em L para baixo
-    ]
-    
-    for row_offset, col_offset in offsets:
-        new_row, new_col = row + row_offset, col + col_offset
-        if board.is_valid_position(new_row, new_col):
-            target = board.get_piece(new_row, new_col)
-            if target is None or target.color != piece.color:
-                moves.append((new_row, new_col))
-    
-    return moves
+    return _targets(board, pos, PieceType.KNIGHT)
 
 def get_bishop_moves(board: Board, pos: Tuple[int, int]) -> List[Tuple[int, int]]:
     """Retorna os movimentos possíveis para um bispo."""
-    row, col = pos
-    piece = board.get_piece(row, col)
-    if piece is None or piece.type != PieceType.BISHOP:
-        return []
-
-    moves = []
-    directions = [(1, 1), (1, -1), (-1, 1), (-1, -1)]  # Direções diagonais
-    
-    for row_dir, col_dir in directions:
-        current_row, current_col = row + row_dir, col + col_dir
-        while board.is_valid_position(current_row, current_col):
-            target = board.get_piece(current_row, current_col)
-            if target is None:
-                moves.append((current_row, current_col))
-            else:
-                if target.color != piece.color:
-                    moves.append((current_row, current_col))
-                break
-            current_row += row_dir
-            current_col += col_dir
-    
-    return moves
+    return _targets(board, pos, PieceType.BISHOP)
 
 def get_queen_moves(board: Board, pos: Tuple[int, int]) -> List[Tuple[int, int]]:
     """Retorna os movimentos possíveis para uma rainha."""
-    # A rainha combina os movimentos da torre e do bispo
-    return get_rook_moves(board, pos) + get_bishop_moves(board, pos)
+    return _targets(board, pos, PieceType.QUEEN)
 
 def get_king_moves(board: Board, pos: Tuple[int, int]) -> List[Tuple[int, int]]:
-    """Retorna os movimentos possíveis para um rei."""
-    row, col = pos
-    piece = board.get_piece(row, col)
-    if piece is None or piece.type != PieceType.KING:
-        return []
-
-    moves = []
-    directions = [
-        (-1, -1), (-1, 0), (-1, 1),
-        (0, -1),           (0, 1),
-        (1, -1),  (1, 0),  (1, 1)
-    ]
-    
-    for row_offset, col_offset in directions:
-        new_row, new_col = row + row_offset, col + col_offset
-        if board.is_valid_position(new_row, new_col):
-            target = board.get_piece(new_row, new_col)
-            if target is None or target.color != piece.color:
-                moves.append((new_row, new_col))
-    
-    # TODO: Implementar roque (castling)
-    return moves
+    """Retorna os movimentos possíveis para um rei, incluindo roques com caminho livre."""
+    return _targets(board, pos, PieceType.KING)
 
 def get_all_possible_moves(board: Board, pos: Tuple[int, int]) -> List[Tuple[int, int]]:
     """Retorna todos os movimentos possíveis para uma peça na posição dada."""
     piece = board.get_piece(*pos)
     if piece is None:
         return []
-        
-    move_functions = {
-        PieceType.PAWN: get_pawn_moves,
-        PieceType.ROOK: get_rook_moves,
-        PieceType.KNIGHT: get_knight_moves,
-        PieceType.BISHOP: get_bishop_moves,
-        PieceType.QUEEN: get_queen_moves,
-        PieceType.KING: get_king_moves
-    }
-    
-    return move_functions[piece.type](board, pos)
+    return _targets(board, pos, piece.type)
+
+def is_square_attacked(board: Board, pos: Tuple[int, int], by_color: Color) -> bool:
+    """Verifica se a casa em ``pos`` é atacada por alguma peça de ``by_color``."""
+    bbs = board.bitboards()
+    white = by_color == Color.WHITE
+    enemy = bbs.white if white else bbs.black
+    return bool(attackers_mask(square_index(*pos), white, bbs.white | bbs.black, enemy,
+                               bbs.pawns, bbs.knights, bbs.bishops, bbs.rooks,
+                               bbs.queens, bbs.kings))
+
+def generate_legal_moves(board: Board, color: Optional[Color] = None) -> List[chess.Move]:
+    """Gera todos os lances legais de ``color`` (por padrão, o lado a jogar)."""
+    white = (board.current_turn if color is None else color) == Color.WHITE
+    return _generate_legal_moves(board, white, BB_ALL)
+
+def _generate_legal_moves(board: Board, white: bool, from_mask: int) -> List[chess.Move]:
+    """
+    Gera os lances legais das peças de ``white`` que estão em ``from_mask``.
+
+    Fora de xeque, só os lances do rei, o en passant e as peças cravadas
+    precisam do teste de ataque ao rei; em xeque simples os destinos ficam
+    restritos a capturar o atacante ou bloquear a linha dele.
+    """
+    bbs = board.bitboards()
+    pawns, knights, bishops, rooks, queens, kings = (
+        bbs.pawns, bbs.knights, bbs.bishops, bbs.rooks, bbs.queens, bbs.kings
+    )
+    own, enemy = (bbs.white, bbs.black) if white else (bbs.black, bbs.white)
+    occupied = own | enemy
+    own_kings = kings & own
+    if not own_kings:
+        return []
+    king = lsb(own_kings)
+    mine = own & from_mask
+
+    checkers = attackers_mask(king, not white, occupied, enemy,
+                              pawns, knights, bishops, rooks, queens, kings)
+    if not checkers:
+        targets_mask = ~own
+    elif checkers & (checkers - 1):
+        targets_mask = 0
+    else:
+        targets_mask = ~own & (checkers | BETWEEN[king][lsb(checkers)])
+
+    pinned = 0
+    snipers = enemy & ((ROOK_RAYS[king] & (rooks | queens))
+                       | (BISHOP_RAYS[king] & (bishops | queens)))
+    for sniper in scan(snipers):
+        blockers = BETWEEN[king][sniper] & occupied
+        if blockers and not blockers & (blockers - 1) and blockers & own:
+            pinned |= blockers
+
+    def king_safe(from_square: int, to_square: int, captured: int) -> bool:
+        after = (occupied & ~BB_SQUARES[from_square] & ~captured) | BB_SQUARES[to_square]
+        target = to_square if from_square == king else king
+        return not attackers_mask(target, not white, after, enemy & ~captured,
+                                  pawns, knights, bishops, rooks, queens, kings)
+
+    moves: List[chess.Move] = []
+    Move = chess.Move
+
+    if targets_mask:
+        for square in scan(mine & pawns):
+            targets = _pawn_targets(square, white, own, enemy, 0) & targets_mask
+            is_pinned = BB_SQUARES[square] & pinned
+            for to_square in scan(targets):
+                if is_pinned and not king_safe(square, to_square, BB_SQUARES[to_square]):
+                    continue
+                if BB_SQUARES[to_square] & BB_BACKRANKS:
+                    for promotion in PROMOTIONS:
+                        moves.append(Move(square, to_square, promotion))
+                else:
+                    moves.append(Move(square, to_square))
+        for pieces, attacks in ((knights, None), (bishops, bishop_attacks),
+                                (rooks, rook_attacks), (queens, queen_attacks)):
+            for square in scan(mine & pieces):
+                targets = (attacks(square, occupied) if attacks else KNIGHT_ATTACKS[square]) & targets_mask
+                if BB_SQUARES[square] & pinned:
+                    for to_square in scan(targets):
+                        if king_safe(square, to_square, BB_SQUARES[to_square]):
+                            moves.append(Move(square, to_square))
+                else:
+                    for to_square in scan(targets):
+                        moves.append(Move(square, to_square))
+
+    # O en passant pode descobrir um xeque na fileira; sempre passa pelo teste completo.
+    ep_square = _ep_square(board, white)
+    if ep_square is not None:
+        captured = BB_SQUARES[ep_square - 8 if white else ep_square + 8]
+        for square in scan(mine & pawns & PAWN_ATTACKS[not white][ep_square]):
+            if king_safe(square, ep_square, captured):
+                moves.append(Move(square, ep_square))
+
+    if mine & own_kings:
+        for to_square in scan(KING_ATTACKS[king] & ~own):
+            if king_safe(king, to_square, BB_SQUARES[to_square]):
+                moves.append(Move(king, to_square))
+        if not checkers:
+            for target, path in _castling_candidates(board, king, white, rooks & own, occupied):
+                if not any(attackers_mask(square, not white, occupied, enemy, pawns,
+                                          knights, bishops, rooks, queens, kings)
+                           for square in scan(path)):
+                    moves.append(Move(king, target))
+    return moves
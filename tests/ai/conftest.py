@@ -0,0 +1,15 @@
+import pytest
+from src.core.board.board import Board, PieceType, Color, Piece
+from typing import Dict, Tuple
+
+@pytest.fixture
+def board_factory():
+    """Cria um tabuleiro só com as peças dadas, em {(rank, file): (tipo, cor)}."""
+    def _create_board(pieces_dict: Dict[Tuple[int, int], Tuple[PieceType, Color]]):
+        board = Board()
+        board.pieces.clear()
+        for (rank, file), (piece_type, color) in pieces_dict.items():
+            pos = f"{chr(file + ord('a'))}{rank+1}"
+            board.pieces[pos] = Piece(piece_type, color)
+        return board
+    return _create_board
@@ -0,0 +1,93 @@
+import chess
+import numpy as np
+import pytest
+from src.core.board.board import Board, Color
+from src.ai.batch_evaluation import evaluate_batch, pack_positions
+from src.ai.evaluation import (
+    DOUBLED_PAWN_PENALTY, ISOLATED_PAWN_PENALTY, MOBILITY_WEIGHTS, PASSED_PAWN_BONUS,
+    evaluate_material, evaluate_position
+)
+from src.core.board import PieceType
+
+FENS = [
+    chess.STARTING_FEN,
+    "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+    "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+    "4k3/8/8/8/8/8/8/4K2R w K - 0 1",
+    "6k1/8/8/8/8/2P5/2P1P3/6K1 w - - 0 1",
+]
+
+def scan_mobility(board):
+    """Mobilidade pelos ataques do python-chess, como referência"""
+    weights = {piece_type.value: weight for piece_type, weight in MOBILITY_WEIGHTS.items()}
+    totals = [0, 0]
+    for square, piece in board.piece_map().items():
+        if piece.piece_type in weights:
+            reachable = board.attacks_mask(square) & ~board.occupied_co[piece.color]
+            totals[piece.color] += weights[piece.piece_type] * chess.popcount(reachable)
+    return totals[chess.WHITE] - totals[chess.BLACK]
+
+def test_material_matches_board_evaluation():
+    """Testa que o material do lote coincide com o da avaliação por tabuleiro"""
+    boards = [Board.from_fen(fen) for fen in FENS]
+    result = evaluate_batch(boards)
+    for board, material in zip(boards, result.material):
+        expected = evaluate_material(board)
+        assert material == expected[Color.WHITE] - expected[Color.BLACK]
+
+def test_mobility_matches_attacks():
+    """Testa a mobilidade do lote contra os ataques das peças numa partida"""
+    board = chess.Board()
+    positions = []
+    for uci in ["e2e4", "e7e5", "g1f3", "b8c6", "f1b5", "a7a6", "b5c6", "d7c6",
+                "e1g1", "f7f6", "d2d4", "e5d4", "f3d4", "c6c5", "d4e2", "d8d1"]:
+        board.push_uci(uci)
+        positions.append(board.copy())
+    result = evaluate_batch(positions)
+    assert list(result.mobility) == [scan_mobility(position) for position in positions]
+
+def test_pawn_structure_masks():
+    """Testa as máscaras de peões dobrados, isolados e passados"""
+    result = evaluate_batch(["6k1/8/8/8/8/2P5/2P1P3/6K1 w - - 0 1"])
+    white = int(chess.WHITE)
+    assert result.doubled[0, white] == chess.BB_C2 | chess.BB_C3
+    assert result.isolated[0, white] == chess.BB_C2 | chess.BB_C3 | chess.BB_E2
+    assert result.passed[0, white] == chess.BB_C2 | chess.BB_C3 | chess.BB_E2
+    assert result.pawn_structure[0] == (2 * PASSED_PAWN_BONUS[1] + PASSED_PAWN_BONUS[2]
+                                        - DOUBLED_PAWN_PENALTY - 3 * ISOLATED_PAWN_PENALTY)
+
+def test_blocked_pawn_is_not_passed():
+    """Testa que um peão adversário à frente, na mesma coluna ou ao lado, barra o passado"""
+    result = evaluate_batch(["4k3/3p4/8/8/4P3/8/8/4K3 w - - 0 1"])
+    assert not result.passed[0].any()
+
+@pytest.mark.parametrize("squares", [False, True])
+def test_packed_tensors(squares):
+    """Testa que os tensores empacotados avaliam igual às posições"""
+    packed = pack_positions(FENS, squares=squares)
+    assert packed.dtype == np.int8
+    assert packed.shape == ((len(FENS), 64) if squares else (len(FENS), 12, 64))
+    assert (evaluate_batch(packed).scores == evaluate_batch(FENS).scores).all()
+
+def test_chunks_and_mirror():
+    """Testa a divisão em blocos e a simetria entre as cores"""
+    mirrored = [chess.Board(fen).mirror() for fen in FENS]
+    result = evaluate_batch(FENS + mirrored, chunk_size=2)
+    assert len(result) == 2 * len(FENS)
+    assert (result.scores[:len(FENS)] == -result.scores[len(FENS):]).all()
+
+def test_scores_match_evaluate_position():
+    """Testa que o lote dá o mesmo score da avaliação por tabuleiro ao longo de partidas"""
+    import random
+    rng = random.Random(7)
+    boards = []
+    for _ in range(40):
+        board = chess.Board()
+        for _ in range(rng.randint(0, 80)):
+            moves = list(board.legal_moves)
+            if not moves:
+                break
+            board.push(rng.choice(moves))
+        boards.append(Board.from_fen(board.fen()))
+    result = evaluate_batch(boards)
+    assert list(result.scores) == [evaluate_position(board) for board in boards]
@@ -0,0 +1,124 @@
+import chess
+import pytest
+from src.core.board.board import Board, Color
+from src.ai import evaluation
+from src.ai.evaluation import (
+    DOUBLED_PAWN_PENALTY, ISOLATED_PAWN_PENALTY, KING_SHIELD_BONUS, MAX_PHASE, MOBILITY_WEIGHTS,
+    PASSED_PAWN_BONUS, evaluate_king_safety, evaluate_material, evaluate_mobility,
+    evaluate_pawn_structure, evaluate_piece, evaluate_position, game_phase,
+    get_piece_position_value
+)
+from src.core.board.board import PieceType
+
+def scan_material(board):
+    """Material por varredura das 64 casas, como referência"""
+    midgame = {Color.WHITE: 0, Color.BLACK: 0}
+    endgame = {Color.WHITE: 0, Color.BLACK: 0}
+    for row in range(8):
+        for col in range(8):
+            piece = board.get_piece(row, col)
+            if piece is not None:
+                midgame[piece.color] += evaluate_piece(piece, row, col, MAX_PHASE)
+                endgame[piece.color] += evaluate_piece(piece, row, col, 0)
+    phase = game_phase(board)
+    return {color: (midgame[color] * phase + endgame[color] * (MAX_PHASE - phase)) // MAX_PHASE
+            for color in midgame}
+
+def test_initial_position_is_balanced():
+    """Testa que a posição inicial é equilibrada"""
+    board = Board()
+    assert evaluate_position(board) == 0
+    assert evaluate_material(board) == scan_material(board)
+
+def test_material_follows_moves():
+    """Testa que o material incremental coincide com a varredura ao longo de uma partida"""
+    board = Board.from_fen("rnbqkbnr/ppp1p1pp/8/3pPp2/8/8/PPPP1PPP/RNBQKBNR w KQkq f6 0 3")
+    for uci in ("e5f6", "g8f6", "d2d4", "c8f5", "f1d3", "f5d3", "d1d3", "b8c6", "c1g5", "d8d6",
+                "b1c3", "e8c8", "e1c1"):
+        board.push(uci)
+        assert evaluate_material(board) == scan_material(board), uci
+    while board.move_history:
+        board.pop()
+        assert evaluate_material(board) == scan_material(board)
+
+def test_material_after_hand_edit():
+    """Testa que editar as peças à mão recalcula o material"""
+    board = Board()
+    evaluate_position(board)
+    del board.pieces["d8"]
+    assert evaluate_material(board) == scan_material(board)
+    assert evaluate_position(board) > 800
+
+def test_tables_mirrored_for_black():
+    """Testa que as tabelas das pretas são o espelho das brancas"""
+    from src.core.board.board import Piece, PieceType
+    for piece_type in PieceType:
+        for row in range(8):
+            for col in range(8):
+                white = get_piece_position_value(Piece(piece_type, Color.WHITE), row, col)
+                black = get_piece_position_value(Piece(piece_type, Color.BLACK), 7 - row, col)
+                assert white == black
+
+def test_king_centralization_in_endgame():
+    """Testa que no final o rei centralizado vale mais e no meio-jogo o rei abrigado vale mais"""
+    from src.core.board.board import Piece, PieceType
+    king = Piece(PieceType.KING, Color.WHITE)
+    # (7, 6) = g1, (4, 4) = e4
+    assert get_piece_position_value(king, 7, 6, MAX_PHASE) > get_piece_position_value(king, 4, 4, MAX_PHASE)
+    assert get_piece_position_value(king, 4, 4, 0) > get_piece_position_value(king, 7, 6, 0)
+
+    endgame = Board.from_fen("8/8/8/8/4K3/8/8/k7 w - - 0 1")
+    assert game_phase(endgame) == 0
+    assert evaluate_position(endgame) > 0
+    assert game_phase(Board()) == MAX_PHASE
+
+def test_mobility_counts_reachable_squares():
+    """Testa a mobilidade: casas vazias ou com peça adversária, ponderadas por tipo"""
+    board = Board.from_fen("4k3/8/8/8/8/8/8/R3K1N1 w - - 0 1")
+    # Torre em a1: a2-a8 e b1-d1 (e1 é do próprio rei); cavalo em g1: e2, f3, h3.
+    expected = 10 * MOBILITY_WEIGHTS[PieceType.ROOK] + 3 * MOBILITY_WEIGHTS[PieceType.KNIGHT]
+    assert evaluate_mobility(board) == {Color.WHITE: expected, Color.BLACK: 0}
+    assert evaluate_mobility(Board())[Color.WHITE] == evaluate_mobility(Board())[Color.BLACK]
+
+def test_pawn_structure_terms():
+    """Testa peões dobrados, isolados e passados"""
+    board = Board.from_fen("4k3/p7/8/8/8/2P5/2P1P3/4K3 w - - 0 1")
+    # c2/c3 dobrados e isolados, e2 isolado; os três são passados. a7 é isolado e passado.
+    white = (2 * PASSED_PAWN_BONUS[1] + PASSED_PAWN_BONUS[2]
+             - DOUBLED_PAWN_PENALTY - 3 * ISOLATED_PAWN_PENALTY)
+    black = PASSED_PAWN_BONUS[1] - ISOLATED_PAWN_PENALTY
+    assert evaluate_pawn_structure(board) == {Color.WHITE: white, Color.BLACK: black}
+
+def test_pawn_table_reuses_skeleton():
+    """Testa que posições com os mesmos peões reaproveitam a estrutura calculada"""
+    table = evaluation.PAWN_HASH
+    table.clear()
+    board = Board()
+    evaluate_pawn_structure(board)
+    board.push("g1f3")
+    board.push("b8c6")
+    evaluate_pawn_structure(board)
+    assert (table.hits, table.misses) == (1, 1)
+    board.push("e2e4")
+    evaluate_pawn_structure(board)
+    assert table.get_size() == 2
+    board.pop()
+    evaluate_pawn_structure(board)
+    assert (table.hits, table.misses) == (2, 2)
+
+def test_king_safety_shield_and_attacks():
+    """Testa que o escudo de peões protege e os ataques à zona do rei custam"""
+    sheltered = Board.from_fen("r2qk3/8/8/8/8/8/5PPP/3Q2K1 w - - 0 1")
+    exposed = Board.from_fen("r2qk3/8/8/8/8/8/PPP5/3Q2K1 w - - 0 1")
+    assert evaluate_king_safety(sheltered)[Color.WHITE] > evaluate_king_safety(exposed)[Color.WHITE]
+
+    phase = game_phase(sheltered)
+    assert evaluate_king_safety(sheltered)[Color.WHITE] == 3 * KING_SHIELD_BONUS * phase // MAX_PHASE
+    # A torre em g8 ataca g3 e g2, na zona do rei branco.
+    attacked = Board.from_fen("3qk1r1/8/8/8/8/8/5PPP/3Q2K1 w - - 0 1")
+    assert evaluate_king_safety(attacked)[Color.WHITE] < evaluate_king_safety(sheltered)[Color.WHITE]
+
+def test_king_safety_fades_in_endgame():
+    """Testa que a segurança do rei não conta sem peças além de peões"""
+    board = Board.from_fen("4k3/8/8/8/8/8/5PPP/6K1 w - - 0 1")
+    assert evaluate_king_safety(board) == {Color.WHITE: 0, Color.BLACK: 0}
@@ -0,0 +1,110 @@
+import pytest
+from src.ai.cache import BoundedCache, EvictionPolicy, PositionCache
+from src.quantum.optimization import MemoryOptimizer
+
+
+def test_lru_evicts_least_recently_used():
+    """Testa que o LRU despeja a entrada usada há mais tempo"""
+    cache = BoundedCache(max_entries=3, policy='lru')
+    for key in 'abc':
+        cache.put(key, key)
+    cache.get('a')
+    cache.put('d', 'd')
+    assert set(cache) == {'a', 'c', 'd'}
+    assert cache.evictions == 1
+
+
+def test_lfu_evicts_least_frequently_used():
+    """Testa que o LFU despeja a menos usada e, no empate, a mais antiga"""
+    cache = BoundedCache(max_entries=3, policy='lfu')
+    for key in 'abc':
+        cache.put(key, key)
+    for key in 'aab':
+        cache.get(key)
+    cache.put('d', 'd')
+    assert set(cache) == {'a', 'b', 'd'}
+    cache.get('d')
+    cache.put('e', 'e')
+    assert set(cache) == {'a', 'd', 'e'}
+
+
+def test_depth_policy_prefers_old_generations_then_shallow():
+    """Testa que o despejo por profundidade tira antes as gerações antigas e as entradas rasas"""
+    cache = BoundedCache(max_entries=3, policy='depth')
+    cache.put('deep old', 1, depth=10)
+    cache.new_generation()
+    cache.put('shallow', 2, depth=1)
+    cache.put('deep', 3, depth=8)
+    cache.put('new', 4, depth=5)
+    assert 'deep old' not in cache
+    cache.put('newer', 5, depth=6)
+    assert set(cache) == {'deep', 'new', 'newer'}
+
+
+def test_depth_policy_tracks_depths_as_buckets_change():
+    """Testa que as profundidades acompanham baldes criados e esvaziados"""
+    cache = BoundedCache(max_entries=2, policy='depth')
+    cache.put('a', 1, depth=7)
+    cache.put('b', 2, depth=3)
+    cache.put('c', 3, depth=5)
+    assert set(cache) == {'a', 'c'}
+    cache.put('d', 4, depth=9)
+    assert set(cache) == {'a', 'd'}
+    assert cache.policy._depths == [7, 9]
+    cache.clear()
+    cache.put('e', 5, depth=2)
+    assert cache.policy._depths == [2]
+
+
+def test_byte_budget_and_counters():
+    """Testa o orçamento em bytes e os contadores de acertos, faltas e despejos"""
+    cache = BoundedCache(max_bytes=1000, sizeof=lambda key, value: len(value))
+    for i in range(10):
+        cache.put(i, 'x' * 300)
+    assert len(cache) == 3 and cache.nbytes == 900
+    assert cache.get(9) and cache.get(0) is None
+    stats = cache.get_statistics()
+    assert (stats['hits'], stats['misses'], stats['evictions']) == (1, 1, 7)
+
+    with pytest.raises(ValueError):
+        BoundedCache(policy='fifo')
+
+
+def test_position_cache_and_memory_optimizer_share_the_core():
+    """Testa que PositionCache e MemoryOptimizer usam o núcleo com política e contadores"""
+    positions = PositionCache(cache_size=2)
+    positions.put("a", 9, 1.0)
+    positions.put("b", 1, 2.0)
+    positions.put("c", 5, 3.0)
+    assert positions.get("b", 1) is None and positions.get("a", 9) == 1.0
+    assert positions.get_statistics()['evictions'] == 1
+
+    optimizer = MemoryOptimizer(max_cache_size=2, shards=1)
+    for key in range(3):
+        optimizer.cache_result(key, {'value': key})
+    assert optimizer.get_cached(0) is None and optimizer.get_cached(2) == {'value': 2}
+    assert (optimizer.metrics.cache_hits, optimizer.metrics.cache_misses) == (1, 1)
+    optimizer.max_cache_size = 1
+    optimizer.clear_old_entries()
+    assert len(optimizer.cache) == 1
+
+
+def test_incomplete_policy_fails_on_construction():
+    """Testa que uma política sem todos os métodos falha ao ser criada, não no despejo"""
+    class NoVictim(EvictionPolicy):
+        name = 'incomplete'
+
+        def insert(self, key, depth=0):
+            pass
+
+        def touch(self, key):
+            pass
+
+        def remove(self, key):
+            pass
+
+        def clear(self):
+            pass
+
+    with pytest.raises(TypeError):
+        NoVictim()
@@ -0,0 +1,87 @@
+import sys
+
+import pytest
+from src.ai.cache import PawnHashTable, PositionCache
+from src.quantum.memory import estimate_bytes, sample_memory
+from src.quantum.optimization import MemoryOptimizer, PerformanceMonitor
+
+linux_only = pytest.mark.skipif(not sys.platform.startswith('linux'), reason="lê /proc")
+
+
+@linux_only
+def test_sample_reads_proc():
+    """Testa que RSS, USS e pico vêm do /proc e são coerentes"""
+    sample = sample_memory()
+    assert sample.rss > 0 and sample.uss > 0
+    assert sample.uss <= sample.rss <= sample.peak_rss
+
+
+def test_cache_byte_estimates():
+    """Testa as estimativas de bytes dos caches"""
+    table = PawnHashTable(size=1024)
+    assert estimate_bytes(table) == table.words.nbytes
+    cache = PositionCache(cache_size=100)
+    assert estimate_bytes(cache) == 0
+    cache.put("fen", 1, 0.5)
+    assert estimate_bytes(cache) > 0
+    assert estimate_bytes({'a': 1}) > sys.getsizeof({})
+
+
+@linux_only
+def test_monitor_tracks_operation_peaks():
+    """Testa o pico de alocações por operação e o resumo de memória"""
+    monitor = PerformanceMonitor(trace_allocations=True)
+    cache = PositionCache(cache_size=100)
+    monitor.register_cache('positions', cache)
+    try:
+        monitor.start_operation('alocação')
+        block = bytearray(4 << 20)
+        del block
+        cache.get("fen", 1)
+        monitor.end_operation()
+        monitor.start_operation('pequena')
+        monitor.end_operation()
+    finally:
+        monitor.stop_tracing()
+
+    summary = monitor.get_performance_summary()
+    assert summary['memory']['rss_bytes'] > 0 and summary['memory']['uss_bytes'] > 0
+    assert summary['operation_peaks']['alocação']['traced_bytes'] >= 4 << 20
+    assert summary['operation_peaks']['pequena']['traced_bytes'] < 1 << 20
+    assert summary['cache_bytes'] == {'positions': 0}
+    assert summary['cache_misses'] == 1
+    assert monitor.performance_log[0].memory_usage > 0
+
+
+@linux_only
+def test_memory_optimizer_reports_process_memory():
+    """Testa que o MemoryOptimizer mede o processo e não a ocupação do cache"""
+    optimizer = MemoryOptimizer(max_cache_size=10)
+    optimizer.cache_result(1, {'x': 1})
+    assert optimizer.monitor_memory_usage() > 1 << 20
+    assert optimizer.cache_usage_percent() == 10.0
+    report = optimizer.memory_report()
+    assert report['cache_bytes'] > 0 and report['uss_bytes'] > 0
+
+
+@linux_only
+def test_memory_suggestion_uses_operation_growth():
+    """Testa que só operações que alocam muito geram a sugestão de memória"""
+    for trace in (False, True):
+        monitor = PerformanceMonitor(trace_allocations=trace)
+        try:
+            for _ in range(3):
+                monitor.start_operation('vazia')
+                monitor.end_operation()
+            assert not any('memory' in s for s in monitor.suggest_optimizations())
+
+            monitor.start_operation('grande')
+            block = bytearray(64 << 20)
+            block[::4096] = b'x' * len(block[::4096])
+            monitor.end_operation()
+            del block
+        finally:
+            monitor.stop_tracing()
+        assert monitor.operation_peaks['grande']['growth_bytes'] >= 32 << 20
+        assert monitor.operation_peaks['vazia']['growth_bytes'] < 1 << 20
+        assert any(s.endswith(': grande') for s in monitor.suggest_optimizations())
@@ -0,0 +1,140 @@
+import io
+import random
+
+import chess
+import chess.polyglot
+import pytest
+from src.ai.cache import OpeningBookCache
+from src.ai.cache.opening_book import (
+    PolyglotBook, PolyglotBookWriter, add_pgn_games, book_from_json, book_from_pgn, main,
+    replay_history
+)
+from src.core.board.board import Board
+
+PGN = """[Result "1-0"]
+
+1. e4 e5 2. Nf3 Nc6 3. Bb5 a6 4. O-O Nf6 1-0
+
+[Result "1/2-1/2"]
+
+1. d4 Nf6 2. c4 e6 3. Nf3 d5 4. Nc3 Be7 1/2-1/2
+
+[Result "0-1"]
+
+1. Nf3 Nf6 2. d4 e6 3. c4 d5 4. Nc3 Be7 0-1
+"""
+
+@pytest.fixture
+def book_path(tmp_path):
+    path = tmp_path / "book.bin"
+    pgn = tmp_path / "games.pgn"
+    pgn.write_text(PGN)
+    assert book_from_pgn([str(pgn)], str(path)) > 0
+    return str(path)
+
+def test_matches_python_chess_reader(book_path):
+    """Testa que o livro gerado é lido igual pelo leitor Polyglot do python-chess"""
+    game = chess.pgn.read_game(io.StringIO(PGN))
+    board = game.board()
+    with chess.polyglot.open_reader(book_path) as reference, PolyglotBook(book_path) as book:
+        for move in game.mainline_moves():
+            expected = [(entry.move, entry.weight) for entry in reference.find_all(board)]
+            assert [(entry.move, entry.weight) for entry in book.find_all(board)] == expected
+            board.push(move)
+
+def test_castling_is_king_takes_rook(book_path):
+    """Testa que o roque é gravado no formato Polyglot e lido como lance do rei"""
+    board = Board()
+    for uci in ("e2e4", "e7e5", "g1f3", "b8c6", "f1b5", "a7a6"):
+        board.push(uci)
+    with PolyglotBook(book_path) as book:
+        raw = book.raw_entries(board.zobrist_key)
+        assert [entry[1] & 63 for entry in raw] == [chess.H1]
+        assert book.get_move(board, best=True) == chess.Move.from_uci("e1g1")
+
+def test_transpositions_share_entries(book_path):
+    """Testa que ordens de lances diferentes chegam à mesma entrada"""
+    first, second = Board(), Board()
+    for uci in ("d2d4", "g8f6", "c2c4", "e7e6", "g1f3", "d7d5", "b1c3"):
+        first.push(uci)
+    for uci in ("g1f3", "g8f6", "d2d4", "e7e6", "c2c4", "d7d5", "b1c3"):
+        second.push(uci)
+    with PolyglotBook(book_path) as book:
+        entries = book.find_all(first)
+        assert entries == book.find_all(second)
+        # Empate (1) na primeira partida e vitória das pretas (2) na segunda.
+        assert [(entry.move.uci(), entry.weight) for entry in entries] == [("f8e7", 3)]
+
+def test_weighted_choice(tmp_path):
+    """Testa que o sorteio segue os pesos e que peso zero nunca sai"""
+    writer = PolyglotBookWriter()
+    board = chess.Board()
+    writer.add(board, chess.Move.from_uci("e2e4"), 3)
+    writer.add(board, chess.Move.from_uci("d2d4"), 1)
+    path = str(tmp_path / "weights.bin")
+    writer.write(path)
+    rng = random.Random(1)
+    with PolyglotBook(path) as book:
+        picks = [book.weighted_choice(board, rng).move.uci() for _ in range(400)]
+        assert 250 < picks.count("e2e4") < 350
+        board.push_uci("e2e4")
+        assert book.weighted_choice(board, rng) is None
+
+def test_json_book_conversion(tmp_path):
+    """Testa a conversão do livro JSON e a consulta pelo OpeningBookCache"""
+    legacy = OpeningBookCache()
+    legacy.add_opening([], ("e2", "e4"), "Peão do rei")
+    legacy.add_opening([("e2", "e4")], ("c7", "c5"), "Siciliana")
+    legacy.add_opening([("e2", "e4"), ("c7", "c5")], "g1f3")
+    json_path = str(tmp_path / "book.json")
+    legacy.save_book(json_path)
+    bin_path = str(tmp_path / "book.bin")
+    assert book_from_json(json_path, bin_path) == 3
+
+    cache = OpeningBookCache(bin_path)
+    assert cache.book is not None
+    assert cache.get_next_move([]) == ("e2", "e4")
+    assert cache.get_next_move([("e2", "e4")]) == ("c7", "c5")
+    board = Board()
+    board.push("e2e4")
+    board.push("c7c5")
+    assert cache.get_book_move(board) == chess.Move.from_uci("g1f3")
+    assert OpeningBookCache(json_path).get_book_move(board) == chess.Move.from_uci("g1f3")
+
+def test_history_replay_checks_legality_and_promotion(tmp_path):
+    """Testa que um histórico ilegal não consulta o livro e que a promoção em par de casas vira dama"""
+    history = [("e2", "e4"), ("d7", "d5"), ("e4", "d5"), ("c7", "c6"), ("d5", "c6"),
+               ("g8", "f6"), ("c6", "b7"), ("b8", "d7"), ("b7", "a8")]
+    board = chess.Board()
+    for uci in ["e2e4", "d7d5", "e4d5", "c7c6", "d5c6", "g8f6", "c6b7", "b8d7", "b7a8q"]:
+        board.push_uci(uci)
+    writer = PolyglotBookWriter()
+    writer.add(board, chess.Move.from_uci("e7e5"), 1)
+    writer.add(chess.Board(), chess.Move.from_uci("e2e4"), 1)
+    path = str(tmp_path / "promotion.bin")
+    writer.write(path)
+
+    cache = OpeningBookCache(path)
+    assert cache.get_next_move(history) == ("e7", "e5")
+    assert cache.get_next_move(["e2e5"]) is None
+    assert cache.get_next_move([("e2", "e4"), ("e2", "e4")]) is None
+    assert replay_history(["e2e4", "e7e5"]).to_fen() == chess.Board(
+        "rnbqkbnr/pppp1ppp/8/4p3/4P3/8/PPPP1PPP/RNBQKBNR w KQkq e6 0 2").fen()
+
+def test_invalid_files(tmp_path):
+    """Testa que arquivos inexistentes ou truncados não carregam"""
+    truncated = tmp_path / "truncated.bin"
+    truncated.write_bytes(b"\0" * 10)
+    assert not OpeningBookCache().load_book(str(truncated))
+    assert not OpeningBookCache().load_book(str(tmp_path / "missing.bin"))
+
+def test_command_line(tmp_path, capsys):
+    """Testa o conversor pela linha de comando"""
+    pgn = tmp_path / "games.pgn"
+    pgn.write_text(PGN)
+    output = tmp_path / "cli.bin"
+    assert main([str(output), "--pgn", str(pgn), "--max-ply", "2"]) == 0
+    assert "3 partidas" in capsys.readouterr().out
+    with PolyglotBook(str(output)) as book:
+        # 1. Nf3 só aparece na partida perdida pelas brancas: peso 0, fora do livro.
+        assert {entry.move.uci() for entry in book.find_all(chess.Board())} == {"e2e4", "d2d4"}
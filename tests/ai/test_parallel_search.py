@@ -0,0 +1,94 @@
+import chess
+import pytest
+from src.core.board.board import Board
+from src.ai.cache.transposition_table import TranspositionTable
+from src.ai.parallel_search import LazySMPSearch
+
+@pytest.fixture
+def smp():
+    search = LazySMPSearch(threads=2, hash_mb=1)
+    yield search
+    search.close()
+
+def test_shared_table_between_handles():
+    """Testa que duas tabelas ligadas à mesma memória compartilhada veem as mesmas entradas"""
+    table = TranspositionTable.create_shared(size_mb=1)
+    other = TranspositionTable.attach(table.shared_name, table.max_size)
+    try:
+        table.store(0xDEADBEEF, depth=5, score=1.25, flag='lowerbound')
+        entry = other.lookup(0xDEADBEEF)
+        assert entry.depth == 5
+        assert entry.score == 1.25
+        assert entry.flag == 'lowerbound'
+    finally:
+        other.close()
+        table.close(unlink=True)
+
+def test_torn_entry_is_rejected():
+    """Testa que uma entrada com dados trocados não confere com a chave"""
+    table = TranspositionTable(max_size=2)
+    table.store(7, depth=3, score=1.0, flag='exact')
+    table.words[7 % table.num_buckets, 0, 1] ^= 1 << 40
+    assert table.lookup(7) is None
+
+def test_smp_finds_mate(smp):
+    """Testa que a busca paralela encontra o mate e combina os nós dos processos"""
+    board = Board.from_fen("6k1/5ppp/8/8/8/8/5PPP/R5K1 w - - 0 1")
+    result = smp.search(board, depth=3)
+    assert result.best_move == chess.Move.from_uci("a1a8")
+    assert result.nodes > 0
+
+def test_smp_respects_budget(smp):
+    """Testa que os processos auxiliares param junto com o principal"""
+    board = Board()
+    fen = board.to_fen()
+    result = smp.search(board, movetime=0.3)
+    assert result.best_move in board.legal_moves()
+    result = smp.search(board, nodes=2000)
+    assert result.best_move in board.legal_moves()
+    assert board.to_fen() == fen
+
+def test_dead_helper_does_not_hang_search(smp):
+    """Testa que a busca termina com o resultado do principal se um auxiliar morre no meio"""
+    import threading
+    import time
+
+    board = Board()
+    smp.search(board, depth=1)
+    helper = smp._helpers[0]
+    threading.Timer(0.1, helper.terminate).start()
+    start = time.perf_counter()
+    result = smp.search(board, movetime=0.4)
+    assert time.perf_counter() - start < 1.5
+    assert result.best_move in board.legal_moves()
+    assert not helper.is_alive() and smp._helpers == []
+    # A busca seguinte recria o auxiliar.
+    assert smp.search(board, depth=2).best_move in board.legal_moves()
+    assert len(smp._helpers) == 1 and smp._helpers[0].is_alive()
+
+def test_parallel_root_evaluation_matches_serial():
+    """Testa que a avaliação dos lances no pool devolve os scores da busca serial, em ordem"""
+    from src.ai.search import AlphaBetaSearch
+    from src.quantum.computation import ParallelComputation
+    from src.traditional.bitboards import square_position
+
+    board = Board.from_fen("6k1/5ppp/8/8/8/8/5PPP/R5K1 w - - 0 1")
+    moves = list(board.legal_moves())
+    engine = AlphaBetaSearch(hash_mb=1)
+    expected = []
+    for move in moves:
+        board.push(move)
+        expected.append(-engine.search(board, depth=1).score)
+        board.pop()
+
+    with ParallelComputation(num_threads=1, num_processes=2, hash_mb=1) as computation:
+        positions = [(square_position(m.from_square), square_position(m.to_square)) for m in moves]
+        assert computation.parallel_position_evaluation(board, positions, 2) == expected
+        assert computation.metrics.total_operations == len(moves)
+        assert computation.metrics.parallelization_overhead >= 0.0
+        assert 1 in computation._seconds_per_position
+        # Com o custo medido, os lotes seguintes seguem o alvo de tempo por tarefa.
+        assert 1 <= computation._chunk_size(len(moves), 1) <= len(moves)
+        assert computation.parallel_position_evaluation(board, moves, 2) == expected
+        copy = computation._copy_board(board)
+        assert copy.to_fen() == board.to_fen() and copy is not board
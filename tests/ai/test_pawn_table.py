@@ -0,0 +1,53 @@
+import chess
+from src.ai.cache.pawn_table import PawnHashTable
+from src.ai.evaluation import evaluate_pawn_structure, pawn_structure
+from src.core.board.board import Board
+
+def test_store_and_probe():
+    """Testa gravar e recuperar scores negativos e máscaras"""
+    table = PawnHashTable(size=64)
+    key = 0x9D39247E33776D41
+    assert table.probe(key) is None
+    table.store(key, (-45, 120), (0, chess.BB_E5), (chess.BB_A7, 0), (0, chess.BB_C2 | chess.BB_C3))
+    entry = table.probe(key)
+    assert entry.scores == (-45, 120)
+    assert entry.passed == (0, chess.BB_E5)
+    assert entry.isolated == (chess.BB_A7, 0)
+    assert entry.doubled == (0, chess.BB_C2 | chess.BB_C3)
+    assert table.probe(key + 64) is None
+    assert (table.hits, table.misses) == (1, 2)
+
+def test_empty_skeleton_is_stored():
+    """Testa que a posição sem peões (chave 0) também é guardada"""
+    table = PawnHashTable(size=16)
+    assert table.probe(0) is None
+    table.store(0, (0, 0), (0, 0), (0, 0), (0, 0))
+    assert table.probe(0).scores == (0, 0)
+
+def test_replacement_keeps_latest():
+    """Testa que chaves no mesmo índice substituem a anterior"""
+    table = PawnHashTable(size=16)
+    table.store(5, (1, 1), (0, 0), (0, 0), (0, 0))
+    table.store(21, (2, 2), (0, 0), (0, 0), (0, 0))
+    assert table.probe(5) is None
+    assert table.probe(21).scores == (2, 2)
+    assert table.get_size() == 1
+
+def test_entry_matches_board_evaluation():
+    """Testa que a entrada da avaliação traz as máscaras da posição"""
+    board = Board.from_fen("4k3/p7/8/8/8/2P5/2P1P3/4K3 w - - 0 1")
+    entry = pawn_structure(board)
+    assert entry.key == board.pawn_key
+    assert entry.doubled == (0, chess.BB_C2 | chess.BB_C3)
+    assert entry.passed == (chess.BB_A7, chess.BB_C2 | chess.BB_C3 | chess.BB_E2)
+    assert list(evaluate_pawn_structure(board).values()) != [0, 0]
+
+def test_torn_entry_is_rejected():
+    """Testa que uma entrada com scores de outra escrita não confere com a chave"""
+    table = PawnHashTable(size=16)
+    table.store(5, (10, 20), (0, chess.BB_E5), (0, 0), (0, 0))
+    table.words[5, 7] ^= 1 << 4
+    assert table.probe(5) is None and table.probe_scores(5) is None
+    table.store(5, (10, 20), (0, chess.BB_E5), (0, 0), (0, 0))
+    table.words[5, 2] = 0
+    assert table.probe(5) is None
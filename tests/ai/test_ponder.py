@@ -0,0 +1,111 @@
+import threading
+import time
+
+import chess
+import pytest
+from src.core.board.board import Board
+from src.ai.ponder import PonderingSearch
+from src.ai.search import AlphaBetaSearch
+from src.ai.time_manager import SearchLimits
+
+
+@pytest.fixture
+def searcher():
+    searcher = PonderingSearch(AlphaBetaSearch(hash_mb=4))
+    yield searcher
+    searcher.close()
+
+
+def _expected_reply(board, result):
+    board.push(result.best_move)
+    board.push(result.pv[1])
+
+
+def test_ponder_hit_answers_instantly(searcher):
+    """Testa que o acerto da ponderação devolve o lance sem nova busca"""
+    board = Board()
+    result = searcher.think(board, SearchLimits(depth=3))
+    assert searcher.pondering
+    time.sleep(0.5)
+    _expected_reply(board, result)
+
+    start = time.perf_counter()
+    reply = searcher.think(board, SearchLimits(depth=3))
+    assert time.perf_counter() - start < 0.05
+    assert searcher.last_ponder_hit and searcher.ponder_hits == 1
+    assert reply.depth >= 3 and reply.best_move in board.legal_moves()
+
+
+def test_ponder_hit_counts_pondered_time(searcher):
+    """Testa que no acerto o tempo ponderado conta para o prazo do relógio"""
+    board = Board()
+    result = searcher.think(board, SearchLimits(depth=2))
+    time.sleep(0.3)
+    _expected_reply(board, result)
+
+    start = time.perf_counter()
+    searcher.think(board, SearchLimits(wtime=6.0, btime=6.0), ponder=False)
+    # Prazo flexível de ~0.2 s, já gasto enquanto ponderava.
+    assert time.perf_counter() - start < 0.05
+    assert searcher.last_ponder_hit and not searcher.pondering
+
+
+def test_ponder_miss_searches_again(searcher):
+    """Testa que um lance inesperado interrompe a ponderação e busca de novo"""
+    board = Board()
+    result = searcher.think(board, SearchLimits(depth=2))
+    board.push(result.best_move)
+    other = next(move for move in board.legal_moves() if move != result.pv[1])
+    board.push(other)
+
+    reply = searcher.think(board, SearchLimits(depth=2), ponder=False)
+    assert not searcher.last_ponder_hit and searcher.ponder_misses == 1
+    assert reply.depth == 2 and reply.best_move in board.legal_moves()
+
+
+def test_stop_right_after_start(searcher):
+    """Testa que parar logo depois de começar não espera a ponderação inteira"""
+    board = Board.from_fen("4k3/8/8/3q4/8/8/3R4/3K4 w - - 0 1")
+    result = searcher.think(board, SearchLimits(depth=2))
+    start = time.perf_counter()
+    searcher.stop_pondering()
+    assert time.perf_counter() - start < 0.5
+    assert board.to_fen() == "4k3/8/8/3q4/8/8/3R4/3K4 w - - 0 1"
+    assert result.best_move == chess.Move.from_uci("d2d5")
+
+
+def test_concurrent_close_and_stop(searcher):
+    """Testa que fechar e parar ao mesmo tempo não falha e não volta a ponderar"""
+    board = Board()
+    searcher.think(board, SearchLimits(depth=2))
+    errors = []
+
+    def run(call):
+        try:
+            call()
+        except Exception as error:
+            errors.append(error)
+
+    threads = [threading.Thread(target=run, args=(call,))
+               for call in (searcher.close, searcher.stop_pondering, searcher.stop_pondering)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors and not searcher.pondering
+    searcher.think(board, SearchLimits(depth=2))
+    assert not searcher.pondering
+
+
+def test_ponder_hit_reports_iterations(searcher):
+    """Testa que no acerto o callback de quem chamou recebe as iterações da ponderação"""
+    board = Board()
+    result = searcher.think(board, SearchLimits(depth=2))
+    _expected_reply(board, result)
+
+    infos = []
+    reply = searcher.think(board, SearchLimits(depth=5), on_iteration=infos.append, ponder=False)
+    assert searcher.last_ponder_hit
+    depths = [info.depth for info in infos]
+    assert depths and depths == sorted(depths)
+    assert depths[-1] == reply.depth == 5
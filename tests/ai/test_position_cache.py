@@ -0,0 +1,93 @@
+import json
+
+from src.ai.cache import PositionCache
+from src.ai.cache.snapshot import HEADER, PositionSnapshot
+
+
+def filled_cache(count=1000):
+    cache = PositionCache(cache_size=count)
+    for i in range(count):
+        cache.put(f"posição {i}", i % 10, i / 4)
+    return cache
+
+
+def test_binary_snapshot_roundtrip(tmp_path):
+    """Testa que o snapshot binário atende consultas sem carregar o dicionário"""
+    path = tmp_path / "cache.bin"
+    filled_cache().save_to_disk(str(path))
+    assert [p.name for p in tmp_path.iterdir()] == ["cache.bin"]
+
+    cache = PositionCache(cache_size=100)
+    assert cache.load_from_disk(str(path))
+    assert cache.size() == 0
+    assert cache.get("posição 123", 3) == 123 / 4
+    assert cache.get("posição 123", 4) is None
+    assert cache.size() == 1
+    cache.close()
+
+
+def test_warm_start_keeps_deepest_entries(tmp_path):
+    """Testa que o warm start traz só as entradas mais profundas, limitado a cache_size"""
+    path = tmp_path / "cache.bin"
+    filled_cache().save_to_disk(str(path))
+
+    cache = PositionCache(cache_size=50)
+    assert cache.load_from_disk(str(path), warm_start=200)
+    assert cache.size() == 50
+    assert {depth for _, depth in cache.cache} == {9}
+    cache.close()
+
+
+def test_save_merges_loaded_snapshot(tmp_path):
+    """Testa que gravar de novo preserva as entradas do snapshot e as novas"""
+    first, second = tmp_path / "a.bin", tmp_path / "b.bin"
+    filled_cache(100).save_to_disk(str(first))
+    cache = PositionCache(cache_size=10)
+    cache.load_from_disk(str(first))
+    cache.put("posição 5", 5, -1.0)
+    cache.put("nova", 1, 2.0)
+    cache.save_to_disk(str(second))
+    cache.close()
+
+    with PositionSnapshot(str(second)) as snapshot:
+        assert len(snapshot) == 101
+    cache.load_from_disk(str(second))
+    assert cache.get("posição 5", 5) == -1.0
+    assert cache.get("nova", 1) == 2.0
+    cache.close()
+
+
+def test_corrupted_snapshot_is_rejected(tmp_path):
+    """Testa que um snapshot com checksum errado só é recusado quando verificado"""
+    path = tmp_path / "cache.bin"
+    filled_cache(10).save_to_disk(str(path))
+    data = bytearray(path.read_bytes())
+    data[HEADER.size + 3] ^= 0xFF
+    path.write_bytes(bytes(data))
+    assert not PositionCache().load_from_disk(str(path), verify=True)
+    with PositionSnapshot(str(path)) as snapshot:
+        assert len(snapshot) == 10 and not snapshot.verify()
+
+
+def test_truncated_snapshot_is_rejected(tmp_path):
+    """Testa que um snapshot incompleto é recusado sem verificar o checksum"""
+    path = tmp_path / "cache.bin"
+    filled_cache(10).save_to_disk(str(path))
+    path.write_bytes(path.read_bytes()[:-5])
+    assert not PositionCache().load_from_disk(str(path))
+
+
+def test_json_load_is_bounded(tmp_path):
+    """Testa que o JSON (inclusive o formato antigo) respeita cache_size"""
+    path = tmp_path / "cache.json"
+    path.write_text(json.dumps({'cache_size': 1000,
+                                'positions': {f"fen {i}_2": float(i) for i in range(30)}}))
+    cache = PositionCache(cache_size=20)
+    assert cache.load_from_disk(str(path))
+    assert cache.size() == 20
+    assert cache.get("fen 29", 2) == 29.0
+
+    cache.save_to_disk(str(path))
+    other = PositionCache(cache_size=20)
+    assert other.load_from_disk(str(path))
+    assert other.get("fen 29", 2) == 29.0
@@ -0,0 +1,99 @@
+import chess
+import pytest
+from src.core.board.board import Board, Color
+from src.ai.search import AlphaBetaSearch, MATE_SCORE
+from src.ai.cache.transposition_table import decode_move
+from src.quantum.computation import OptimizedSearch
+
+@pytest.fixture
+def engine():
+    return AlphaBetaSearch(hash_mb=1)
+
+def test_finds_mate_in_one(engine):
+    """Testa que a busca encontra o mate no primeiro lance"""
+    board = Board.from_fen("6k1/5ppp/8/8/8/8/5PPP/R5K1 w - - 0 1")
+    result = engine.search(board, depth=3)
+    assert result.best_move == chess.Move.from_uci("a1a8")
+    assert result.score == MATE_SCORE - 1
+
+def test_captures_hanging_queen(engine):
+    """Testa que a busca captura uma dama indefesa"""
+    board = Board.from_fen("4k3/8/8/3q4/8/8/3R4/3K4 w - - 0 1")
+    result = engine.search(board, depth=2)
+    assert result.best_move == chess.Move.from_uci("d2d5")
+    assert result.score > 300
+
+def test_quiescence_avoids_poisoned_capture(engine):
+    """Testa que a quiescência vê a recaptura depois de tomar um peão defendido"""
+    board = Board.from_fen("4k3/8/2p5/3p4/8/8/8/3QK3 w - - 0 1")
+    result = engine.search(board, depth=1)
+    assert result.best_move != chess.Move.from_uci("d1d5")
+
+def test_board_restored_after_search(engine):
+    """Testa que o tabuleiro volta ao estado original, mesmo com a busca interrompida"""
+    board = Board()
+    board.move_piece("e2", "e4")
+    fen, key = board.to_fen(), board.zobrist_key
+    engine.search(board, nodes=500)
+    assert board.to_fen() == fen
+    assert board.zobrist_key == key
+    assert board.move_history == [("e2", "e4")]
+
+def test_node_and_time_budget(engine):
+    """Testa que os limites de nós e de tempo são respeitados"""
+    board = Board()
+    result = engine.search(board, nodes=3000)
+    assert result.best_move in board.legal_moves()
+    assert result.nodes < 3000 + 1024
+
+    result = engine.search(board, movetime=0.3)
+    assert result.best_move in board.legal_moves()
+    assert result.elapsed < 1.0
+
+def test_no_legal_moves(engine):
+    """Testa a busca em posição de mate"""
+    board = Board.from_fen("R5k1/5ppp/8/8/8/8/5PPP/6K1 b - - 0 1")
+    result = engine.search(board, depth=2)
+    assert result.best_move is None
+    assert result.score == -MATE_SCORE
+
+def test_optimized_search_returns_positions():
+    """Testa que OptimizedSearch devolve o lance em (linha, coluna)"""
+    search = OptimizedSearch(max_depth=2, hash_mb=1)
+    board = Board.from_fen("4k3/8/8/3q4/8/8/3R4/3K4 w - - 0 1")
+    assert search.find_best_move(board, Color.WHITE) == ((6, 3), (3, 3))
+    result = search.search(board)
+    assert result.best_moves[0] == ((6, 3), (3, 3))
+    assert result.depth == 2
+
+def test_optimized_search_close_releases_helpers():
+    """Testa que fechar o OptimizedSearch em Lazy SMP encerra os auxiliares e a memória compartilhada"""
+    with OptimizedSearch(max_depth=1, hash_mb=1, threads=2) as search:
+        search.search(Board())
+        helpers = list(search.engine._helpers)
+        assert helpers and all(helper.is_alive() for helper in helpers)
+    assert not any(helper.is_alive() for helper in helpers)
+    assert search.engine.table.shared_name is None
+
+def test_multipv_lines_match_individual_searches(engine):
+    """Testa que as linhas do multi-PV têm lances distintos e os scores de buscas separadas"""
+    board = Board.from_fen("4k3/8/8/3q4/8/8/3R4/3K4 w - - 0 1")
+    result = engine.search(board, depth=3, multipv=3)
+    assert [line.move for line in result.lines][0] == result.best_move == chess.Move.from_uci("d2d5")
+    assert len({line.move for line in result.lines}) == 3
+    assert result.lines[0].pv == result.pv
+    scores = [line.score for line in result.lines]
+    assert scores == sorted(scores, reverse=True)
+    for line in result.lines:
+        board.push(line.move)
+        assert -AlphaBetaSearch(hash_mb=1).search(board, depth=2).score == line.score
+        board.pop()
+
+def test_multipv_keeps_root_entry_and_caps_lines(engine):
+    """Testa que as buscas com exclusão não gravam a raiz e que o número de linhas é limitado"""
+    board = Board.from_fen("6k1/5ppp/8/8/8/8/5PPP/R5K1 w - - 0 1")
+    engine.search(board, depth=3, multipv=4)
+    entry = engine.table.probe(board.zobrist_key)
+    assert decode_move(entry[3]) == chess.Move.from_uci("a1a8")
+    board = Board.from_fen("7k/8/8/8/8/8/8/K7 w - - 0 1")
+    assert len(engine.search(board, depth=2, multipv=10).lines) == 3
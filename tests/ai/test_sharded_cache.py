@@ -0,0 +1,58 @@
+import threading
+
+from src.ai.cache import PositionCache, ShardedCache
+
+
+def test_keys_spread_over_shards_with_separate_stats():
+    """Testa que as chaves se espalham pelos shards e cada um tem seus contadores"""
+    cache = ShardedCache(shards=8)
+    for key in range(64):
+        cache.put(key, key)
+    assert len(cache.shards) == 8
+    assert all(len(shard) == 8 for shard in cache.shards)
+    assert cache.get(3) == 3 and cache.get(100) is None
+    stats = cache.get_statistics()
+    assert (stats['hits'], stats['misses'], stats['total_entries']) == (1, 1, 64)
+    assert sum(shard['hits'] + shard['misses'] for shard in stats['shards']) == 2
+
+
+def test_budget_is_split_between_shards():
+    """Testa que o orçamento total é repartido e que poucos slots reduzem os shards"""
+    cache = ShardedCache(shards=4, max_entries=40)
+    for key in range(1000):
+        cache.put(key, key)
+    assert len(cache) == 40 and cache.evictions == 960
+    cache.set_limits(max_entries=8)
+    assert len(cache) == 8
+    assert len(ShardedCache(shards=16, max_entries=3).shards) == 2
+
+
+def test_concurrent_workers():
+    """Testa leituras e escritas de várias threads sem perda de entradas nem de contadores"""
+    cache = ShardedCache(shards=16)
+    errors = []
+
+    def worker(offset):
+        try:
+            for i in range(2000):
+                key = offset * 10000 + i
+                cache.put(key, i)
+                assert cache.get(key) == i
+        except AssertionError as error:
+            errors.append(error)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors
+    assert len(cache) == 16000 and cache.hits == 16000
+
+
+def test_position_cache_shards():
+    """Testa o PositionCache repartido em shards"""
+    cache = PositionCache(cache_size=1000, shards=4)
+    cache.put("fen", 3, 0.5)
+    assert cache.get("fen", 3) == 0.5
+    assert len(cache.get_statistics()['shards']) == 4
@@ -0,0 +1,101 @@
+import random
+
+import chess
+import pytest
+from src.ai.cache import EndgameTablebaseCache
+from src.ai.cache.tablebase import TablebaseResult, TablebaseStore, generate_tablebases, main
+from src.core.board.board import Board
+
+
+@pytest.fixture(scope="module")
+def tablebase_dir(tmp_path_factory):
+    directory = tmp_path_factory.mktemp("tablebases")
+    generate_tablebases(directory)
+    return directory
+
+
+def random_position(rng, letter):
+    board = chess.Board(None)
+    while True:
+        board.clear()
+        squares = rng.sample(range(64), 3)
+        strong = rng.choice(chess.COLORS)
+        board.set_piece_at(squares[0], chess.Piece(chess.KING, strong))
+        board.set_piece_at(squares[1], chess.Piece(chess.KING, not strong))
+        board.set_piece_at(squares[2], chess.Piece.from_symbol(letter if strong else letter.lower()))
+        board.turn = rng.choice(chess.COLORS)
+        if board.is_valid():
+            return board
+
+
+def test_known_results(tablebase_dir):
+    """Testa resultados conhecidos de KQK, KRK e KPK"""
+    with TablebaseStore(tablebase_dir) as store:
+        assert store.probe(Board.from_fen("k7/1Q6/1K6/8/8/8/8/8 b - - 0 1")) == TablebaseResult(-1, 0)
+        assert store.probe(Board.from_fen("k7/8/1K6/8/8/8/7Q/8 w - - 0 1")) == TablebaseResult(1, 1)
+        assert store.probe(Board.from_fen("k7/2Q5/1K6/8/8/8/8/8 b - - 0 1")) == TablebaseResult(0, None)
+        # Oposição: quem joga decide KPK.
+        assert store.probe(Board.from_fen("8/4k3/8/4K3/4P3/8/8/8 b - - 0 1")).wdl == -1
+        assert store.probe(Board.from_fen("8/4k3/8/4K3/4P3/8/8/8 w - - 0 1")).wdl == 0
+        assert store.probe(Board.from_fen("4k3/4P3/4K3/8/8/8/8/8 b - - 0 1")).wdl == 0
+        # Peão da torre com o rei defensor no canto é empate.
+        assert store.probe(Board.from_fen("k7/8/8/P7/8/8/8/K7 w - - 0 1")).wdl == 0
+        # Sem tabela para outros materiais.
+        assert store.probe(Board()) is None
+
+
+def test_consistent_with_moves(tablebase_dir):
+    """Testa que cada resultado é coerente com os dos lances seguintes"""
+    rng = random.Random(7)
+    with TablebaseStore(tablebase_dir) as store:
+        for letter in "QRP" * 100:
+            board = random_position(rng, letter)
+            result = store.probe(board)
+            if board.is_checkmate():
+                assert result == TablebaseResult(-1, 0)
+                continue
+            children = []
+            for move in board.legal_moves:
+                board.push(move)
+                children.append(store.probe(board) or TablebaseResult(0, None))  # KvK
+                board.pop()
+            if result.wdl == 1:
+                assert any(child == (-1, result.dtm - 1) for child in children)
+            elif result.wdl == -1:
+                assert all(child.wdl == 1 for child in children)
+                assert max(child.dtm for child in children) == result.dtm - 1
+            else:
+                assert not any(child.wdl == -1 for child in children)
+
+
+def test_colour_symmetry(tablebase_dir):
+    """Testa que espelhar as cores não muda o resultado"""
+    rng = random.Random(3)
+    with TablebaseStore(tablebase_dir) as store:
+        for letter in "QRP" * 50:
+            board = random_position(rng, letter)
+            assert store.probe(board) == store.probe(board.mirror())
+
+
+def test_longest_mates(tablebase_dir):
+    """Testa as distâncias máximas conhecidas: 10 lances em KQK e 16 em KRK"""
+    for signature, moves in (("KQvK", 10), ("KRvK", 16)):
+        data = (tablebase_dir / f"{signature}.tb").read_bytes()[32:]
+        assert max(value >> 2 for value in data) == moves
+
+
+def test_lazy_opening(tablebase_dir):
+    """Testa que as tabelas só são abertas na primeira consulta"""
+    cache = EndgameTablebaseCache(str(tablebase_dir))
+    assert cache.store.loaded() == []
+    assert cache.probe(Board.from_fen("8/8/8/4k3/8/8/3RK3/8 w - - 0 1")).wdl == 1
+    assert cache.store.loaded() == ["KRvK"]
+    assert cache.store.verify("KRvK")
+    cache.close()
+
+
+def test_cli(tmp_path, capsys):
+    """Testa a geração pela linha de comando"""
+    assert main([str(tmp_path), "--tables", "KRvK"]) == 0
+    assert (tmp_path / "KRvK.tb").exists()
+    assert "KRvK.tb" in capsys.readouterr().out
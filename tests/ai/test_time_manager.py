@@ -0,0 +1,77 @@
+import time
+
+import chess
+import pytest
+from src.core.board.board import Board, Color
+from src.ai.search import AlphaBetaSearch
+from src.ai.time_manager import MOVE_OVERHEAD, SearchController, SearchLimits, allocate_time
+
+
+@pytest.fixture
+def controller():
+    return SearchController(AlphaBetaSearch(hash_mb=1))
+
+
+def test_allocate_time_modes():
+    """Testa os prazos para tempo fixo, relógio com incremento e sem limite"""
+    assert allocate_time(SearchLimits(), Color.WHITE) == (None, None)
+    assert allocate_time(SearchLimits(movetime=1.0), Color.WHITE) == (None, 1.0 - MOVE_OVERHEAD)
+    assert allocate_time(SearchLimits(wtime=60, btime=60, infinite=True), Color.WHITE) == (None, None)
+
+    soft, hard = allocate_time(SearchLimits(wtime=60.0, btime=10.0, winc=1.0), Color.WHITE)
+    assert 2.0 < soft < 3.0 and soft < hard <= 60.0 * 0.25
+    black_soft, _ = allocate_time(SearchLimits(wtime=60.0, btime=10.0, winc=1.0), Color.BLACK)
+    assert black_soft < soft
+    # Último lance antes do controle: pode gastar quase todo o relógio.
+    soft, hard = allocate_time(SearchLimits(wtime=5.0, movestogo=1), Color.WHITE)
+    assert soft == hard == pytest.approx(5.0 - MOVE_OVERHEAD)
+
+
+def test_iteration_callback(controller):
+    """Testa que o callback recebe cada iteração com nós, NPS e variante principal"""
+    infos = []
+    result = controller.search(Board(), SearchLimits(depth=3), on_iteration=infos.append)
+    assert [info.depth for info in infos] == [1, 2, 3]
+    assert all(info.nodes > 0 and info.nps > 0 and info.pv for info in infos)
+    assert infos[-1].pv[0] == result.best_move == infos[-1].best_move
+    assert infos[-1].nodes == result.nodes
+
+
+def test_hard_deadline(controller):
+    """Testa que o prazo rígido do movetime não é ultrapassado"""
+    start = time.perf_counter()
+    result = controller.search(Board(), SearchLimits(movetime=0.2))
+    assert time.perf_counter() - start < 0.2 + 0.05
+    assert result.best_move in Board().legal_moves()
+
+
+def test_stable_move_stops_before_soft_deadline(controller):
+    """Testa a saída antecipada quando o melhor lance não muda"""
+    board = Board.from_fen("4k3/8/8/3q4/8/8/3R4/3K4 w - - 0 1")
+    infos = []
+    start = time.perf_counter()
+    result = controller.search(board, SearchLimits(wtime=30.0, btime=30.0),
+                               on_iteration=infos.append)
+    assert time.perf_counter() - start < controller.last_soft
+    assert result.best_move == chess.Move.from_uci("d2d5")
+    assert {info.best_move for info in infos} == {result.best_move}
+
+
+def test_node_limit(controller):
+    """Testa o limite de nós"""
+    result = controller.search(Board(), SearchLimits(nodes=300))
+    assert result.nodes <= 300 + controller.check_interval
+    assert result.best_move is not None
+
+
+def test_lazy_smp_helpers_stop_within_movetime():
+    """Testa que os auxiliares do Lazy SMP verificam o prazo com a mesma frequência do principal"""
+    from src.ai.parallel_search import LazySMPSearch
+
+    with LazySMPSearch(threads=2, hash_mb=1) as smp:
+        controller = SearchController(smp)
+        controller.search(Board(), SearchLimits(depth=1))
+        start = time.perf_counter()
+        result = controller.search(Board(), SearchLimits(movetime=0.25))
+        assert time.perf_counter() - start < 0.25
+        assert result.best_move in Board().legal_moves()
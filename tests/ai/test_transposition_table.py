@@ -1,3 +1,4 @@
+import chess
 import pytest
 from src.core.board.board import Board, Position, PieceType, Color, Piece
 from src.ai.cache.transposition_table import TranspositionTable, TranspositionEntry
@@ -113,13 +114,28 @@ def test_best_move_storage(board_factory):
     board = board_factory(pieces)
     
     # Armazena uma entrada com melhor movimento
-    best_move = (Position(rank=4, file=4), Position(rank=6, file=5))
+    best_move = chess.Move.from_uci('e5f7')
     table.store(board, depth=3, score=0.5, flag='exact', best_move=best_move)
     
     # Busca a entrada
     entry = table.lookup(board)
     assert entry.best_move == best_move
 
+def test_best_move_legacy_forms(board_factory):
+    """Testa que o melhor movimento também é aceito como par de posições, de casas ou UCI"""
+    table = TranspositionTable()
+    board = board_factory({
+        (4, 4): (PieceType.KNIGHT, Color.WHITE),
+        (7, 7): (PieceType.KING, Color.BLACK),
+    })
+    expected = chess.Move.from_uci('e5f7')
+    for best_move in [(Position(rank=4, file=4), Position(rank=6, file=5)),
+                      (Position(rank=5, file='e'), Position(rank=7, file='f')),
+                      ('e5', 'f7'), 'e5f7']:
+        table.store(board, depth=3, score=0.5, flag='exact', best_move=best_move)
+        assert table.lookup(board).best_move == expected
+        table.clear()
+
 def test_clear(board_factory):
     """Testa limpeza da tabela"""
     table = TranspositionTable()
@@ -174,3 +190,34 @@ def test_statistics(board_factory):
     assert stats['exact_scores'] == 1
     assert stats['lowerbound_scores'] == 1
     assert stats['upperbound_scores'] == 1
+
+def test_bucket_replacement():
+    """Testa as posições de profundidade e de substituição de um bucket"""
+    table = TranspositionTable(max_size=2)
+    deep, shallow, newer = 1 << 63, (1 << 63) + 2, (1 << 63) + 4
+
+    table.store(deep, depth=6, score=1.0, flag='exact')
+    table.store(shallow, depth=2, score=2.0, flag='exact')
+    table.store(newer, depth=1, score=3.0, flag='exact')
+    # A entrada mais profunda resiste; a rasa é substituída
+    assert table.lookup(deep).depth == 6
+    assert table.lookup(shallow) is None
+    assert table.lookup(newer).score == 3.0
+
+    # Em uma nova busca, a entrada antiga desce para a posição de substituição
+    table.new_search()
+    table.store(shallow, depth=1, score=4.0, flag='exact')
+    assert table.lookup(shallow).age == 1
+    assert table.lookup(deep).depth == 6
+    assert table.lookup(newer) is None
+    assert table.get_size() == 2
+
+def test_best_move_kept_on_overwrite():
+    """Testa que um novo resultado sem lance preserva o melhor lance anterior"""
+    table = TranspositionTable()
+    move = chess.Move.from_uci('e7e8q')
+    table.store(12345, depth=3, score=0.5, flag='exact', best_move=move)
+    table.store(12345, depth=4, score=0.1, flag='upperbound')
+    entry = table.lookup(12345)
+    assert entry.best_move == move
+    assert entry.flag == 'upperbound'
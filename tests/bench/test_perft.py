@@ -0,0 +1,32 @@
+"""
+Testes do benchmark de perft.
+"""
+
+import json
+
+import pytest
+from src.bench.perft import GENERATORS, SUITE, divide, main, perft
+
+
+@pytest.mark.parametrize("name", sorted(SUITE))
+@pytest.mark.parametrize("generator", sorted(GENERATORS))
+def test_suite_counts(name, generator):
+    """Todos os geradores batem com as contagens conhecidas até profundidade 2."""
+    fen, counts = SUITE[name]
+    assert perft(fen, 2, generator) == counts[1]
+
+
+def test_divide_sums_to_perft():
+    fen, counts = SUITE["kiwipete"]
+    split = divide(fen, 2, "traditional")
+    assert len(split) == counts[0]
+    assert sum(split.values()) == counts[1]
+
+
+def test_cli_writes_json(tmp_path, capsys):
+    path = tmp_path / "perft.json"
+    assert main(["--suite", "--depth", "1", "--json", str(path)]) == 0
+    report = json.loads(path.read_text())
+    assert len(report["results"]) == len(SUITE) * len(GENERATORS)
+    assert all(result["matches_reference"] for result in report["results"])
+    assert "nps" in capsys.readouterr().out
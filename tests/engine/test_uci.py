@@ -0,0 +1,146 @@
+"""
+Testes do front-end UCI.
+"""
+
+import io
+import os
+import sys
+import time
+
+import chess
+import chess.engine
+import pytest
+from src.engine.uci import UCIEngine, format_score, parse_go, parse_position
+from src.ai.search import MATE_SCORE
+from src.ai.time_manager import SearchLimits, allocate_time
+from src.core.board import Color
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def uci():
+    output = io.StringIO()
+    engine = UCIEngine(output, hash_mb=1)
+    yield engine, output
+    engine.close()
+
+
+def test_parsing():
+    """Testa a leitura de go, position e a formatação dos scores"""
+    limits = parse_go("wtime 60000 btime 30000 winc 1000 movestogo 20 searchmoves e2e4 depth 5".split())
+    assert (limits.wtime, limits.btime, limits.winc) == (60.0, 30.0, 1.0)
+    assert (limits.movestogo, limits.depth) == (20, 5)
+    board = parse_position("startpos moves e2e4 e7e5".split())
+    assert board.to_fen() == chess.Board("rnbqkbnr/pppp1ppp/8/4p3/4P3/8/PPPP1PPP/RNBQKBNR w KQkq e6 0 2").fen()
+    with pytest.raises(ValueError):
+        parse_position("startpos moves e2e5".split())
+    assert format_score(MATE_SCORE - 3) == "mate 2"
+    assert format_score(-MATE_SCORE + 2) == "mate -1"
+    assert format_score(-35) == "cp -35"
+
+
+def test_stop_ends_infinite_search(uci):
+    """Testa que em go infinite o bestmove só sai depois do stop"""
+    engine, output = uci
+    engine.handle("position fen 4k3/8/8/3q4/8/8/3R4/3K4 w - - 0 1")
+    engine.handle("go infinite")
+    time.sleep(0.3)
+    assert "bestmove" not in output.getvalue()
+    engine.handle("stop")
+    lines = output.getvalue().splitlines()
+    assert lines[-1].startswith("bestmove d2d5")
+    assert any(line.startswith("info depth") and " pv d2d5" in line for line in lines)
+
+
+def test_ponderhit_switches_to_clock(uci):
+    """Testa que depois do ponderhit a busca obedece ao relógio do go ponder"""
+    engine, output = uci
+    engine.handle("position startpos moves e2e4")
+    engine.handle("go ponder wtime 1000 btime 1000 movestogo 1")
+    time.sleep(0.2)
+    assert "bestmove" not in output.getvalue()
+    engine.handle("ponderhit")
+    assert engine.wait(timeout=2.0)
+    assert output.getvalue().splitlines()[-1].startswith("bestmove")
+
+
+def test_simple_engine():
+    """Testa o motor sob o SimpleEngine do python-chess"""
+    engine = chess.engine.SimpleEngine.popen_uci([sys.executable, "-m", "src.engine.uci"], cwd=ROOT)
+    try:
+        assert engine.id['name'] == "Aeon Chess"
+        assert {'Hash', 'Threads'} <= set(engine.options)
+        engine.configure({'Hash': 4})
+        board = chess.Board()
+        result = engine.play(board, chess.engine.Limit(time=0.2))
+        assert result.move in board.legal_moves
+        info = engine.analyse(chess.Board("6k1/5ppp/8/8/8/8/5PPP/R5K1 w - - 0 1"),
+                              chess.engine.Limit(depth=3))
+        assert info['score'].white() == chess.engine.Mate(1)
+        assert info['pv'][0] == chess.Move.from_uci("a1a8")
+        result = engine.play(board, chess.engine.Limit(white_clock=5, black_clock=5, white_inc=0.1,
+                                                       black_inc=0.1), ponder=True)
+        assert result.move in board.legal_moves and result.ponder is not None
+        result = engine.play(board, chess.engine.Limit(nodes=300))
+        assert result.move in board.legal_moves
+    finally:
+        engine.quit()
+
+
+def test_multipv_info_lines(uci):
+    """Testa que com MultiPV cada iteração informa uma linha por candidato"""
+    engine, output = uci
+    engine.handle("setoption name MultiPV value 3")
+    engine.handle("position fen 4k3/8/8/3q4/8/8/3R4/3K4 w - - 0 1")
+    engine.handle("go depth 2")
+    assert engine.wait(timeout=5.0)
+    lines = [line for line in output.getvalue().splitlines() if line.startswith("info depth 2 ")]
+    assert [line.split()[4] for line in lines] == ["1", "2", "3"]
+    assert " pv d2d5" in lines[0]
+    assert output.getvalue().splitlines()[-1].startswith("bestmove d2d5")
+
+
+def test_threads_answer_within_movetime():
+    """Testa que com Threads=2 e a busca numa thread os auxiliares não travam o go"""
+    engine = chess.engine.SimpleEngine.popen_uci([sys.executable, "-m", "src.engine.uci"], cwd=ROOT)
+    try:
+        engine.configure({'Hash': 4, 'Threads': 2})
+        engine.ping()
+        board = chess.Board()
+        for game in range(3):
+            # Uma partida nova por lance: cada play manda ucinewgame antes do go.
+            start = time.perf_counter()
+            result = engine.play(board, chess.engine.Limit(time=0.3), game=game)
+            assert time.perf_counter() - start < 1.0
+            assert result.move in board.legal_moves
+    finally:
+        engine.quit()
+
+
+def test_threads_play_on_the_clock():
+    """Testa uma sequência de lances com Threads=2 e relógio, dentro do prazo rígido"""
+    engine = chess.engine.SimpleEngine.popen_uci([sys.executable, "-m", "src.engine.uci"], cwd=ROOT)
+    try:
+        engine.configure({'Hash': 4, 'Threads': 2})
+        engine.ping()
+        board = chess.Board()
+        clock = {chess.WHITE: 3.0, chess.BLACK: 3.0}
+        for _ in range(6):
+            limits = SearchLimits(wtime=clock[chess.WHITE], btime=clock[chess.BLACK],
+                                  winc=0.05, binc=0.05)
+            _, hard = allocate_time(limits, Color.WHITE if board.turn else Color.BLACK)
+            start = time.perf_counter()
+            result = engine.play(board, chess.engine.Limit(white_clock=limits.wtime,
+                                                           black_clock=limits.btime,
+                                                           white_inc=0.05, black_inc=0.05),
+                                 info=chess.engine.INFO_BASIC)
+            elapsed = time.perf_counter() - start
+            # Folga para a comunicação e para a parada dos auxiliares.
+            assert elapsed < hard + 0.15
+            assert result.move in board.legal_moves and result.info.get('depth', 0) >= 1
+            clock[board.turn] += 0.05 - elapsed
+            board.push(result.move)
+        assert min(clock.values()) > 0
+    finally:
+        engine.quit()
@@ -0,0 +1,63 @@
+"""
+Testes do gerador de movimentos por bitboards.
+"""
+
+import chess
+import pytest
+from src.core.board.board import Board, Color
+from src.traditional.movements import (
+    generate_legal_moves,
+    get_king_moves,
+    get_pawn_moves,
+    get_queen_moves,
+    is_square_attacked,
+)
+
+POSITIONS = [
+    chess.STARTING_FEN,
+    "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+    "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+    "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1",
+    "rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8",
+    # En passant que descobriria xeque na fileira
+    "8/8/8/K2pP2r/8/8/8/7k w - d6 0 1",
+]
+
+
+@pytest.mark.parametrize("fen", POSITIONS)
+def test_legal_moves_match_python_chess(fen):
+    """Os lances gerados coincidem com os do python-chess até profundidade 2."""
+    board = Board.from_fen(fen)
+    reference = chess.Board(fen)
+    expected = sorted(move.uci() for move in reference.legal_moves)
+    assert sorted(move.uci() for move in generate_legal_moves(board)) == expected
+    for move in reference.legal_moves:
+        board.push(move)
+        reference.push(move)
+        assert (sorted(m.uci() for m in generate_legal_moves(board))
+                == sorted(m.uci() for m in reference.legal_moves)), reference.fen()
+        board.pop()
+        reference.pop()
+
+
+def test_queen_moves():
+    board = Board.from_fen("4k3/8/8/8/3Q4/8/8/4K3 w - - 0 1")
+    assert len(get_queen_moves(board, (4, 3))) == 27
+
+
+def test_pawn_moves_include_en_passant():
+    board = Board.from_fen("4k3/8/8/3pP3/8/8/8/4K3 w - d6 0 1")
+    assert sorted(get_pawn_moves(board, (3, 4))) == [(2, 3), (2, 4)]
+
+
+def test_king_moves_include_castling():
+    board = Board.from_fen("4k3/8/8/8/8/8/8/R3K2R w KQ - 0 1")
+    moves = get_king_moves(board, (7, 4))
+    assert (7, 6) in moves and (7, 2) in moves
+
+
+def test_is_square_attacked():
+    board = Board.from_fen("4k3/8/8/8/8/2n5/8/4K2R w - - 0 1")
+    assert is_square_attacked(board, (6, 4), Color.BLACK)     # e2, cavalo em c3
+    assert is_square_attacked(board, (0, 7), Color.WHITE)     # h8, torre em h1
+    assert not is_square_attacked(board, (4, 3), Color.BLACK)
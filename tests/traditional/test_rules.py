@@ -0,0 +1,37 @@
+"""
+Testes das regras tradicionais sobre o tabuleiro principal.
+"""
+
+import pytest
+from src.core.board.board import Board, Color
+from src.traditional.rules import is_check, is_checkmate, is_stalemate, get_legal_moves
+
+
+def test_checkmate_leaves_board_untouched():
+    """Testar as respostas com push/pop não altera a posição."""
+    fen = "R6k/8/7K/8/8/8/8/8 b - - 0 1"
+    board = Board.from_fen(fen)
+    assert is_check(board, Color.BLACK)
+    assert is_checkmate(board, Color.BLACK)
+    assert board.to_fen() == fen
+
+
+def test_stalemate():
+    board = Board.from_fen("7k/8/6KR/8/8/8/8/8 b - - 0 1")
+    assert not is_stalemate(board, Color.BLACK)
+    board = Board.from_fen("k7/P7/1K6/8/8/8/8/8 b - - 0 1")
+    assert is_stalemate(board, Color.BLACK)
+
+
+def test_legal_moves_exclude_pinned_piece():
+    """Uma peça cravada só pode se mover na linha da cravada."""
+    board = Board.from_fen("4r1k1/8/8/8/8/8/4R3/4K3 w - - 0 1")
+    moves = get_legal_moves(board, (6, 4))
+    assert sorted(moves) == [(0, 4), (1, 4), (2, 4), (3, 4), (4, 4), (5, 4)]
+    assert board.to_fen() == "4r1k1/8/8/8/8/8/4R3/4K3 w - - 0 1"
+
+
+def test_legal_moves_with_capture_and_promotion():
+    board = Board.from_fen("1n2k3/P7/8/8/8/8/8/4K3 w - - 0 1")
+    assert sorted(get_legal_moves(board, (1, 0))) == [(0, 0), (0, 1)]
+    assert board.captured_pieces == []